@@ -1,15 +1,66 @@
 """ Dependencies file for database
 """
 
+from adapters.database.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from config import settings
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 # --- SQL ---
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pool settings shared by both engines. Each engine may open up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections per worker process.
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# --- Read replica ---
+# Lookups and stats go to READ_DATABASE_URL when set, writes always stay on the primary.
+read_engine = (
+    create_engine(
+        settings.READ_DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+    )
+    if settings.READ_DATABASE_URL
+    else None
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# --- Async SQL ---
+# Same database reached through the asyncpg driver, used when DATABASE_ASYNC is enabled.
+ASYNC_SQLALCHEMY_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
+)
+
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+async_read_engine = (
+    create_async_engine(
+        make_url(settings.READ_DATABASE_URL).set(drivername="postgresql+asyncpg"),
+        poolclass=InstrumentedAsyncQueuePool,
+        **POOL_OPTIONS,
+    )
+    if settings.READ_DATABASE_URL
+    else None
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
 
 """
@@ -26,3 +77,36 @@ def get_db():
         yield database
     finally:
         database.close()
+
+
+def get_read_db():
+    """
+    Method for read replica db instance, None when no replica is configured
+    """
+    if read_engine is None:
+        yield None
+        return
+    database = ReadSessionLocal()
+    try:
+        yield database
+    finally:
+        database.close()
+
+
+async def get_async_db():
+    """
+    Method for async db instance
+    """
+    async with AsyncSessionLocal() as database:
+        yield database
+
+
+async def get_async_read_db():
+    """
+    Method for async read replica db instance, None when no replica is configured
+    """
+    if async_read_engine is None:
+        yield None
+        return
+    async with AsyncReadSessionLocal() as database:
+        yield database
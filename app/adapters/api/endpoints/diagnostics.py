@@ -0,0 +1,70 @@
+from adapters.api.dependencies import (
+    async_engine,
+    async_read_engine,
+    engine,
+    read_engine,
+)
+from adapters.database.pool import pool_metrics
+from config import settings
+from dependencies.dna_service import sequence_filter, verdict_cache, write_buffer
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/diagnostics/cache/")
+async def get_cache_diagnostics():
+    """
+    Endpoint to inspect the in-process verdict cache of this worker.
+
+    :return: The size, capacity, hit and miss counters of the verdict cache.
+    """
+    return verdict_cache.metrics()
+
+
+@router.get("/diagnostics/bloom/")
+async def get_bloom_diagnostics():
+    """
+    Endpoint to inspect the Bloom filter of stored sequences of this worker.
+
+    :return: The sizing of the filter, the number of skipped lookups and its
+        estimated and observed false-positive rates.
+    """
+    if sequence_filter is None:
+        return {"enabled": False}
+    return {"enabled": True, **sequence_filter.metrics()}
+
+
+@router.get("/diagnostics/write-behind/")
+async def get_write_behind_diagnostics():
+    """
+    Endpoint to inspect the write-behind buffer of this worker.
+
+    :return: The number of records waiting to be stored and the flush counters.
+    """
+    if write_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_buffer.metrics()}
+
+
+@router.get("/diagnostics/pool/")
+async def get_pool_diagnostics():
+    """
+    Endpoint to inspect the database connection pool of this worker.
+
+    Multiplying `max_connections` by the number of workers gives the connections the
+    application may open, to be kept below the Postgres `max_connections`.
+
+    :return: The limits, occupancy and checkout wait counters of the pool used by the
+        endpoints, the asyncio one when `DATABASE_ASYNC` is enabled, along with the ones
+        of the read replica pool under `read` when `READ_DATABASE_URL` is set.
+    """
+    primary, replica = (
+        (async_engine, async_read_engine)
+        if settings.DATABASE_ASYNC
+        else (engine, read_engine)
+    )
+    metrics = {"async": settings.DATABASE_ASYNC, **pool_metrics(primary.pool)}
+    if replica is not None:
+        metrics["read"] = pool_metrics(replica.pool)
+    return metrics
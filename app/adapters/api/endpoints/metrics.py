@@ -0,0 +1,24 @@
+from core.metrics import registry
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter()
+
+
+class PrometheusResponse(PlainTextResponse):
+    """
+    Plain text response announcing the version of the Prometheus text format.
+    """
+
+    media_type = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PrometheusResponse)
+async def get_metrics():
+    """
+    Endpoint exposing the metrics of this worker in the Prometheus text format.
+
+    :return: The request durations by route and status, the durations and errors of every
+        stage of the DNA checks and stats, and the verdict counts of the detection engine.
+    """
+    return registry.render()
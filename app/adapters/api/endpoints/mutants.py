@@ -1,35 +1,235 @@
-from core.mutant.schemas import DNARequest
+import inspect
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+import orjson
+from adapters.api.ndjson import NDJSONStreamingResponse, ndjson_lines
+from config import settings
+from core.exceptions.custom_exceptions import CustomAPIException
+from core.metrics import STAGE_DURATION, STAGE_ERRORS
+from core.mutant.schemas import DNABatchRequest, DNARequest
 from core.mutant.services import MutantService
-from dependencies.dna_service import get_dna_service
-from fastapi import APIRouter, Depends, HTTPException
+from dependencies.dna_service import dna_service_provider
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
 
 router = APIRouter()
 
 
-@router.post("/mutant/")
+async def call_service(method, *args):
+    """
+    Calls a service method without blocking the event loop.
+
+    Methods of `AsyncMutantService` are awaited, while the synchronous ones of `MutantService`
+    run in the threadpool, so their database round trips do not stall other requests.
+
+    :param method: The bound service method to call.
+    :param args: The positional arguments for the method.
+    :return: The value returned by the method.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
+
+
+async def dna_from_body(request: Request) -> List[str]:
+    """
+    Reads the DNA matrix of a request body shaped like `DNARequest`.
+
+    The raw body is parsed once, instead of being decoded by FastAPI before the model
+    validates it. Bodies of at least `MUTANT_RAW_BODY_MIN_BYTES` bytes take the orjson
+    path of `DNARequest.dna_from_json`, and smaller ones are validated by the model.
+
+    With `METRICS_ENABLED`, its duration is recorded as the `validation` stage.
+
+    :param request: The incoming request.
+    :return: The rows of the DNA matrix.
+    :raises RequestValidationError: With the errors of the model if the body is invalid.
+    """
+    body = await request.body()
+    started = time.perf_counter()
+    try:
+        if 0 < settings.MUTANT_RAW_BODY_MIN_BYTES <= len(body):
+            return DNARequest.dna_from_json(body)
+        return DNARequest.model_validate_json(body).dna
+    except ValidationError as error:
+        if settings.METRICS_ENABLED:
+            STAGE_ERRORS.labels("validation").inc()
+        raise RequestValidationError(
+            [
+                {**detail, "loc": ("body", *detail["loc"])}
+                for detail in error.errors(include_url=False)
+            ],
+            body=body,
+        )
+    finally:
+        if settings.METRICS_ENABLED:
+            STAGE_DURATION.labels("validation").observe(time.perf_counter() - started)
+
+
+@router.post(
+    "/mutant/",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": DNARequest.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
 async def detect_mutant(
-    dna_request: DNARequest, dna_service: MutantService = Depends(get_dna_service)
+    dna: List[str] = Depends(dna_from_body),
+    dna_service: MutantService = Depends(dna_service_provider),
 ):
     """
     Endpoint to determine if a DNA sequence belongs to a mutant and save the result.
 
-    :param dna_request: The request body containing the DNA sequence.
+    :param dna: The DNA sequence of the request body, see `dna_from_body`.
     :param dna_service: Dependency injection of the MutantService for handling DNA analysis.
     :return: A message indicating whether a mutant DNA was detected.
     :raises HTTPException: 403 error if the DNA does not belong to a mutant.
     """
-    is_mutant = dna_service.check_and_save_dna(dna_request.dna)
+    is_mutant = await call_service(dna_service.check_and_save_dna, dna)
     if is_mutant:
         return {"message": "Mutant detected"}
     raise HTTPException(status_code=403, detail="Not a mutant")
 
 
+@router.post("/mutant/batch/")
+async def detect_mutant_batch(
+    batch_request: DNABatchRequest,
+    dna_service: MutantService = Depends(dna_service_provider),
+):
+    """
+    Endpoint to classify several DNA sequences in a single request and save the new ones.
+
+    :param batch_request: The request body containing the list of DNA sequences.
+    :param dna_service: Dependency injection of the MutantService for handling DNA analysis.
+    :return: A verdict for every DNA sequence, in the same order as received.
+    """
+    verdicts = await call_service(
+        dna_service.check_and_save_dna_batch,
+        [dna_request.dna for dna_request in batch_request.dnas],
+    )
+    return {"results": [{"is_mutant": is_mutant} for is_mutant in verdicts]}
+
+
+@router.post("/mutant/stream/")
+async def detect_mutant_stream(
+    request: Request, dna_service: MutantService = Depends(dna_service_provider)
+):
+    """
+    Endpoint to classify an NDJSON upload of DNA sequences, answering while it is read.
+
+    Every line of the body holds a JSON object shaped like the `/mutant/` request body.
+    Lines are classified and saved in batches of `MUTANT_STREAM_CHUNK_SIZE`, and the
+    verdicts of a batch are streamed back before the next one is read, so memory stays
+    flat however large the upload is. Clients must read the response while uploading,
+    otherwise the upload stalls once the unread verdicts fill the connection buffers.
+
+    :param request: The incoming request, whose body is read as it arrives.
+    :param dna_service: Dependency injection of the MutantService for handling DNA analysis.
+    :return: An NDJSON stream with one `{"line", "is_mutant"}` object per non-blank line,
+        in the same order, or `{"line", "error"}` for lines that could not be classified.
+    """
+    return NDJSONStreamingResponse(stream_verdicts(request, dna_service))
+
+
+async def stream_verdicts(
+    request: Request, dna_service: MutantService
+) -> AsyncIterator[bytes]:
+    """
+    Reads the NDJSON lines of a request and yields the verdicts of every batch of them.
+
+    A client disconnecting stops the reading, and the batches already classified stay saved.
+    """
+    chunk: List[Tuple[int, Optional[List[str]], Optional[str]]] = []
+    line_number = 0
+    try:
+        async for line in ndjson_lines(request.stream()):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                chunk.append(
+                    (line_number, DNARequest.model_validate_json(line).dna, None)
+                )
+            except ValidationError as error:
+                message = "; ".join(detail["msg"] for detail in error.errors())
+                chunk.append((line_number, None, message))
+            if len(chunk) >= settings.MUTANT_STREAM_CHUNK_SIZE:
+                yield await classify_chunk(chunk, dna_service)
+                chunk = []
+    except ClientDisconnect:
+        return
+    if chunk:
+        yield await classify_chunk(chunk, dna_service)
+
+
+async def classify_chunk(
+    chunk: List[Tuple[int, Optional[List[str]], Optional[str]]],
+    dna_service: MutantService,
+) -> bytes:
+    """
+    Classifies the valid lines of a batch at once and renders one NDJSON result per line.
+
+    When the service rejects the batch, such as with a 503 under load, every line of the
+    batch gets the error so that the client can send them again.
+    """
+    dna_list = [dna for _, dna, _ in chunk if dna is not None]
+    try:
+        verdicts = iter(
+            await call_service(dna_service.check_and_save_dna_batch, dna_list)
+            if dna_list
+            else []
+        )
+        failure = None
+    except CustomAPIException as exception:
+        failure = exception.detail
+    results = []
+    for line_number, dna, error in chunk:
+        if dna is None or failure is not None:
+            result = {"line": line_number, "error": error or failure}
+        else:
+            result = {"line": line_number, "is_mutant": next(verdicts)}
+        results.append(orjson.dumps(result) + b"\n")
+    return b"".join(results)
+
+
 @router.get("/stats/")
-async def get_stats(dna_service: MutantService = Depends(get_dna_service)):
+async def get_stats(
+    request: Request,
+    response: Response,
+    dna_service: MutantService = Depends(dna_service_provider),
+):
     """
     Endpoint to retrieve statistics about human and mutant DNA sequences.
 
+    The response carries an `ETag` built from the counts and a `Cache-Control` header
+    matching `STATS_CACHE_TTL`. Clients sending back a matching `If-None-Match` header
+    get an empty 304 response.
+
+    :param request: The incoming request, used to read the `If-None-Match` header.
+    :param response: The outgoing response, used to set the caching headers.
     :param dna_service: Dependency injection of the MutantService for retrieving statistics.
     :return: A dictionary containing counts and ratio of mutant versus human DNA sequences.
     """
-    return dna_service.get_stats()
+    stats = await call_service(dna_service.get_stats)
+    headers = {
+        "ETag": f'"{stats["count_mutant_dna"]}-{stats["count_human_dna"]}"',
+        "Cache-Control": (
+            f"public, max-age={int(settings.STATS_CACHE_TTL)}"
+            if settings.STATS_CACHE_TTL > 0
+            else "no-cache"
+        ),
+    }
+    if_none_match = {
+        tag.strip() for tag in request.headers.get("if-none-match", "").split(",")
+    }
+    if if_none_match & {headers["ETag"], f'W/{headers["ETag"]}', "*"}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return stats
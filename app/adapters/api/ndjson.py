@@ -0,0 +1,52 @@
+"""
+NDJSON streaming
+
+Helpers to read a newline-delimited JSON request body and answer it line by line while
+it is still being uploaded.
+"""
+
+from typing import AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Splits a stream of body chunks into lines, holding at most one partial line at a time.
+
+    :param chunks: The body chunks, as returned by `Request.stream`.
+    :return: An iterator over every line of the body without its line break, blank ones
+        included so that callers can number them.
+    """
+    buffer = bytearray()
+    scanned = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        end = buffer.find(b"\n", scanned)
+        while end >= 0:
+            yield bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+        scanned = len(buffer)
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response of newline-delimited JSON generated from the request body.
+
+    Starlette's `StreamingResponse` reads the incoming messages while it streams, to notice
+    client disconnects, which would steal the body chunks the content is generated from.
+    This response only sends, and leaves reading the body, and noticing a disconnect, to
+    its content iterator."""
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
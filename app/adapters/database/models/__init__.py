@@ -1 +1,2 @@
 from adapters.database.models.dna_model import DNA
+from adapters.database.models.dna_stats_model import DNAStats
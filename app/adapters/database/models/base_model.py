@@ -6,10 +6,20 @@ import uuid
 from datetime import datetime, timezone
 
 from adapters.database import Base
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String, text
 from sqlalchemy.dialects.postgresql import UUID
 
 
+def utc_now() -> datetime:
+    """
+    Returns the current UTC time without timezone, as stored by the `DateTime` columns.
+
+    psycopg2 silently drops the offset of aware datetimes while asyncpg rejects them,
+    so both drivers get the same naive UTC value.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class BaseModel(Base):
     """
     Abstract base model that provides common fields for all models.
@@ -21,13 +31,24 @@ class BaseModel(Base):
 
     __abstract__ = True
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utc_now)
     created_by = Column(String)
-    updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-    )
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     updated_by = Column(String, nullable=True)
     deleted_at = Column(DateTime, nullable=True)
     deleted_by = Column(String, nullable=True)
+
+
+class LeanBaseModel(Base):
+    """
+    Abstract base model for high-volume, append-only tables.
+
+    Rows get a sequential identity primary key, so inserts append to the right edge of
+    the primary key index instead of scattering like random UUIDs, and a creation time
+    filled by the database. No audit columns and no Python-side defaults are added."""
+
+    __abstract__ = True
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    created_at = Column(
+        DateTime, nullable=False, server_default=text("timezone('utc', now())")
+    )
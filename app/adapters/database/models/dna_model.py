@@ -1,8 +1,53 @@
-from sqlalchemy import Column, String, Boolean
-from adapters.database.models.base_model import BaseModel
+from sqlalchemy import Column, String, Boolean, Index, Integer, LargeBinary, text
+from adapters.database.models.base_model import LeanBaseModel
+from adapters.database.sequence_codec import sequence_hash
+from core.mutant.canonical import canonical_sequence
 
 
-class DNA(BaseModel):
+def default_sequence_hash(context) -> bytes:
+    """
+    Computes the key of rows inserted with a text sequence and no explicit hash.
+    """
+    return sequence_hash(context.get_current_parameters()["sequence"])
+
+
+def default_canonical_hash(context) -> bytes:
+    """
+    Computes the canonical key of rows inserted with a text sequence and no explicit one.
+    """
+    return sequence_hash(
+        canonical_sequence(context.get_current_parameters()["sequence"])
+    )
+
+
+class DNA(LeanBaseModel):
     __tablename__ = "dna_sequence"
-    sequence = Column(String, unique=True, index=True)
+    __table_args__ = (
+        Index(
+            "ix_dna_sequence_is_mutant",
+            "is_mutant",
+            postgresql_where=text("is_mutant"),
+        ),
+    )
+    # Fixed-size SHA-256 digest of the sequence, the key every lookup goes through.
+    sequence_hash = Column(
+        LargeBinary(32),
+        unique=True,
+        index=True,
+        nullable=False,
+        default=default_sequence_hash,
+    )
+    # Digest of the canonical form shared by the rotations and reflections of the
+    # sequence, the key lookups go through so that any variant finds the stored one.
+    canonical_hash = Column(
+        LargeBinary(32),
+        index=True,
+        nullable=False,
+        default=default_canonical_hash,
+    )
+    # The sequence is stored either as text or, with DNA_STORAGE=packed, 2-bit packed
+    # along with its number of bases.
+    sequence = Column(String, nullable=True)
+    packed_sequence = Column(LargeBinary, nullable=True)
+    sequence_length = Column(Integer, nullable=True)
     is_mutant = Column(Boolean)
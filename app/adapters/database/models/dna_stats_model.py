@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, CheckConstraint, Column, SmallInteger
+from adapters.database import Base
+
+# Number of rows the counters are spread over, see `DNAStats`.
+STATS_STRIPES = 16
+
+
+class DNAStats(Base):
+    """
+    Striped table holding the number of mutant and human DNA sequences.
+
+    The counters are kept up to date by triggers on `dna_sequence`, in the same transaction
+    as every insert, update or delete, so reading the stats never scans the DNA table.
+    Each transaction adds its deltas to the row picked by `pg_backend_pid() % STATS_STRIPES`,
+    so writers on different connections do not queue on one row lock, and the stats are
+    the sum of every row.
+    """
+
+    __tablename__ = "dna_stats"
+    __table_args__ = (
+        CheckConstraint(
+            f"id >= 0 AND id < {STATS_STRIPES}", name="ck_dna_stats_stripe"
+        ),
+    )
+    id = Column(SmallInteger, primary_key=True, default=0)
+    count_mutant_dna = Column(BigInteger, nullable=False, server_default="0")
+    count_human_dna = Column(BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,114 @@
+"""
+Instrumented connection pools
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolWaitStats:
+    """
+    Counters of the connection checkouts of a pool.
+
+    A checkout waits when every connection the pool may open is already checked out,
+    so the wait counters tell whether the pool is too small for the worker's load."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float, waited: bool, timed_out: bool = False) -> None:
+        """
+        Records one checkout.
+
+        :param elapsed: Number of seconds the checkout took.
+        :param waited: Whether the pool was exhausted when the checkout started.
+        :param timed_out: Whether the checkout gave up after the pool timeout.
+        """
+        with self._lock:
+            self.checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def metrics(self) -> dict:
+        """
+        Returns the checkout counters, with wait times in milliseconds.
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": (
+                    self.wait_time_total / self.waits * 1000 if self.waits else 0
+                ),
+                "wait_time_max_ms": self.wait_time_max * 1000,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout of a `QueuePool` and keeps the counters in `wait_stats`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_overflow = kwargs.get("max_overflow", 10)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        # A max_overflow of -1 lets the pool open connections without limit.
+        waited = 0 <= self.max_overflow <= self.checkedout() - self.size()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, True, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start, waited)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """
+    `QueuePool` recording its checkout waits, used by the synchronous engine.
+    """
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` recording its checkout waits, used by the asyncio engine.
+    """
+
+
+def pool_metrics(pool: _InstrumentedPoolMixin) -> dict:
+    """
+    Returns the occupancy of a pool and the counters of its checkouts.
+
+    :param pool: An instrumented connection pool.
+    :return: The configured limits, the connections checked out and in, the overflow
+        connections open beyond `size`, and the checkout wait counters in milliseconds.
+    """
+    return {
+        "size": pool.size(),
+        "max_overflow": pool.max_overflow,
+        "max_connections": (
+            pool.size() + pool.max_overflow if pool.max_overflow >= 0 else None
+        ),
+        "timeout": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool.wait_stats.metrics(),
+    }
@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Tuple
+
+from adapters.database.models.dna_model import DNA
+from adapters.database.repository.dna_repository import (
+    STATS_TOTALS,
+    dna_values,
+    insert_unless_known,
+)
+from adapters.database.sequence_codec import sequence_hash
+from core.mutant.ports.async_repository import AsyncDNARepository
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncSQLAlchemyDNARepository(AsyncDNARepository):
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        packed: bool = False,
+    ):
+        """
+        Initializes the repository on a primary session and an optional read session.
+
+        :param db: Async session on the primary database, used for every write.
+        :param read_db: Async session on a read replica, used for lookups and stats, with
+            the same fallback to the primary as `SQLAlchemyDNARepository`.
+        :param packed: Whether new sequences are stored 2-bit packed instead of as text.
+        """
+        self.db = db
+        self.read_db = read_db or db
+        self.packed = packed
+
+    async def get_dna_by_sequence(self, sequence: str):
+        statement = (
+            select(DNA).where(DNA.canonical_hash == sequence_hash(sequence)).limit(1)
+        )
+        dna = (await self.read_db.execute(statement)).scalars().first()
+        if dna is None and self.read_db is not self.db:
+            dna = (await self.db.execute(statement)).scalars().first()
+        return dna
+
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        dna = DNA(**dna_values(sequence, is_mutant, canonical, self.packed))
+        self.db.add(dna)
+        await self.db.commit()
+        return dna
+
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        values = dna_values(sequence, is_mutant, canonical, self.packed)
+        statement = insert_unless_known([values])
+        stored = (await self.db.execute(statement)).scalar_one_or_none()
+        if stored is None:
+            # A variant was already stored: read the verdict it was stored with.
+            stored = await self.db.scalar(
+                select(DNA.is_mutant)
+                .where(DNA.canonical_hash == values["canonical_hash"])
+                .limit(1)
+            )
+        await self.db.commit()
+        return is_mutant if stored is None else stored
+
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        if not sequences:
+            return {}
+        verdicts = await self._query_verdicts(self.read_db, sequences)
+        missing = [sequence for sequence in sequences if sequence not in verdicts]
+        if missing and self.read_db is not self.db:
+            verdicts.update(await self._query_verdicts(self.db, missing))
+        return verdicts
+
+    @staticmethod
+    async def _query_verdicts(
+        db: AsyncSession, sequences: List[str]
+    ) -> Dict[str, bool]:
+        """
+        Reads the verdicts of the given canonical sequences stored in one database.
+        """
+        sequences_by_key = {sequence_hash(sequence): sequence for sequence in sequences}
+        result = await db.execute(
+            select(DNA.canonical_hash, DNA.is_mutant).where(
+                DNA.canonical_hash.in_(sequences_by_key)
+            )
+        )
+        return {sequences_by_key[key]: is_mutant for key, is_mutant in result}
+
+    async def create_dna_records(self, records: List[Tuple]):
+        if not records:
+            return
+        rows = [dna_values(*record, packed=self.packed) for record in records]
+        await self.db.execute(insert_unless_known(rows))
+        await self.db.commit()
+
+    async def get_counts(self) -> Tuple[int, int]:
+        return tuple((await self.read_db.execute(STATS_TOTALS)).one())
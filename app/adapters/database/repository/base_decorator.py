@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple
+
+from core.mutant.ports.async_repository import AsyncDNARepository
+from core.mutant.ports.repository import DNARepository
+
+
+class DNARepositoryDecorator(DNARepository):
+    """
+    Base class for repositories that add behaviour on top of another `DNARepository`.
+
+    Every method is forwarded to the wrapped repository, so subclasses only override
+    the methods they need to change."""
+
+    def __init__(self, repository: DNARepository):
+        self.repository = repository
+
+    def get_dna_by_sequence(self, sequence: str):
+        return self.repository.get_dna_by_sequence(sequence)
+
+    def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return self.repository.get_known_verdict(sequence, count_miss)
+
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        return self.repository.create_dna_record(sequence, is_mutant, canonical)
+
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        return self.repository.upsert_and_get(sequence, is_mutant, canonical)
+
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        return self.repository.get_verdicts_by_sequences(sequences)
+
+    def create_dna_records(self, records: List[Tuple]):
+        return self.repository.create_dna_records(records)
+
+    def get_counts(self) -> Tuple[int, int]:
+        return self.repository.get_counts()
+
+    def count_mutants(self) -> int:
+        return self.repository.count_mutants()
+
+    def count_humans(self) -> int:
+        return self.repository.count_humans()
+
+
+class AsyncDNARepositoryDecorator(AsyncDNARepository):
+    """
+    Asynchronous counterpart of `DNARepositoryDecorator`, on top of an `AsyncDNARepository`.
+
+    Every method is forwarded to the wrapped repository, so subclasses only override
+    the methods they need to change."""
+
+    def __init__(self, repository: AsyncDNARepository):
+        self.repository = repository
+
+    async def get_dna_by_sequence(self, sequence: str):
+        return await self.repository.get_dna_by_sequence(sequence)
+
+    async def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return await self.repository.get_known_verdict(sequence, count_miss)
+
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        return await self.repository.create_dna_record(sequence, is_mutant, canonical)
+
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        return await self.repository.upsert_and_get(sequence, is_mutant, canonical)
+
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        return await self.repository.get_verdicts_by_sequences(sequences)
+
+    async def create_dna_records(self, records: List[Tuple]):
+        return await self.repository.create_dna_records(records)
+
+    async def get_counts(self) -> Tuple[int, int]:
+        return await self.repository.get_counts()
@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional, Tuple
+
+from adapters.database.repository.base_decorator import (
+    AsyncDNARepositoryDecorator,
+    DNARepositoryDecorator,
+)
+from core.mutant.canonical import canonical_sequence, record_key
+from core.mutant.ports.async_repository import AsyncDNARepository
+from core.mutant.ports.repository import DNARepository
+from core.mutant.verdict_cache import VerdictCache
+
+
+class VerdictCacheMixin:
+    """
+    Bookkeeping of the `VerdictCache` shared by the sync and async cached repositories.
+    """
+
+    cache: VerdictCache
+
+    def _split_cached(self, sequences: List[str]) -> Tuple[Dict[str, bool], List[str]]:
+        """
+        Splits sequences between the ones with a cached verdict and the ones to read.
+
+        :return: The cached verdicts by sequence, and the sequences missing from the cache.
+        """
+        verdicts = {}
+        missing = []
+        for sequence in sequences:
+            verdict = self.cache.get(sequence)
+            if verdict is None:
+                missing.append(sequence)
+            else:
+                verdicts[sequence] = verdict
+        return verdicts, missing
+
+    def _cache_verdict(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> None:
+        """
+        Caches the verdict of a stored sequence under the sequence and its canonical form.
+        """
+        self.cache.set(sequence, is_mutant)
+        self.cache.set(canonical or canonical_sequence(sequence), is_mutant)
+
+    def _cache_verdicts(self, verdicts: Dict[str, bool]) -> None:
+        """
+        Caches verdicts read from the repository, keyed by canonical form.
+        """
+        for sequence, verdict in verdicts.items():
+            self.cache.set(sequence, verdict)
+
+    def _cache_records(self, records: List[Tuple]) -> None:
+        """
+        Caches the verdicts of freshly stored records.
+        """
+        for record in records:
+            self.cache.set(record_key(record), record[1])
+
+
+class CachedDNARepository(VerdictCacheMixin, DNARepositoryDecorator):
+    """
+    Repository that keeps the verdict of every sequence it reads or stores in a `VerdictCache`.
+
+    Verdicts never change once a sequence is stored, so a cached one can answer a request
+    without touching the database. Stored verdicts are cached by sequence, so a repeated
+    sequence is answered before its canonical form is computed, and by canonical form,
+    so they also answer the rotations and reflections of the stored sequences."""
+
+    def __init__(self, repository: DNARepository, cache: VerdictCache):
+        super().__init__(repository)
+        self.cache = cache
+
+    def get_dna_by_sequence(self, sequence: str):
+        dna = self.repository.get_dna_by_sequence(sequence)
+        if dna is not None:
+            self.cache.set(sequence, dna.is_mutant)
+        return dna
+
+    def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return self.cache.get(sequence, count_miss)
+
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        dna = self.repository.create_dna_record(sequence, is_mutant, canonical)
+        self._cache_verdict(sequence, is_mutant, canonical)
+        return dna
+
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        stored = self.repository.upsert_and_get(sequence, is_mutant, canonical)
+        self._cache_verdict(sequence, stored, canonical)
+        return stored
+
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        verdicts, missing = self._split_cached(sequences)
+        if missing:
+            stored = self.repository.get_verdicts_by_sequences(missing)
+            self._cache_verdicts(stored)
+            verdicts.update(stored)
+        return verdicts
+
+    def create_dna_records(self, records: List[Tuple]):
+        self.repository.create_dna_records(records)
+        self._cache_records(records)
+
+
+class AsyncCachedDNARepository(VerdictCacheMixin, AsyncDNARepositoryDecorator):
+    """
+    Asynchronous counterpart of `CachedDNARepository`, sharing the same `VerdictCache`.
+    """
+
+    def __init__(self, repository: AsyncDNARepository, cache: VerdictCache):
+        super().__init__(repository)
+        self.cache = cache
+
+    async def get_dna_by_sequence(self, sequence: str):
+        dna = await self.repository.get_dna_by_sequence(sequence)
+        if dna is not None:
+            self.cache.set(sequence, dna.is_mutant)
+        return dna
+
+    async def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return self.cache.get(sequence, count_miss)
+
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        dna = await self.repository.create_dna_record(sequence, is_mutant, canonical)
+        self._cache_verdict(sequence, is_mutant, canonical)
+        return dna
+
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        stored = await self.repository.upsert_and_get(sequence, is_mutant, canonical)
+        self._cache_verdict(sequence, stored, canonical)
+        return stored
+
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        verdicts, missing = self._split_cached(sequences)
+        if missing:
+            stored = await self.repository.get_verdicts_by_sequences(missing)
+            self._cache_verdicts(stored)
+            verdicts.update(stored)
+        return verdicts
+
+    async def create_dna_records(self, records: List[Tuple]):
+        await self.repository.create_dna_records(records)
+        self._cache_records(records)
@@ -1,23 +1,384 @@
+import io
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
 from adapters.database.models.dna_model import DNA
+from adapters.database.models.dna_stats_model import DNAStats
+from adapters.database.sequence_codec import (
+    pack_sequence,
+    sequence_hash,
+    unpack_sequence,
+)
+from core.mutant.canonical import canonical_sequence
 from core.mutant.ports.repository import DNARepository
+from sqlalchemy import BigInteger, cast, column, exists, func, literal, select, text
+from sqlalchemy import values as row_values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 
+def dna_values(
+    sequence: str,
+    is_mutant: bool,
+    canonical: Optional[str] = None,
+    packed: bool = False,
+) -> dict:
+    """
+    Builds the column values of a new `dna_sequence` row.
+
+    :param sequence: The DNA sequence string.
+    :param is_mutant: The verdict of the sequence.
+    :param canonical: The canonical form of the sequence, see `canonical_sequence`.
+        Computed from the sequence when not given.
+    :param packed: Whether to store the sequence 2-bit packed instead of as text.
+        Sequences holding bases other than A, C, G and T are always stored as text.
+    :return: The values keyed by column name, including the sequence hashes.
+    """
+    if canonical is None:
+        canonical = canonical_sequence(sequence)
+    values = {
+        "sequence_hash": sequence_hash(sequence),
+        "canonical_hash": sequence_hash(canonical),
+        "is_mutant": is_mutant,
+    }
+    packed_sequence = pack_sequence(sequence) if packed else None
+    if packed_sequence is None:
+        values["sequence"] = sequence
+    else:
+        values["packed_sequence"] = packed_sequence
+        values["sequence_length"] = len(sequence)
+    return values
+
+
+# Columns of the staging table bulk loads are copied into, in the order of `copy_rows`.
+STAGING_COLUMNS = (
+    "sequence_hash",
+    "canonical_hash",
+    "sequence",
+    "packed_sequence",
+    "sequence_length",
+    "is_mutant",
+)
+# Escapes of the characters with a meaning in the text format of COPY.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    """
+    Renders a column value in the text format of COPY.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bytes):
+        return "\\\\x" + value.hex()
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_rows(records: Iterable[Tuple], packed: bool = False) -> str:
+    """
+    Renders DNA records as rows of the staging table, in the text format of COPY.
+
+    :param records: Pairs of DNA sequence string and `is_mutant` flag, optionally
+        followed by the canonical form of the sequence.
+    :param packed: Whether to store the sequences 2-bit packed instead of as text.
+    :return: One line per record, to be loaded with `copy_dna_records`.
+    """
+    lines = []
+    for record in records:
+        values = dna_values(*record, packed=packed)
+        lines.append(
+            "\t".join(_copy_value(values.get(column)) for column in STAGING_COLUMNS)
+        )
+    return "".join(line + "\n" for line in lines)
+
+
+def insert_unless_known(rows: List[dict]):
+    """
+    Builds the insert of new `dna_sequence` rows, skipping the ones whose sequence or one
+    of its rotations and reflections is already stored.
+
+    Like the merge of `copy_dna_records`, the rows are inserted with `INSERT ... SELECT`
+    from their values where no stored row shares their canonical hash, and conflicts on
+    `sequence_hash` are skipped.
+
+    :param rows: The column values built by `dna_values`, one dict per row.
+    :return: The insert statement, returning the verdict of every inserted row.
+    """
+    types = [DNA.__table__.c[name].type for name in STAGING_COLUMNS]
+    # Every value is cast to its column type, since Postgres would read untyped
+    # parameters and NULLs in a VALUES list as text.
+    new_rows = row_values(
+        *[column(name, type_) for name, type_ in zip(STAGING_COLUMNS, types)],
+        name="new_rows",
+    ).data(
+        [
+            tuple(
+                cast(literal(row.get(name), type_), type_)
+                for name, type_ in zip(STAGING_COLUMNS, types)
+            )
+            for row in rows
+        ]
+    )
+    return (
+        insert(DNA)
+        .from_select(
+            list(STAGING_COLUMNS),
+            select(new_rows).where(
+                ~exists().where(DNA.canonical_hash == new_rows.c.canonical_hash)
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=[DNA.sequence_hash])
+        .returning(DNA.is_mutant)
+    )
+
+
+# Sums the stripes of the stats counters, see `DNAStats`.
+STATS_TOTALS = select(
+    *[
+        cast(func.coalesce(func.sum(counter), 0), BigInteger)
+        for counter in (DNAStats.count_mutant_dna, DNAStats.count_human_dna)
+    ]
+)
+
+
 class SQLAlchemyDNARepository(DNARepository):
-    def __init__(self, db: Session):
+    def __init__(
+        self, db: Session, read_db: Optional[Session] = None, packed: bool = False
+    ):
+        """
+        Initializes the repository on a primary session and an optional read session.
+
+        :param db: Session on the primary database, used for every write.
+        :param read_db: Session on a read replica, used for lookups and stats. Lookups
+            missing on the replica are retried on the primary, since the replica may
+            not have received the latest writes yet. Defaults to the primary session.
+        :param packed: Whether new sequences are stored 2-bit packed instead of as text.
+        """
         self.db = db
+        self.read_db = read_db or db
+        self.packed = packed
 
     def get_dna_by_sequence(self, sequence: str):
-        return self.db.query(DNA).filter(DNA.sequence == sequence).first()
+        key = sequence_hash(sequence)
+        dna = self.read_db.query(DNA).filter(DNA.canonical_hash == key).first()
+        if dna is None and self.read_db is not self.db:
+            dna = self.db.query(DNA).filter(DNA.canonical_hash == key).first()
+        return dna
 
-    def create_dna_record(self, sequence: str, is_mutant: bool):
-        dna = DNA(sequence=sequence, is_mutant=is_mutant)
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        dna = DNA(**dna_values(sequence, is_mutant, canonical, self.packed))
         self.db.add(dna)
         self.db.commit()
         return dna
 
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        values = dna_values(sequence, is_mutant, canonical, self.packed)
+        stored = self.db.execute(insert_unless_known([values])).scalar_one_or_none()
+        if stored is None:
+            # A variant was already stored: read the verdict it was stored with.
+            stored = (
+                self.db.query(DNA.is_mutant)
+                .filter(DNA.canonical_hash == values["canonical_hash"])
+                .limit(1)
+                .scalar()
+            )
+        self.db.commit()
+        return is_mutant if stored is None else stored
+
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        if not sequences:
+            return {}
+        verdicts = self._query_verdicts(self.read_db, sequences)
+        missing = [sequence for sequence in sequences if sequence not in verdicts]
+        if missing and self.read_db is not self.db:
+            verdicts.update(self._query_verdicts(self.db, missing))
+        return verdicts
+
+    @staticmethod
+    def _query_verdicts(db: Session, sequences: List[str]) -> Dict[str, bool]:
+        """
+        Reads the verdicts of the given canonical sequences stored in one database.
+        """
+        sequences_by_key = {sequence_hash(sequence): sequence for sequence in sequences}
+        rows = (
+            db.query(DNA.canonical_hash, DNA.is_mutant)
+            .filter(DNA.canonical_hash.in_(sequences_by_key))
+            .all()
+        )
+        return {sequences_by_key[key]: is_mutant for key, is_mutant in rows}
+
+    def create_dna_records(self, records: List[Tuple]):
+        if not records:
+            return
+        rows = [dna_values(*record, packed=self.packed) for record in records]
+        self.db.execute(insert_unless_known(rows))
+        self.db.commit()
+
+    def copy_dna_records(self, chunks: Iterable[str], merge_rows: int = 100000) -> int:
+        """
+        Bulk loads DNA records with COPY into a staging table merged into `dna_sequence`.
+
+        Staged rows are merged with a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING`
+        and committed every `merge_rows` rows. Like `upsert_and_get`, the first record of
+        each canonical form is kept and the ones of already stored forms are skipped.
+
+        :param chunks: Rows rendered by `copy_rows`, several per chunk.
+        :param merge_rows: Number of staged rows merged per transaction.
+        :return: The number of inserted rows.
+        """
+        columns = ", ".join(STAGING_COLUMNS)
+        inserted = staged = 0
+        for chunk in chunks:
+            if not staged:
+                # The staging table only lives until the transaction of the merge ends.
+                self.db.execute(
+                    text(
+                        "CREATE TEMP TABLE IF NOT EXISTS dna_sequence_staging ("
+                        "position BIGINT GENERATED ALWAYS AS IDENTITY, "
+                        "sequence_hash BYTEA, canonical_hash BYTEA, sequence TEXT, "
+                        "packed_sequence BYTEA, sequence_length INTEGER, "
+                        "is_mutant BOOLEAN) ON COMMIT DROP"
+                    )
+                )
+            cursor = self.db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY dna_sequence_staging ({columns}) FROM STDIN",
+                    io.StringIO(chunk),
+                )
+            finally:
+                cursor.close()
+            staged += chunk.count("\n")
+            if staged >= merge_rows:
+                inserted += self._merge_staged()
+                staged = 0
+        if staged:
+            inserted += self._merge_staged()
+        return inserted
+
+    def _merge_staged(self) -> int:
+        """
+        Merges the staged rows into `dna_sequence` and commits.
+        """
+        columns = ", ".join(STAGING_COLUMNS)
+        inserted = self.db.execute(
+            text(
+                f"INSERT INTO dna_sequence ({columns}) "
+                f"SELECT DISTINCT ON (canonical_hash) {columns} "
+                "FROM dna_sequence_staging staged WHERE NOT EXISTS ("
+                "SELECT 1 FROM dna_sequence stored "
+                "WHERE stored.canonical_hash = staged.canonical_hash) "
+                "ORDER BY canonical_hash, position "
+                "ON CONFLICT (sequence_hash) DO NOTHING"
+            )
+        ).rowcount
+        # Empties the table when the commit only ends a nested transaction.
+        self.db.execute(text("TRUNCATE dna_sequence_staging"))
+        self.db.commit()
+        return inserted
+
+    def iter_sequences(self, batch_size: int = 10000) -> Iterator[str]:
+        """
+        Streams every stored DNA sequence without loading the whole table in memory.
+
+        :param batch_size: Number of rows fetched from the server-side cursor at a time.
+        :return: An iterator over the stored DNA sequence strings.
+        """
+        query = self.db.query(
+            DNA.sequence, DNA.packed_sequence, DNA.sequence_length
+        ).execution_options(yield_per=batch_size)
+        for sequence, packed_sequence, sequence_length in query:
+            if sequence is None:
+                sequence = unpack_sequence(packed_sequence, sequence_length)
+            yield sequence
+
+    def iter_canonical_hashes(self, batch_size: int = 10000) -> Iterator[bytes]:
+        """
+        Streams the canonical hash of every stored DNA sequence.
+
+        Only the `canonical_hash` column is read, so no sequence is unpacked or
+        canonicalized on the way.
+
+        :param batch_size: Number of rows fetched from the server-side cursor at a time.
+        :return: An iterator over the stored canonical hashes.
+        """
+        query = self.db.query(DNA.canonical_hash).execution_options(
+            yield_per=batch_size
+        )
+        for (key,) in query:
+            yield key
+
+    def convert_storage(self, batch_size: int = 1000) -> int:
+        """
+        Rewrites the stored sequences in the storage format of this repository.
+
+        Text rows are packed when the repository is `packed`, and packed rows are restored
+        to text otherwise. Rows are converted and committed in batches.
+
+        :param batch_size: Number of rows converted per transaction.
+        :return: The number of converted rows.
+        """
+        pending = (
+            DNA.packed_sequence.is_(None) if self.packed else DNA.sequence.is_(None)
+        )
+        converted = 0
+        last_id = None
+        while True:
+            query = self.db.query(DNA).filter(pending).order_by(DNA.id)
+            if last_id is not None:
+                query = query.filter(DNA.id > last_id)
+            batch = query.limit(batch_size).all()
+            if not batch:
+                return converted
+            for dna in batch:
+                sequence = dna.sequence
+                if sequence is None:
+                    sequence = unpack_sequence(dna.packed_sequence, dna.sequence_length)
+                values = dna_values(sequence, dna.is_mutant, packed=self.packed)
+                if self.packed and "packed_sequence" not in values:
+                    # Holds bases that cannot be packed, so it stays as text.
+                    continue
+                dna.sequence = values.get("sequence")
+                dna.packed_sequence = values.get("packed_sequence")
+                dna.sequence_length = values.get("sequence_length")
+                converted += 1
+            last_id = batch[-1].id
+            self.db.commit()
+
+    def get_counts(self) -> Tuple[int, int]:
+        return tuple(self.read_db.execute(STATS_TOTALS).one())
+
     def count_mutants(self) -> int:
-        return self.db.query(DNA).filter(DNA.is_mutant == True).count()
+        return self.get_counts()[0]
 
     def count_humans(self) -> int:
-        return self.db.query(DNA).filter(DNA.is_mutant == False).count()
+        return self.get_counts()[1]
+
+    def reconcile_stats(self) -> Tuple[int, int]:
+        """
+        Recomputes the stats counters from the `dna_sequence` table.
+
+        Writers are blocked while the table is counted, so no insert is lost between
+        the count and the update of the counters.
+
+        :return: The recomputed number of mutant and human DNA sequences.
+        """
+        self.db.execute(text("LOCK TABLE dna_sequence IN SHARE ROW EXCLUSIVE MODE"))
+        count_mutant_dna, count_human_dna = self.db.query(
+            func.count().filter(DNA.is_mutant == True),
+            func.count().filter(DNA.is_mutant == False),
+        ).one()
+        # The totals go to the first stripe and the other stripes start over from zero.
+        self.db.query(DNAStats).delete()
+        self.db.add(
+            DNAStats(
+                id=0, count_mutant_dna=count_mutant_dna, count_human_dna=count_human_dna
+            )
+        )
+        self.db.commit()
+        return count_mutant_dna, count_human_dna
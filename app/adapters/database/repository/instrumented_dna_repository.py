@@ -0,0 +1,163 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from adapters.database.repository.base_decorator import (
+    AsyncDNARepositoryDecorator,
+    DNARepositoryDecorator,
+)
+from core.metrics import StageMetrics
+
+# Stages of the repository calls, labelled with the method name.
+GET_DNA_BY_SEQUENCE = StageMetrics("get_dna_by_sequence")
+GET_KNOWN_VERDICT = StageMetrics("get_known_verdict")
+CREATE_DNA_RECORD = StageMetrics("create_dna_record")
+UPSERT_AND_GET = StageMetrics("upsert_and_get")
+GET_VERDICTS_BY_SEQUENCES = StageMetrics("get_verdicts_by_sequences")
+CREATE_DNA_RECORDS = StageMetrics("create_dna_records")
+GET_COUNTS = StageMetrics("get_counts")
+
+
+class InstrumentedDNARepository(DNARepositoryDecorator):
+    """
+    Repository that times every call to the wrapped repository as a stage of the service.
+
+    Durations go to the `mutant_stage_duration_seconds` histogram and failures to the
+    `mutant_stage_errors_total` counter, both labelled with the method name. Wrapping the
+    outermost repository measures what the service waits for, cached verdicts included.
+    """
+
+    def _timed(self, stage: StageMetrics, method, *args):
+        """
+        Calls a method of the wrapped repository and records its duration.
+        """
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        except Exception:
+            stage.errors.inc()
+            raise
+        finally:
+            stage.duration.observe(time.perf_counter() - started)
+
+    def get_dna_by_sequence(self, sequence: str):
+        return self._timed(
+            GET_DNA_BY_SEQUENCE, self.repository.get_dna_by_sequence, sequence
+        )
+
+    def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return self._timed(
+            GET_KNOWN_VERDICT,
+            self.repository.get_known_verdict,
+            sequence,
+            count_miss,
+        )
+
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        return self._timed(
+            CREATE_DNA_RECORD,
+            self.repository.create_dna_record,
+            sequence,
+            is_mutant,
+            canonical,
+        )
+
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        return self._timed(
+            UPSERT_AND_GET,
+            self.repository.upsert_and_get,
+            sequence,
+            is_mutant,
+            canonical,
+        )
+
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        return self._timed(
+            GET_VERDICTS_BY_SEQUENCES,
+            self.repository.get_verdicts_by_sequences,
+            sequences,
+        )
+
+    def create_dna_records(self, records: List[Tuple]):
+        return self._timed(
+            CREATE_DNA_RECORDS, self.repository.create_dna_records, records
+        )
+
+    def get_counts(self) -> Tuple[int, int]:
+        return self._timed(GET_COUNTS, self.repository.get_counts)
+
+
+class AsyncInstrumentedDNARepository(AsyncDNARepositoryDecorator):
+    """
+    Asynchronous counterpart of `InstrumentedDNARepository`, recording the same metrics.
+    """
+
+    async def _timed(self, stage: StageMetrics, method, *args):
+        """
+        Awaits a method of the wrapped repository and records its duration.
+        """
+        started = time.perf_counter()
+        try:
+            return await method(*args)
+        except Exception:
+            stage.errors.inc()
+            raise
+        finally:
+            stage.duration.observe(time.perf_counter() - started)
+
+    async def get_dna_by_sequence(self, sequence: str):
+        return await self._timed(
+            GET_DNA_BY_SEQUENCE, self.repository.get_dna_by_sequence, sequence
+        )
+
+    async def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        return await self._timed(
+            GET_KNOWN_VERDICT,
+            self.repository.get_known_verdict,
+            sequence,
+            count_miss,
+        )
+
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        return await self._timed(
+            CREATE_DNA_RECORD,
+            self.repository.create_dna_record,
+            sequence,
+            is_mutant,
+            canonical,
+        )
+
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        return await self._timed(
+            UPSERT_AND_GET,
+            self.repository.upsert_and_get,
+            sequence,
+            is_mutant,
+            canonical,
+        )
+
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        return await self._timed(
+            GET_VERDICTS_BY_SEQUENCES,
+            self.repository.get_verdicts_by_sequences,
+            sequences,
+        )
+
+    async def create_dna_records(self, records: List[Tuple]):
+        return await self._timed(
+            CREATE_DNA_RECORDS, self.repository.create_dna_records, records
+        )
+
+    async def get_counts(self) -> Tuple[int, int]:
+        return await self._timed(GET_COUNTS, self.repository.get_counts)
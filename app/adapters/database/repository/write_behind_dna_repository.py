@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional, Tuple
+
+from adapters.database.models.dna_model import DNA
+from adapters.database.repository.base_decorator import (
+    AsyncDNARepositoryDecorator,
+    DNARepositoryDecorator,
+)
+from core.mutant.canonical import canonical_sequence, record_key
+from core.mutant.ports.async_repository import AsyncDNARepository
+from core.mutant.ports.repository import DNARepository
+from core.mutant.write_buffer import WriteBehindBuffer
+from fastapi.concurrency import run_in_threadpool
+
+
+class WriteBehindBufferMixin:
+    """
+    Reads of the `WriteBehindBuffer` shared by the sync and async write-behind repositories.
+    """
+
+    buffer: WriteBehindBuffer
+
+    def _buffered_dna(self, sequence: str) -> Optional[DNA]:
+        """
+        Builds the record of a sequence waiting in the buffer, if it is there.
+        """
+        verdict = self.buffer.get(sequence)
+        if verdict is None:
+            return None
+        return DNA(sequence=sequence, is_mutant=verdict)
+
+    def _split_buffered(
+        self, sequences: List[str]
+    ) -> Tuple[Dict[str, bool], List[str]]:
+        """
+        Splits sequences between the ones waiting in the buffer and the ones to read.
+
+        :return: The buffered verdicts by sequence, and the sequences missing from the buffer.
+        """
+        verdicts = {}
+        missing = []
+        for sequence in sequences:
+            verdict = self.buffer.get(sequence)
+            if verdict is None:
+                missing.append(sequence)
+            else:
+                verdicts[sequence] = verdict
+        return verdicts, missing
+
+
+class WriteBehindDNARepository(WriteBehindBufferMixin, DNARepositoryDecorator):
+    """
+    Repository that queues new records in a `WriteBehindBuffer` instead of storing them.
+
+    Reads look at the buffer first, so a sequence keeps its verdict between the request
+    that submitted it and the flush that stores it. Stats only count stored records."""
+
+    def __init__(self, repository: DNARepository, buffer: WriteBehindBuffer):
+        super().__init__(repository)
+        self.buffer = buffer
+
+    def get_dna_by_sequence(self, sequence: str):
+        dna = self._buffered_dna(sequence)
+        if dna is not None:
+            return dna
+        return self.repository.get_dna_by_sequence(sequence)
+
+    def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        verdict = self.buffer.get(sequence)
+        if verdict is not None:
+            return verdict
+        return self.repository.get_known_verdict(sequence, count_miss)
+
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        verdict = self.upsert_and_get(sequence, is_mutant, canonical)
+        return DNA(sequence=sequence, is_mutant=verdict)
+
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        # Verdicts only depend on the sequence, so a stored one always matches this one.
+        return self.buffer.put(
+            sequence, is_mutant, canonical or canonical_sequence(sequence)
+        )
+
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        verdicts, missing = self._split_buffered(sequences)
+        if missing:
+            verdicts.update(self.repository.get_verdicts_by_sequences(missing))
+        return verdicts
+
+    def create_dna_records(self, records: List[Tuple]):
+        for record in records:
+            self.buffer.put(record[0], record[1], record_key(record))
+
+
+class AsyncWriteBehindDNARepository(
+    WriteBehindBufferMixin, AsyncDNARepositoryDecorator
+):
+    """
+    Asynchronous counterpart of `WriteBehindDNARepository`, sharing the same `WriteBehindBuffer`.
+
+    When the buffer is full, the wait for room happens in the threadpool, so the event
+    loop keeps serving other requests."""
+
+    def __init__(self, repository: AsyncDNARepository, buffer: WriteBehindBuffer):
+        super().__init__(repository)
+        self.buffer = buffer
+
+    async def _put(self, sequence: str, is_mutant: bool, canonical: str) -> bool:
+        verdict = self.buffer.offer(sequence, is_mutant, canonical)
+        if verdict is None:
+            verdict = await run_in_threadpool(
+                self.buffer.put, sequence, is_mutant, canonical
+            )
+        return verdict
+
+    async def get_dna_by_sequence(self, sequence: str):
+        dna = self._buffered_dna(sequence)
+        if dna is not None:
+            return dna
+        return await self.repository.get_dna_by_sequence(sequence)
+
+    async def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        verdict = self.buffer.get(sequence)
+        if verdict is not None:
+            return verdict
+        return await self.repository.get_known_verdict(sequence, count_miss)
+
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        verdict = await self.upsert_and_get(sequence, is_mutant, canonical)
+        return DNA(sequence=sequence, is_mutant=verdict)
+
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        return await self._put(
+            sequence, is_mutant, canonical or canonical_sequence(sequence)
+        )
+
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        verdicts, missing = self._split_buffered(sequences)
+        if missing:
+            verdicts.update(await self.repository.get_verdicts_by_sequences(missing))
+        return verdicts
+
+    async def create_dna_records(self, records: List[Tuple]):
+        for record in records:
+            await self._put(record[0], record[1], record_key(record))
@@ -0,0 +1,60 @@
+"""
+Sequence codec
+
+Compact representations of the DNA sequences stored in `dna_sequence`.
+"""
+
+import hashlib
+from typing import Optional
+
+BASES = "ACGT"
+# Maps every base to its 2-bit code and any other byte to 4, which marks it as unpackable.
+_CODES = bytes(
+    BASES.index(chr(byte)) if chr(byte) in BASES else 4 for byte in range(256)
+)
+# The four bases held by every possible packed byte, first base in the high bits.
+_QUADS = [
+    "".join(BASES[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256)
+]
+
+
+def sequence_hash(sequence: str) -> bytes:
+    """
+    Returns the fixed-size key a sequence is stored and looked up by.
+
+    :param sequence: The DNA sequence string.
+    :return: The 32-byte SHA-256 digest of the sequence.
+    """
+    return hashlib.sha256(sequence.encode()).digest()
+
+
+def pack_sequence(sequence: str) -> Optional[bytes]:
+    """
+    Packs a sequence with two bits per base, four bases per byte.
+
+    The last byte is padded with "A" bases, so the sequence length must be stored alongside.
+
+    :param sequence: The DNA sequence string.
+    :return: The packed bytes, or None if the sequence holds bases other than A, C, G and T.
+    """
+    codes = sequence.encode().translate(_CODES)
+    if 4 in codes:
+        return None
+    codes += bytes(-len(codes) % 4)
+    return bytes(
+        first << 6 | second << 4 | third << 2 | fourth
+        for first, second, third, fourth in zip(
+            codes[0::4], codes[1::4], codes[2::4], codes[3::4]
+        )
+    )
+
+
+def unpack_sequence(packed: bytes, length: int) -> str:
+    """
+    Restores a sequence packed by `pack_sequence`.
+
+    :param packed: The packed bytes.
+    :param length: The number of bases of the sequence.
+    :return: The DNA sequence string.
+    """
+    return "".join(_QUADS[byte] for byte in packed)[:length]
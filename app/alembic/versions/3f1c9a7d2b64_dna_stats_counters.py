@@ -0,0 +1,91 @@
+"""dna stats counters
+
+Revision ID: 3f1c9a7d2b64
+Revises: 9709f00e2740
+Create Date: 2026-10-18 13:40:12.418233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = '9709f00e2740'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers read the affected rows from transition tables, so a
+# multi-row insert updates the counters once instead of once per row. Statements
+# that change nothing, such as an ON CONFLICT DO NOTHING hit, leave the row untouched.
+REFRESH_FUNCTION = """
+CREATE FUNCTION dna_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    mutants bigint := 0;
+    humans bigint := 0;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE dna_stats SET count_mutant_dna = 0, count_human_dna = 0 WHERE id = 1;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT mutants + count(*) FILTER (WHERE is_mutant),
+               humans + count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT mutants - count(*) FILTER (WHERE is_mutant),
+               humans - count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM old_rows;
+    END IF;
+    IF mutants <> 0 OR humans <> 0 THEN
+        UPDATE dna_stats
+        SET count_mutant_dna = count_mutant_dna + mutants,
+            count_human_dna = count_human_dna + humans
+        WHERE id = 1;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "dna_stats_insert": "AFTER INSERT ON dna_sequence REFERENCING NEW TABLE AS new_rows",
+    "dna_stats_update": "AFTER UPDATE ON dna_sequence "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "dna_stats_delete": "AFTER DELETE ON dna_sequence REFERENCING OLD TABLE AS old_rows",
+    "dna_stats_truncate": "AFTER TRUNCATE ON dna_sequence",
+}
+
+
+def upgrade() -> None:
+    op.create_table('dna_stats',
+    sa.Column('id', sa.SmallInteger(), nullable=False),
+    sa.Column('count_mutant_dna', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('count_human_dna', sa.BigInteger(), server_default='0', nullable=False),
+    sa.CheckConstraint('id = 1', name='ck_dna_stats_single_row'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Block writers until the triggers exist, so no insert is missed by the backfill.
+    op.execute("LOCK TABLE dna_sequence IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(REFRESH_FUNCTION)
+    for name, definition in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {definition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION dna_stats_refresh()"
+        )
+    op.execute(
+        "INSERT INTO dna_stats (id, count_mutant_dna, count_human_dna) "
+        "SELECT 1, count(*) FILTER (WHERE is_mutant), count(*) FILTER (WHERE NOT is_mutant) "
+        "FROM dna_sequence"
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON dna_sequence")
+    op.execute("DROP FUNCTION dna_stats_refresh()")
+    op.drop_table('dna_stats')
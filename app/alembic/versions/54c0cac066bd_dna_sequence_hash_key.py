@@ -0,0 +1,58 @@
+"""dna sequence hash key
+
+Revision ID: 54c0cac066bd
+Revises: b84e1d0c57a2
+Create Date: 2026-10-18 13:54:33.175509
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '54c0cac066bd'
+down_revision: Union[str, None] = 'b84e1d0c57a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the 2-bit codec of this revision, so later changes to the application
+# code do not change what this migration computes.
+BASES = "ACGT"
+QUADS = [
+    "".join(BASES[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256)
+]
+
+
+def unpack_sequence(packed: bytes, length: int) -> str:
+    return "".join(QUADS[byte] for byte in packed)[:length]
+
+
+def upgrade() -> None:
+    op.add_column('dna_sequence', sa.Column('sequence_hash', sa.LargeBinary(length=32), nullable=True))
+    op.add_column('dna_sequence', sa.Column('packed_sequence', sa.LargeBinary(), nullable=True))
+    op.add_column('dna_sequence', sa.Column('sequence_length', sa.Integer(), nullable=True))
+    # Backfill the key of the existing rows, which all hold the sequence as text.
+    op.execute("UPDATE dna_sequence SET sequence_hash = sha256(convert_to(sequence, 'UTF8'))")
+    op.alter_column('dna_sequence', 'sequence_hash', nullable=False)
+    op.create_index(op.f('ix_dna_sequence_sequence_hash'), 'dna_sequence', ['sequence_hash'], unique=True)
+    op.drop_index('ix_dna_sequence_sequence', table_name='dna_sequence')
+
+
+def downgrade() -> None:
+    # Restore the text of the packed rows before the sequence becomes the key again.
+    connection = op.get_bind()
+    packed_rows = connection.execute(sa.text(
+        "SELECT id, packed_sequence, sequence_length FROM dna_sequence WHERE sequence IS NULL"
+    )).all()
+    for row_id, packed_sequence, sequence_length in packed_rows:
+        connection.execute(
+            sa.text("UPDATE dna_sequence SET sequence = :sequence WHERE id = :id"),
+            {"sequence": unpack_sequence(packed_sequence, sequence_length), "id": row_id},
+        )
+    op.create_index('ix_dna_sequence_sequence', 'dna_sequence', ['sequence'], unique=True)
+    op.drop_index(op.f('ix_dna_sequence_sequence_hash'), table_name='dna_sequence')
+    op.drop_column('dna_sequence', 'sequence_length')
+    op.drop_column('dna_sequence', 'packed_sequence')
+    op.drop_column('dna_sequence', 'sequence_hash')
@@ -0,0 +1,90 @@
+"""dna canonical hash
+
+Revision ID: 5cca6d7f6f9f
+Revises: 60bcda83416f
+Create Date: 2026-10-18 15:02:11.417236
+
+"""
+from typing import Sequence, Union
+
+import hashlib
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5cca6d7f6f9f'
+down_revision: Union[str, None] = '60bcda83416f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of the codec and canonical form of this revision, so later changes to
+# the application code do not change what this migration computes.
+BASES = "ACGT"
+QUADS = [
+    "".join(BASES[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256)
+]
+
+
+def sequence_hash(sequence: str) -> bytes:
+    return hashlib.sha256(sequence.encode()).digest()
+
+
+def unpack_sequence(packed: bytes, length: int) -> str:
+    return "".join(QUADS[byte] for byte in packed)[:length]
+
+
+def canonical_sequence(sequence: str) -> str:
+    size = math.isqrt(len(sequence))
+    if size < 2 or size * size != len(sequence):
+        return sequence
+    rows = [sequence[start:start + size] for start in range(0, len(sequence), size)]
+    columns = ["".join(column) for column in zip(*rows)]
+    variants = []
+    for matrix in (rows, columns):
+        variants += [
+            matrix,
+            matrix[::-1],
+            [row[::-1] for row in matrix],
+            [row[::-1] for row in reversed(matrix)],
+        ]
+    return min("".join(variant) for variant in variants)
+
+
+def upgrade() -> None:
+    op.add_column('dna_sequence', sa.Column('canonical_hash', sa.LargeBinary(length=32), nullable=True))
+    # Backfill the canonical key of the existing rows in batches, it cannot be computed in SQL.
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(sa.text(
+            "SELECT id, sequence, packed_sequence, sequence_length FROM dna_sequence "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+        connection.execute(
+            sa.text("UPDATE dna_sequence SET canonical_hash = :canonical_hash WHERE id = :id"),
+            [
+                {
+                    "id": row_id,
+                    "canonical_hash": sequence_hash(canonical_sequence(
+                        sequence if sequence is not None
+                        else unpack_sequence(packed_sequence, sequence_length)
+                    )),
+                }
+                for row_id, sequence, packed_sequence, sequence_length in rows
+            ],
+        )
+        last_id = rows[-1][0]
+    op.alter_column('dna_sequence', 'canonical_hash', nullable=False)
+    op.create_index(op.f('ix_dna_sequence_canonical_hash'), 'dna_sequence', ['canonical_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_dna_sequence_canonical_hash'), table_name='dna_sequence')
+    op.drop_column('dna_sequence', 'canonical_hash')
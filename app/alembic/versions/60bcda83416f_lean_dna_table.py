@@ -0,0 +1,51 @@
+"""lean dna table
+
+Revision ID: 60bcda83416f
+Revises: 54c0cac066bd
+Create Date: 2026-10-18 14:12:48.904114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '60bcda83416f'
+down_revision: Union[str, None] = '54c0cac066bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AUDIT_COLUMNS = ['created_by', 'updated_at', 'updated_by', 'deleted_at', 'deleted_by']
+
+
+def upgrade() -> None:
+    # Existing rows are numbered in table order when the identity column is added.
+    op.drop_constraint('dna_sequence_pkey', 'dna_sequence', type_='primary')
+    op.drop_column('dna_sequence', 'id')
+    op.add_column('dna_sequence', sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False))
+    op.create_primary_key('dna_sequence_pkey', 'dna_sequence', ['id'])
+
+    op.execute("UPDATE dna_sequence SET created_at = timezone('utc', now()) WHERE created_at IS NULL")
+    op.alter_column('dna_sequence', 'created_at', nullable=False, server_default=sa.text("timezone('utc', now())"))
+    for column in AUDIT_COLUMNS:
+        op.drop_column('dna_sequence', column)
+
+
+def downgrade() -> None:
+    op.add_column('dna_sequence', sa.Column('created_by', sa.String(), nullable=True))
+    op.add_column('dna_sequence', sa.Column('updated_at', postgresql.TIMESTAMP(), nullable=True))
+    op.add_column('dna_sequence', sa.Column('updated_by', sa.String(), nullable=True))
+    op.add_column('dna_sequence', sa.Column('deleted_at', postgresql.TIMESTAMP(), nullable=True))
+    op.add_column('dna_sequence', sa.Column('deleted_by', sa.String(), nullable=True))
+    op.execute("UPDATE dna_sequence SET updated_at = created_at")
+    op.alter_column('dna_sequence', 'created_at', nullable=True, server_default=None)
+
+    op.drop_constraint('dna_sequence_pkey', 'dna_sequence', type_='primary')
+    op.drop_column('dna_sequence', 'id')
+    op.add_column('dna_sequence', sa.Column('id', sa.UUID(), nullable=True))
+    op.execute("UPDATE dna_sequence SET id = gen_random_uuid()")
+    op.alter_column('dna_sequence', 'id', nullable=False)
+    op.create_primary_key('dna_sequence_pkey', 'dna_sequence', ['id'])
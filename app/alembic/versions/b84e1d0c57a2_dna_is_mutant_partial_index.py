@@ -0,0 +1,26 @@
+"""dna is_mutant partial index
+
+Revision ID: b84e1d0c57a2
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 13:52:31.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84e1d0c57a2'
+down_revision: Union[str, None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_dna_sequence_is_mutant', 'dna_sequence', ['is_mutant'], unique=False, postgresql_where=sa.text('is_mutant'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dna_sequence_is_mutant', table_name='dna_sequence', postgresql_where=sa.text('is_mutant'))
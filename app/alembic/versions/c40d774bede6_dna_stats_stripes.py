@@ -0,0 +1,108 @@
+"""dna stats stripes
+
+Revision ID: c40d774bede6
+Revises: 5cca6d7f6f9f
+Create Date: 2026-10-18 16:20:37.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c40d774bede6'
+down_revision: Union[str, None] = '5cca6d7f6f9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STRIPES = 16
+
+# Each transaction adds its deltas to the stripe picked by its backend, so concurrent
+# writers on different connections lock different rows. Readers sum every stripe.
+REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION dna_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    mutants bigint := 0;
+    humans bigint := 0;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE dna_stats SET count_mutant_dna = 0, count_human_dna = 0;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT mutants + count(*) FILTER (WHERE is_mutant),
+               humans + count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT mutants - count(*) FILTER (WHERE is_mutant),
+               humans - count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM old_rows;
+    END IF;
+    IF mutants <> 0 OR humans <> 0 THEN
+        INSERT INTO dna_stats AS stats (id, count_mutant_dna, count_human_dna)
+        VALUES (pg_backend_pid() % {STRIPES}, mutants, humans)
+        ON CONFLICT (id) DO UPDATE
+        SET count_mutant_dna = stats.count_mutant_dna + EXCLUDED.count_mutant_dna,
+            count_human_dna = stats.count_human_dna + EXCLUDED.count_human_dna;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Function of revision 3f1c9a7d2b64, restored on downgrade.
+SINGLE_ROW_FUNCTION = """
+CREATE OR REPLACE FUNCTION dna_stats_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    mutants bigint := 0;
+    humans bigint := 0;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        UPDATE dna_stats SET count_mutant_dna = 0, count_human_dna = 0 WHERE id = 1;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT mutants + count(*) FILTER (WHERE is_mutant),
+               humans + count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM new_rows;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT mutants - count(*) FILTER (WHERE is_mutant),
+               humans - count(*) FILTER (WHERE NOT is_mutant)
+        INTO mutants, humans FROM old_rows;
+    END IF;
+    IF mutants <> 0 OR humans <> 0 THEN
+        UPDATE dna_stats
+        SET count_mutant_dna = count_mutant_dna + mutants,
+            count_human_dna = count_human_dna + humans
+        WHERE id = 1;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    # Block writers while the counters change shape, so no delta lands on a missing row.
+    op.execute("LOCK TABLE dna_sequence IN SHARE ROW EXCLUSIVE MODE")
+    op.drop_constraint('ck_dna_stats_single_row', 'dna_stats', type_='check')
+    op.create_check_constraint('ck_dna_stats_stripe', 'dna_stats', f'id >= 0 AND id < {STRIPES}')
+    op.execute("UPDATE dna_stats SET id = 0 WHERE id = 1")
+    op.execute(REFRESH_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE dna_sequence IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(SINGLE_ROW_FUNCTION)
+    op.drop_constraint('ck_dna_stats_stripe', 'dna_stats', type_='check')
+    # Fold every stripe into the single row.
+    op.execute(
+        "WITH folded AS (DELETE FROM dna_stats RETURNING count_mutant_dna, count_human_dna) "
+        "INSERT INTO dna_stats (id, count_mutant_dna, count_human_dna) "
+        "SELECT 1, coalesce(sum(count_mutant_dna), 0), coalesce(sum(count_human_dna), 0) FROM folded"
+    )
+    op.create_check_constraint('ck_dna_stats_single_row', 'dna_stats', 'id = 1')
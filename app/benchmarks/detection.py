@@ -0,0 +1,270 @@
+"""
+Detection benchmark
+
+Measures `MutantService.is_mutant` with every detection engine on seeded square matrices
+of several sizes and scenarios, without a database. Run it within the app folder:
+
+    python -m benchmarks.detection --sizes 4 10 100 1000 5000 --output before.json
+
+Every scenario is built on a matrix without any run of four, to which runs are planted:
+
+- `random`: uniform random bases, mutant almost as soon as the matrix grows.
+- `early`: runs in the first two rows, so early-exit scans stop right away.
+- `human`: no run at all, the worst case where every cell is read.
+- `late`: runs in the last two rows, a mutant found only at the end of the scan.
+- `near_miss`: a single run in the last row, a human read to the end with one match.
+
+Each result holds the time per cell, the row at which a row by row scan knows the verdict
+and the peak memory of a call. With `--baseline`, results are compared with a previous
+`--output` file and the command fails when an engine got slower than `--threshold`.
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from core.mutant.detectors import DETECTION_ENGINES, get_detector
+from core.mutant.detectors.streaming_detector import StreamingScan
+from core.mutant.services import MutantService
+
+CYCLE = "ATCG"
+SCENARIOS = ("random", "early", "human", "late", "near_miss")
+# Verdict expected for every scenario, `random` is whatever the scan finds.
+EXPECTED = {"early": True, "human": False, "late": True, "near_miss": False}
+
+
+def human_matrix(size: int, rng: random.Random) -> List[List[str]]:
+    """
+    Builds a matrix without any run of four.
+
+    Every row is the "ATCG" cycle shifted from the previous one. A shift of 0 lines up
+    columns, of 3 diagonals and of 1 anti-diagonals, so no shift but 2 is used twice in
+    a row and no run gets longer than two cells.
+    """
+    rows, offset, last_shift = [], rng.randrange(4), None
+    cycle = CYCLE * (size // 4 + 2)
+    for _ in range(size):
+        rows.append(list(cycle[offset : offset + size]))
+        shift = rng.choice([s for s in range(4) if s == 2 or s != last_shift])
+        offset, last_shift = (offset + shift) % 4, shift
+    return rows
+
+
+def plant_run(rows: List[List[str]], row: int, rng: random.Random) -> None:
+    """
+    Overwrites four horizontal cells of a row with the same base.
+    """
+    column = rng.randrange(len(rows) - 3)
+    base = rng.choice(CYCLE)
+    rows[row][column : column + 4] = [base] * 4
+
+
+def scan_verdict(dna: List[str]) -> tuple:
+    """
+    Scans a matrix row by row, as an early-exit engine would.
+
+    :return: The verdict, and the number of rows read to reach it.
+    """
+    scan = StreamingScan()
+    for row in dna:
+        if scan.feed(row):
+            return True, scan.rows
+    return False, scan.rows
+
+
+def build_matrix(scenario: str, size: int, seed: int) -> tuple:
+    """
+    Builds the matrix of a scenario, drawing again until it has the expected verdict.
+
+    Planted runs may line up with cells of the neighbouring rows and add sequences, which
+    only matters for `near_miss` and is rare.
+
+    :return: The rows of the matrix, its verdict and the rows read to reach it.
+    """
+    rng = random.Random(f"{scenario}-{size}-{seed}")
+    for _ in range(100):
+        if scenario == "random":
+            rows = [rng.choices(CYCLE, k=size) for _ in range(size)]
+        else:
+            rows = human_matrix(size, rng)
+        planted = {
+            "early": [0, 1],
+            "late": [size - 2, size - 1],
+            "near_miss": [size - 1],
+        }
+        for row in planted.get(scenario, []):
+            plant_run(rows, row, rng)
+        dna = ["".join(row) for row in rows]
+        verdict, exit_row = scan_verdict(dna)
+        if EXPECTED.get(scenario, verdict) == verdict:
+            return dna, verdict, exit_row
+    raise RuntimeError(f"Could not build a {scenario} matrix of size {size}")
+
+
+def measure(call: Callable[[], bool], repeat: int, budget: float) -> tuple:
+    """
+    Times a call, keeping the best of `repeat` rounds of at least `budget` seconds, and
+    measures its peak memory in a separate traced call.
+
+    The first call warms up and sets how many calls fit a round. It only counts as a
+    round of its own when it already takes the whole budget, as large matrices do.
+
+    :return: The best seconds per call and the peak traced bytes.
+    """
+    timer = timeit.Timer(call)
+    first = timer.timeit(1)
+    if first >= budget:
+        seconds = min([first] + timer.repeat(repeat - 1, 1))
+    else:
+        number = max(1, int(budget / max(first, 1e-9)))
+        seconds = min(timer.repeat(repeat, number)) / number
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def run(args: argparse.Namespace) -> List[Dict]:
+    """
+    Runs every engine on every scenario and size, printing one line per result.
+    """
+    services = {}
+    for engine in args.engines:
+        try:
+            services[engine] = MutantService(None, get_detector(engine))
+        except ImportError as error:
+            print(f"Skipping engine {engine}: {error}", file=sys.stderr)
+
+    results = []
+    for size in args.sizes:
+        for scenario in args.scenarios:
+            dna, verdict, exit_row = build_matrix(scenario, size, args.seed)
+            for engine, service in services.items():
+                seconds, peak = measure(
+                    lambda: service.is_mutant(dna), args.repeat, args.budget
+                )
+                if service.is_mutant(dna) != verdict:
+                    raise AssertionError(
+                        f"{engine} disagrees with the scan on {scenario} size {size}"
+                    )
+                result = {
+                    "engine": engine,
+                    "scenario": scenario,
+                    "size": size,
+                    "is_mutant": verdict,
+                    "exit_row": exit_row,
+                    "seconds": seconds,
+                    "ns_per_cell": seconds / (size * size) * 1e9,
+                    "peak_bytes": peak,
+                }
+                results.append(result)
+                print(
+                    f"{engine:9} {scenario:9} size={size:5d} "
+                    f"mutant={str(verdict):5} exit_row={exit_row:5d} "
+                    f"{result['ns_per_cell']:10.1f}ns/cell "
+                    f"{seconds * 1000:10.3f}ms peak={peak / 1024:10.1f}KiB"
+                )
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compares results with the ones of a baseline file, printing the ratio of every pair.
+
+    :param threshold: Slowdown ratio above which a result is reported, 0.25 for 25%.
+    :return: A description of every regression.
+    """
+    previous = {
+        (old["engine"], old["scenario"], old["size"]): old
+        for old in baseline["results"]
+    }
+    regressions = []
+    print(f"Compared with {baseline['metadata'].get('commit') or 'baseline'}:")
+    for result in results:
+        key = (result["engine"], result["scenario"], result["size"])
+        if key not in previous:
+            continue
+        ratio = result["ns_per_cell"] / previous[key]["ns_per_cell"]
+        regressed = ratio > 1 + threshold
+        print(
+            f"{key[0]:9} {key[1]:9} size={key[2]:5d} "
+            f"{previous[key]['ns_per_cell']:10.1f} -> {result['ns_per_cell']:10.1f}"
+            f"ns/cell x{ratio:5.2f}{'  REGRESSION' if regressed else ''}"
+        )
+        if regressed:
+            regressions.append(f"{key[0]} {key[1]} size {key[2]}: x{ratio:.2f}")
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    """
+    Returns the commit being benchmarked, if run within a git checkout.
+    """
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    return output.stdout.strip() or None
+
+
+def main() -> None:
+    """
+    Parses the command line, runs the benchmark and saves or compares its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[4, 10, 100, 1000], help="Matrix rows"
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(DETECTION_ENGINES),
+        default=sorted(DETECTION_ENGINES),
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Matrix generation seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds")
+    parser.add_argument(
+        "--budget", type=float, default=0.2, help="Minimum seconds per timing round"
+    )
+    parser.add_argument("--output", help="File the results are saved to as JSON")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Slowdown reported as regression"
+    )
+    args = parser.parse_args()
+
+    metadata = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+    }
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"metadata": metadata, "results": results}, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            sys.exit("Regressions found:\n" + "\n".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+DNA table benchmark
+
+Measures the insert throughput and the on-disk size of the `dna_sequence` table as
+defined by the current model, in a scratch database created next to `DB_NAME` and
+dropped afterwards. Run it within the app folder:
+
+    python -m benchmarks.dna_table --rows 20000 --size 10
+"""
+
+import argparse
+import random
+import time
+
+from adapters.database.models import DNA
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from config import settings
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy_utils import create_database, database_exists, drop_database
+
+
+def random_sequences(count: int, size: int, seed: int):
+    """
+    Builds distinct random joined sequences of `size` x `size` matrices.
+    """
+    rng = random.Random(seed)
+    return ["".join(rng.choices("ACGT", k=size * size)) for _ in range(count)]
+
+
+def measure(args: argparse.Namespace, url: str) -> dict:
+    """
+    Inserts rows one per transaction and then in multi-row batches, and reads the table size.
+
+    :return: The rows per second of both insert modes and the table sizes in bytes.
+    """
+    engine = create_engine(url)
+    DNA.__table__.create(engine)
+    try:
+        with Session(engine) as db:
+            repository = SQLAlchemyDNARepository(db, packed=args.packed)
+
+            sequences = random_sequences(args.single, args.size, seed=1)
+            started = time.perf_counter()
+            for sequence in sequences:
+                repository.upsert_and_get(sequence, False)
+            single_rate = len(sequences) / (time.perf_counter() - started)
+
+            sequences = random_sequences(args.rows, args.size, seed=2)
+            started = time.perf_counter()
+            for start in range(0, len(sequences), args.batch):
+                repository.create_dna_records(
+                    [
+                        (sequence, False)
+                        for sequence in sequences[start : start + args.batch]
+                    ]
+                )
+            batch_rate = len(sequences) / (time.perf_counter() - started)
+
+            table, indexes, total = db.execute(
+                text(
+                    "SELECT pg_table_size('dna_sequence'), "
+                    "pg_indexes_size('dna_sequence'), "
+                    "pg_total_relation_size('dna_sequence')"
+                )
+            ).one()
+    finally:
+        engine.dispose()
+    return {
+        "single_rows_per_s": single_rate,
+        "batch_rows_per_s": batch_rate,
+        "table_bytes": table,
+        "index_bytes": indexes,
+        "total_bytes": total,
+    }
+
+
+def main() -> None:
+    """
+    Parses the command line, runs the benchmark in a scratch database and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, default=20000, help="Rows inserted in batches"
+    )
+    parser.add_argument(
+        "--single", type=int, default=2000, help="Rows inserted one by one"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=500, help="Rows per multi-row insert"
+    )
+    parser.add_argument("--size", type=int, default=10, help="Rows of each DNA matrix")
+    parser.add_argument("--packed", action="store_true", help="Store sequences packed")
+    args = parser.parse_args()
+
+    database_url = make_url(settings.DATABASE_URL)
+    url = database_url.set(database=f"{database_url.database}_bench")
+    if database_exists(url):
+        drop_database(url)
+    create_database(url)
+    try:
+        result = measure(args, url)
+    finally:
+        drop_database(url)
+
+    rows = args.single + args.rows
+    print(
+        f"single={result['single_rows_per_s']:.0f} rows/s "
+        f"batch={result['batch_rows_per_s']:.0f} rows/s "
+        f"table={result['table_bytes'] / 1024:.0f} KiB "
+        f"indexes={result['index_bytes'] / 1024:.0f} KiB "
+        f"total={result['total_bytes'] / 1024:.0f} KiB "
+        f"({result['total_bytes'] / rows:.0f} bytes/row)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Load benchmark
+
+Drives `/mutant/` and `/stats/` at a given concurrency and request mix, and reports the
+throughput and latency percentiles of every kind of request. Run it within the app folder:
+
+    python -m benchmarks.load --requests 2000 --concurrency 32 --large-ratio 0.05
+
+By default the app built by `create_app()` is served in-process, with its lifespan, on a
+scratch database created next to `DB_NAME`, migrated and dropped afterwards. In-process
+runs also count the database round trips, statements, commits and rollbacks, made while
+serving each request. Those made outside any request, such as write-behind flushes, are
+reported apart. With `--url`, requests go to a running server instead, for example a
+local uvicorn, and round trips are not counted.
+
+The mix is made of new and repeated matrices, small and large, and stats polling. New
+matrices are uniform random, repeated ones are matrices already sent during the run.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from config import settings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy_utils import create_database, database_exists, drop_database
+
+# Round trips of the request being served, see `count_round_trip`.
+_round_trips: contextvars.ContextVar = contextvars.ContextVar(
+    "round_trips", default=None
+)
+_background_round_trips = [0]
+
+
+def count_round_trip(*args) -> None:
+    """
+    Engine event listener adding a round trip to the request being served, if any.
+    """
+    (_round_trips.get() or _background_round_trips)[0] += 1
+
+
+def build_plan(args: argparse.Namespace) -> List[Tuple[str, str, str, Optional[dict]]]:
+    """
+    Draws the requests of the run in order, from the ratios of the command line.
+
+    :return: The kind, method, path and JSON body of every request.
+    """
+    rng = random.Random(args.seed)
+    sent: List[Tuple[List[str], str]] = []
+    plan = []
+    for _ in range(args.requests):
+        if rng.random() < args.stats_ratio:
+            plan.append(("stats", "GET", "/api/v1/stats/", None))
+            continue
+        if sent and rng.random() < args.repeat_ratio:
+            (dna, size), origin = rng.choice(sent), "repeat"
+        else:
+            large = rng.random() < args.large_ratio
+            size = "large" if large else "small"
+            rows = args.large_size if large else args.size
+            dna = ["".join(rng.choices("ATCG", k=rows)) for _ in range(rows)]
+            sent.append((dna, size))
+            origin = "new"
+        plan.append(
+            (f"mutant {origin} {size}", "POST", "/api/v1/mutant/", {"dna": dna})
+        )
+    return plan
+
+
+async def drive(
+    client: httpx.AsyncClient, plan: List[Tuple], concurrency: int
+) -> Tuple[Dict[str, List[Tuple[float, int, int]]], float]:
+    """
+    Sends the planned requests from `concurrency` concurrent workers.
+
+    :return: The latency, status code and round trips of every request by kind, and the
+        elapsed seconds.
+    """
+    samples: Dict[str, List[Tuple[float, int, int]]] = defaultdict(list)
+    pending: Iterator[Tuple] = iter(plan)
+
+    async def worker() -> None:
+        for kind, method, path, body in pending:
+            round_trips = [0]
+            _round_trips.set(round_trips)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            elapsed = time.perf_counter() - started
+            samples[kind].append((elapsed * 1000, response.status_code, round_trips[0]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def report(samples: Dict[str, List[Tuple]], seconds: float, count_trips: bool) -> None:
+    """
+    Prints the throughput, latency percentiles and round trips of every kind of request.
+    """
+    total = sum(len(kind_samples) for kind_samples in samples.values())
+    print(f"{total} requests in {seconds:.2f}s: {total / seconds:.1f} req/s")
+    for kind, kind_samples in sorted(samples.items()):
+        latencies = [latency for latency, _, _ in kind_samples]
+        # quantiles needs at least two samples.
+        percentiles = statistics.quantiles(
+            latencies * 2 if len(latencies) == 1 else latencies,
+            n=100,
+            method="inclusive",
+        )
+        count = len(kind_samples)
+        errors = sum(status not in (200, 304, 403) for _, status, _ in kind_samples)
+        line = (
+            f"{kind:20} n={count:6d} {count / seconds:8.1f} req/s "
+            f"p50={percentiles[49]:8.2f}ms p95={percentiles[94]:8.2f}ms "
+            f"p99={percentiles[98]:8.2f}ms errors={errors}"
+        )
+        if count_trips:
+            trips = sum(trips for _, _, trips in kind_samples) / count
+            line += f" db={trips:5.2f}/req"
+        print(line)
+    if count_trips:
+        print(f"round trips outside requests: {_background_round_trips[0]}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    """
+    Runs the planned requests against the server or the in-process app.
+    """
+    plan = build_plan(args)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+            report(*await drive(client, plan, args.concurrency), count_trips=False)
+        return
+
+    # Imported here so that the app binds to the database selected by `main`.
+    from fast_api.fast_api_app import create_app
+
+    app = create_app()
+    event.listen(Engine, "before_cursor_execute", count_round_trip)
+    event.listen(Engine, "commit", count_round_trip)
+    event.listen(Engine, "rollback", count_round_trip)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://app", timeout=None
+    ) as client:
+        samples, seconds = await drive(client, plan, args.concurrency)
+    report(samples, seconds, count_trips=True)
+
+
+def main() -> None:
+    """
+    Parses the command line, prepares the database and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests to send")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Requests in flight"
+    )
+    parser.add_argument(
+        "--repeat-ratio", type=float, default=0.3, help="Share of repeated matrices"
+    )
+    parser.add_argument(
+        "--large-ratio", type=float, default=0.05, help="Share of large new matrices"
+    )
+    parser.add_argument(
+        "--stats-ratio", type=float, default=0.2, help="Share of stats requests"
+    )
+    parser.add_argument("--size", type=int, default=6, help="Rows of small matrices")
+    parser.add_argument(
+        "--large-size", type=int, default=200, help="Rows of large matrices"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Request mix seed")
+    parser.add_argument("--url", help="Server to load, the in-process app by default")
+    parser.add_argument(
+        "--configured-database",
+        action="store_true",
+        help="Serve the in-process app from DATABASE_URL instead of a scratch database",
+    )
+    args = parser.parse_args()
+
+    if args.url or args.configured_database:
+        asyncio.run(run(args))
+        return
+
+    database_url = make_url(settings.DATABASE_URL)
+    url = database_url.set(database=f"{database_url.database}_load")
+    if database_exists(url):
+        drop_database(url)
+    create_database(url)
+    try:
+        settings.DATABASE_URL = url.render_as_string(hide_password=False)
+        settings.READ_DATABASE_URL = ""
+        subprocess.run(
+            ["alembic", "-c", "alembic.ini", "upgrade", "heads"],
+            check=True,
+            capture_output=True,
+            env={**os.environ, "DATABASE_URL": settings.DATABASE_URL},
+        )
+        asyncio.run(run(args))
+    finally:
+        # The app engines are module globals, their connections must go before the drop.
+        from adapters.api.dependencies import async_engine, engine
+
+        engine.dispose()
+        asyncio.run(async_engine.dispose())
+        drop_database(url)
+
+
+if __name__ == "__main__":
+    main()
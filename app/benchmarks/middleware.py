@@ -0,0 +1,181 @@
+"""
+Middleware benchmark
+
+Measures the requests per second of a small app behind the error handling middleware,
+implemented on `BaseHTTPMiddleware` as it used to be and as the pure ASGI
+`ErrorHandlingMiddleware`. Run it within the app folder:
+
+    python -m benchmarks.middleware --requests 5000 --concurrency 32
+
+Requests are sent straight to the ASGI app, without a server or an HTTP client, so the
+cost of the middleware is not lost in theirs. Both middlewares map errors with
+`error_response`. The app has a `GET` route, a `POST` route reading a JSON body and a
+route raising `ValidationError`.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+import orjson
+from core.exceptions.custom_exceptions import ValidationError
+from core.middleware.error_middleware import ErrorHandlingMiddleware, error_response
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+
+class BaseHTTPErrorHandlingMiddleware(BaseHTTPMiddleware):
+    """
+    Error handling middleware as it was implemented on `BaseHTTPMiddleware`.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            return error_response(exc)
+
+
+def build_app(middleware: type) -> FastAPI:
+    """
+    Builds the app served during a run, behind the given middleware.
+    """
+    app = FastAPI()
+
+    @app.get("/ping/")
+    async def ping() -> Dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/echo/")
+    async def echo(request: Request) -> Dict[str, int]:
+        return {"rows": len((await request.json())["dna"])}
+
+    @app.get("/fail/")
+    async def fail() -> None:
+        raise ValidationError("Invalid request")
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def call(app: ASGIApp, method: str, path: str, body: bytes) -> int:
+    """
+    Sends one request to the ASGI app and waits for its whole response.
+
+    :return: The status code of the response.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status_code = 0
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    async def send(message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def drive(
+    app: ASGIApp, plan: List[tuple], concurrency: int, expected: List[int]
+) -> float:
+    """
+    Sends the requests of the plan with as many workers as the concurrency.
+
+    :return: The seconds the run took.
+    """
+    queue = iter(range(len(plan)))
+
+    async def worker() -> None:
+        for index in queue:
+            status_code = await call(app, *plan[index])
+            if status_code != expected[index]:
+                raise RuntimeError(f"{plan[index][:2]} answered {status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+def run(middlewares: Dict[str, type], args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Runs the app behind every middleware `--rounds` times, interleaved, keeping the best
+    throughput of each.
+    """
+    body = orjson.dumps({"dna": ["ATGCGA"] * 6})
+    kinds = {
+        "get": ("GET", "/ping/", b""),
+        "post": ("POST", "/echo/", body),
+        "error": ("GET", "/fail/", b""),
+    }
+    statuses = {"get": 200, "post": 200, "error": 400}
+    cycle = ["get"] * 6 + ["post"] * 3 + ["error"]
+    names = [cycle[i % len(cycle)] for i in range(args.requests)]
+    plan = [kinds[name] for name in names]
+    expected = [statuses[name] for name in names]
+
+    built = {name: build_app(middleware) for name, middleware in middlewares.items()}
+    best = {name: 0.0 for name in middlewares}
+    for _ in range(args.rounds):
+        for name, app in built.items():
+            seconds = asyncio.run(drive(app, plan, args.concurrency, expected))
+            best[name] = max(best[name], args.requests / seconds)
+    return best
+
+
+def main() -> None:
+    """
+    Parses the command line and prints the throughput of every variant.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per round")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Requests in flight"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per variant")
+    args = parser.parse_args()
+
+    # Every error request would be logged by `error_response`.
+    logging.disable(logging.ERROR)
+    best = run(
+        {
+            "base_http": BaseHTTPErrorHandlingMiddleware,
+            "asgi": ErrorHandlingMiddleware,
+        },
+        args,
+    )
+    for name, rate in best.items():
+        print(
+            f"{name:10s} {rate:9.1f} req/s {1e6 / rate:8.1f} us/req "
+            f"{rate / best['base_http']:5.2f}x base_http"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Offload latency benchmark
+
+Measures the latency of small DNA classifications while large ones are in flight, with
+large matrices classified inline and then offloaded to the process pool. Run it within
+the app folder:
+
+    python -m benchmarks.offload_latency --size 2000 --large 2 --small-interval 0.01
+
+With `--path async`, detection runs the way `AsyncMutantService` does, on the event loop,
+and with `--path threadpool` the way `MutantService` does behind the endpoints.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from core.mutant.detectors import MutantDetector
+from core.mutant.detectors.offloading_detector import OffloadingMutantDetector
+from core.mutant.detectors.python_detector import PythonMutantDetector
+from fastapi.concurrency import run_in_threadpool
+
+SMALL_DNA = ["ATGCGA", "CAGTGC", "TTATGC", "AGAAGG", "CCTCTA", "TCACTG"]
+
+
+def human_matrix(size: int) -> List[str]:
+    """
+    Builds a matrix without any run of four, so detection scans every cell.
+
+    Each row is the "ATCG" cycle shifted by two bases from the previous one.
+    """
+    cycle = "ATCG" * (size // 4 + 2)
+    return [cycle[(2 * row) % 4 :][:size] for row in range(size)]
+
+
+async def classify(detector: MutantDetector, dna: List[str], path: str) -> bool:
+    """
+    Classifies a matrix following the service path under test.
+    """
+    if path == "async":
+        return await detector.is_mutant_async(dna)
+    return await run_in_threadpool(detector.is_mutant, dna)
+
+
+async def measure(
+    detector: MutantDetector, args: argparse.Namespace, large_dna: List[str]
+) -> dict:
+    """
+    Sends small matrices every `args.small_interval` seconds while `args.large` large ones
+    are classified.
+
+    Latency is measured from the time each small request was due, so the time spent
+    waiting for a blocked event loop or a busy GIL is counted as well.
+
+    :return: Latency percentiles of the small requests, in milliseconds.
+    """
+    started = time.perf_counter()
+    large_tasks = [
+        asyncio.create_task(classify(detector, large_dna, args.path))
+        for _ in range(args.large)
+    ]
+    latencies, due_at = [], started
+    while not all(task.done() for task in large_tasks):
+        await asyncio.sleep(max(0.0, due_at - time.perf_counter()))
+        await classify(detector, SMALL_DNA, args.path)
+        latencies.append((time.perf_counter() - due_at) * 1000)
+        due_at += args.small_interval
+    await asyncio.gather(*large_tasks)
+
+    # A blocked event loop may leave a single sample, quantiles needs at least two.
+    samples = latencies * 2 if len(latencies) == 1 else latencies
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "small_requests": len(latencies),
+        "p50_ms": percentiles[49],
+        "p99_ms": percentiles[98],
+        "max_ms": max(latencies),
+        "large_total_s": time.perf_counter() - started,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    """
+    Runs the benchmark inline and offloaded, and prints one line per mode.
+    """
+    large_dna = human_matrix(args.size)
+    inline = PythonMutantDetector()
+    offloading = OffloadingMutantDetector(
+        inline, args.min_cells, args.workers or None, max(args.large, 1)
+    )
+    offloading.start()
+    try:
+        # Spawning the workers is a one-off cost paid at startup, keep it out of the numbers.
+        await offloading.is_mutant_async(human_matrix(int(args.min_cells**0.5) + 1))
+        for mode, detector in (("inline", inline), ("offload", offloading)):
+            result = await measure(detector, args, large_dna)
+            print(
+                f"{mode:8} path={args.path} small={result['small_requests']:5d} "
+                f"p50={result['p50_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+                f"max={result['max_ms']:8.2f}ms large_total={result['large_total_s']:.2f}s"
+            )
+    finally:
+        offloading.shutdown()
+
+
+def main() -> None:
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--size", type=int, default=2000, help="Rows of the large matrices"
+    )
+    parser.add_argument("--large", type=int, default=2, help="Large matrices in flight")
+    parser.add_argument(
+        "--small-interval",
+        type=float,
+        default=0.01,
+        help="Seconds between small requests",
+    )
+    parser.add_argument(
+        "--min-cells", type=int, default=250_000, help="Offload threshold"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Pool size, CPUs by default"
+    )
+    parser.add_argument("--path", choices=["async", "threadpool"], default="async")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
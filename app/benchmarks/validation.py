@@ -0,0 +1,80 @@
+"""
+Validation benchmark
+
+Measures how long reading a `/mutant/` request body and rendering a response take, for
+square matrices of several sizes. Run it within the app folder:
+
+    python -m benchmarks.validation --sizes 10 100 1000
+
+Bodies are read the way FastAPI does for a model parameter (`json.loads` and then the
+model), with the model parsing the raw JSON itself, and with the orjson path of
+`DNARequest.dna_from_json`. Responses are batch results of as many verdicts as rows,
+rendered with `JSONResponse` and with `ORJSONResponse`.
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Callable, List
+
+from core.mutant.schemas import DNARequest
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+
+def random_matrix(size: int, rng: random.Random) -> List[str]:
+    """
+    Builds a square matrix of random bases.
+    """
+    return ["".join(rng.choices("ATCG", k=size)) for _ in range(size)]
+
+
+def best_time(function: Callable[[], object], budget: float) -> float:
+    """
+    Times a function in microseconds, keeping the best of five rounds.
+
+    :param budget: Approximate seconds spent per round.
+    """
+    timer = timeit.Timer(function)
+    number = max(1, int(budget / max(timer.timeit(1), 1e-7)))
+    return min(timer.repeat(5, number)) / number * 1e6
+
+
+def main() -> None:
+    """
+    Parses the command line and prints one line per matrix size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Matrix rows"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=0.2, help="Seconds per timing round"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for size in args.sizes:
+        body = json.dumps({"dna": random_matrix(size, rng)}).encode()
+        results = {"results": [{"is_mutant": rng.random() < 0.5} for _ in range(size)]}
+        timings = {
+            "fastapi": best_time(
+                lambda: DNARequest.model_validate(json.loads(body)), args.budget
+            ),
+            "pydantic": best_time(
+                lambda: DNARequest.model_validate_json(body), args.budget
+            ),
+            "raw": best_time(lambda: DNARequest.dna_from_json(body), args.budget),
+            "json": best_time(lambda: JSONResponse(results), args.budget),
+            "orjson": best_time(lambda: ORJSONResponse(results), args.budget),
+        }
+        print(
+            f"rows={size:5d} body={len(body):8d}B "
+            f"request: fastapi={timings['fastapi']:9.1f}us "
+            f"pydantic={timings['pydantic']:9.1f}us raw={timings['raw']:9.1f}us "
+            f"response: json={timings['json']:8.1f}us orjson={timings['orjson']:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Bulk classify command
+
+Classifies a file of DNA matrices on every core and loads the results into `dna_sequence`
+without going through the API. The file is memory-mapped and split into chunks, which
+worker processes parse and classify with `MutantService.is_mutant` while the results of
+the previous chunks are loaded with COPY. Two formats are read:
+
+- `ndjson`: one `{"dna": [...]}` object per line, as sent to `/mutant/stream/`.
+- `blocks`: one row per line, with matrices separated by blank lines.
+
+Run it within the app folder:
+
+    python -m commands.bulk_classify dna.ndjson --workers 8
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from adapters.api.dependencies import SessionLocal
+from adapters.database.repository.dna_repository import (
+    SQLAlchemyDNARepository,
+    copy_rows,
+)
+from config import settings
+from core.mutant.canonical import canonical_sequence
+from core.mutant.detectors import get_detector
+from core.mutant.schemas import DNARequest
+from core.mutant.services import MutantService
+from pydantic import ValidationError
+
+FORMATS = ("ndjson", "blocks")
+_BLANK_LINE = re.compile(rb"\n[ \t\r]*\n")
+
+# Memory map of the input file and service of each worker process, see `_init_worker`.
+_data: Optional[mmap.mmap] = None
+_service: Optional[MutantService] = None
+
+
+def detect_format(data: bytes) -> str:
+    """
+    Guesses the format of a file from its first non-blank byte.
+
+    :param data: The content of the file.
+    :return: "ndjson" if it starts with a JSON object, otherwise "blocks".
+    """
+    match = re.search(rb"\S", data)
+    return "ndjson" if match and match.group() == b"{" else "blocks"
+
+
+def chunk_bounds(
+    data: bytes, file_format: str, chunk_bytes: int
+) -> Iterator[Tuple[int, int]]:
+    """
+    Splits a file into chunks of about `chunk_bytes` bytes that end between two matrices.
+
+    :param data: The content of the file.
+    :param file_format: One of `FORMATS`.
+    :param chunk_bytes: The minimum size of every chunk but the last one.
+    :return: An iterator over the start and end offsets of the chunks.
+    """
+    start = 0
+    while start < len(data):
+        end = len(data)
+        if start + chunk_bytes < len(data):
+            if file_format == "ndjson":
+                newline = data.find(b"\n", start + chunk_bytes)
+                end = end if newline < 0 else newline + 1
+            else:
+                match = _BLANK_LINE.search(data, start + chunk_bytes)
+                end = end if match is None else match.end()
+        yield start, end
+        start = end
+
+
+def parse_chunk(chunk: bytes, file_format: str) -> Iterator[Optional[List[str]]]:
+    """
+    Parses the matrices of a chunk.
+
+    :param chunk: Whole lines of the file.
+    :param file_format: One of `FORMATS`.
+    :return: An iterator over the rows of every matrix, or None for the invalid ones.
+    """
+    lines = chunk.decode().splitlines()
+    if file_format == "ndjson":
+        for line in lines:
+            if line.strip():
+                try:
+                    yield DNARequest.model_validate_json(line).dna
+                except ValidationError:
+                    yield None
+        return
+    rows = []
+    for line in lines + [""]:
+        if line.strip():
+            rows.append(line.strip())
+        elif rows:
+            try:
+                yield DNARequest(dna=rows).dna
+            except ValidationError:
+                yield None
+            rows = []
+
+
+def _init_worker(path: str, engine: str) -> None:
+    """
+    Maps the input file and builds the service of a worker process.
+    """
+    global _data, _service
+    with open(path, "rb") as file:
+        _data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _service = MutantService(None, get_detector(engine))
+
+
+def _classify_chunk(
+    file_format: str, start: int, end: int, packed: bool
+) -> Tuple[str, int, int]:
+    """
+    Classifies the matrices of a chunk of the mapped file in a worker process.
+
+    Variants of a matrix already seen in the chunk are not classified again.
+
+    :return: The COPY rows of the records, and the number of valid and invalid matrices.
+    """
+    records = []
+    seen = set()
+    valid = invalid = 0
+    for dna in parse_chunk(_data[start:end], file_format):
+        if dna is None:
+            invalid += 1
+            continue
+        valid += 1
+        dna_sequence = "".join(dna)
+        canonical = canonical_sequence(dna_sequence)
+        if canonical not in seen:
+            seen.add(canonical)
+            records.append((dna_sequence, _service.is_mutant(dna), canonical))
+    return copy_rows(records, packed), valid, invalid
+
+
+def bulk_classify(
+    path: str,
+    repository: SQLAlchemyDNARepository,
+    file_format: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 1 << 20,
+    merge_rows: int = 100000,
+    engine: str = settings.DETECTION_ENGINE,
+) -> dict:
+    """
+    Classifies every matrix of a file and loads the new ones into the database.
+
+    :param path: The path of the input file.
+    :param repository: The repository the records are loaded through.
+    :param file_format: One of `FORMATS`, guessed from the file when not given.
+    :param workers: The number of worker processes, one per core by default.
+    :param chunk_bytes: The size of the chunks of the file handed to the workers.
+    :param merge_rows: The number of records merged into `dna_sequence` per transaction.
+    :param engine: The name of the detection engine used by the workers.
+    :return: The number of valid, invalid and inserted matrices and the elapsed seconds.
+    """
+    started = time.perf_counter()
+    counts = {"valid": 0, "invalid": 0, "inserted": 0}
+    if os.path.getsize(path) == 0:
+        return {**counts, "seconds": time.perf_counter() - started}
+
+    workers = workers or os.cpu_count() or 1
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data, ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(path, engine),
+    ) as executor:
+        file_format = file_format or detect_format(data)
+
+        def copy_chunks() -> Iterator[str]:
+            # Keeps every worker busy without parsing the whole file ahead of the load.
+            pending = deque()
+            bounds = chunk_bounds(data, file_format, chunk_bytes)
+            for start, end in bounds:
+                pending.append(
+                    executor.submit(
+                        _classify_chunk, file_format, start, end, repository.packed
+                    )
+                )
+                if len(pending) < 2 * workers:
+                    continue
+                rows, valid, invalid = pending.popleft().result()
+                counts["valid"] += valid
+                counts["invalid"] += invalid
+                yield rows
+            while pending:
+                rows, valid, invalid = pending.popleft().result()
+                counts["valid"] += valid
+                counts["invalid"] += invalid
+                yield rows
+
+        counts["inserted"] = repository.copy_dna_records(copy_chunks(), merge_rows)
+    return {**counts, "seconds": time.perf_counter() - started}
+
+
+def main() -> None:
+    """
+    Parses the command line, classifies and loads the file and prints the throughput.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="File of DNA matrices")
+    parser.add_argument("--format", choices=FORMATS, help="Guessed when not given")
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes, one per core by default"
+    )
+    parser.add_argument(
+        "--chunk-bytes", type=int, default=1 << 20, help="Bytes parsed per task"
+    )
+    parser.add_argument(
+        "--merge-rows", type=int, default=100000, help="Rows merged per transaction"
+    )
+    parser.add_argument(
+        "--engine", default=settings.DETECTION_ENGINE, help="Detection engine"
+    )
+    args = parser.parse_args()
+
+    database = SessionLocal()
+    try:
+        result = bulk_classify(
+            args.path,
+            SQLAlchemyDNARepository(database, packed=settings.DNA_STORAGE == "packed"),
+            file_format=args.format,
+            workers=args.workers,
+            chunk_bytes=args.chunk_bytes,
+            merge_rows=args.merge_rows,
+            engine=args.engine,
+        )
+    finally:
+        database.close()
+    print(
+        f"Classified {result['valid']} DNA matrices ({result['invalid']} invalid) and "
+        f"inserted {result['inserted']} new ones in {result['seconds']:.2f}s: "
+        f"{result['valid'] / result['seconds']:.0f} rows/s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Convert storage command
+
+Rewrites the stored DNA sequences in the format selected by `DNA_STORAGE`, packing the
+text rows with `DNA_STORAGE=packed` and restoring packed rows to text otherwise.
+Run it within the app folder:
+
+    python -m commands.convert_storage
+"""
+
+from adapters.api.dependencies import SessionLocal
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from config import settings
+
+
+def main() -> None:
+    """
+    Converts the stored sequences and prints the number of converted rows.
+    """
+    database = SessionLocal()
+    try:
+        converted = SQLAlchemyDNARepository(
+            database, packed=settings.DNA_STORAGE == "packed"
+        ).convert_storage()
+    finally:
+        database.close()
+    print(f"Converted {converted} DNA sequences to {settings.DNA_STORAGE} storage.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Reconcile stats command
+
+Recomputes the counters of the `dna_stats` table from the `dna_sequence` table.
+Run it within the app folder:
+
+    python -m commands.reconcile_stats
+"""
+
+from adapters.api.dependencies import SessionLocal
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+
+
+def main() -> None:
+    """
+    Recomputes the stats counters and prints the result.
+    """
+    database = SessionLocal()
+    try:
+        count_mutant_dna, count_human_dna = SQLAlchemyDNARepository(
+            database
+        ).reconcile_stats()
+    finally:
+        database.close()
+    print(
+        f"Stats reconciled: {count_mutant_dna} mutant and {count_human_dna} human DNA sequences."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,52 @@ class Settings:
         "DATABASE_URL",
         f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
     )
+    # Read replica used for lookups and stats, the primary database when empty.
+    READ_DATABASE_URL: str = os.getenv("READ_DATABASE_URL", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    # "text" stores new sequences as strings, "packed" with two bits per base.
+    DNA_STORAGE: str = os.getenv("DNA_STORAGE", "text")
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+    DETECTION_ENGINE: str = os.getenv("DETECTION_ENGINE", "python")
+    MUTANT_BATCH_MAX_SIZE: int = int(os.getenv("MUTANT_BATCH_MAX_SIZE", "1000"))
+    MUTANT_STREAM_CHUNK_SIZE: int = int(os.getenv("MUTANT_STREAM_CHUNK_SIZE", "500"))
+    # Size from which /mutant/ bodies are read with orjson instead of pydantic, 0 disables.
+    MUTANT_RAW_BODY_MIN_BYTES: int = int(os.getenv("MUTANT_RAW_BODY_MIN_BYTES", "1024"))
+    STATS_CACHE_TTL: float = float(os.getenv("STATS_CACHE_TTL", "1"))
+    VERDICT_CACHE_SIZE: int = int(os.getenv("VERDICT_CACHE_SIZE", "10000"))
+    VERDICT_CACHE_TTL: float = float(os.getenv("VERDICT_CACHE_TTL", "0"))
+    BLOOM_FILTER_CAPACITY: int = int(os.getenv("BLOOM_FILTER_CAPACITY", "0"))
+    BLOOM_FILTER_ERROR_RATE: float = float(os.getenv("BLOOM_FILTER_ERROR_RATE", "0.01"))
+    # Cells from which a matrix is looked up before being classified when the Bloom
+    # filter is off, 0 disables.
+    MUTANT_LOOKUP_MIN_CELLS: int = int(os.getenv("MUTANT_LOOKUP_MIN_CELLS", "0"))
+    DETECTION_OFFLOAD_MIN_CELLS: int = int(
+        os.getenv("DETECTION_OFFLOAD_MIN_CELLS", "0")
+    )
+    DETECTION_OFFLOAD_WORKERS: int = int(os.getenv("DETECTION_OFFLOAD_WORKERS", "0"))
+    DETECTION_OFFLOAD_MAX_PENDING: int = int(
+        os.getenv("DETECTION_OFFLOAD_MAX_PENDING", "8")
+    )
+    WRITE_BEHIND_MAX_PENDING: int = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "0"))
+    WRITE_BEHIND_FLUSH_INTERVAL_MS: int = int(
+        os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "50")
+    )
+    WRITE_BEHIND_FLUSH_RECORDS: int = int(
+        os.getenv("WRITE_BEHIND_FLUSH_RECORDS", "500")
+    )
+    WRITE_BEHIND_PUT_TIMEOUT: float = float(os.getenv("WRITE_BEHIND_PUT_TIMEOUT", "1"))
+    # Request and stage timings exposed on /metrics.
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Debug only: profiles requests sending PROFILING_HEADER, or a sampled share of them.
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_HEADER: str = os.getenv("PROFILING_HEADER", "X-Profile")
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
 
 
 # Instancia de configuración global
@@ -8,8 +8,9 @@ import os
 import subprocess
 
 import pytest
-from adapters.api.dependencies import get_db
+from adapters.api.dependencies import get_db, get_read_db
 from config import settings
+from dependencies.dna_service import stats_cache, verdict_cache
 from fast_api.fast_api_app import create_app
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -131,11 +132,21 @@ def setup_override_get_db(db_session: Session):
     """
     Overrides the `get_db` FastAPI dependency to use the test database session.
 
-    Replaces the application's `get_db` dependency with a version that yields
-    the session provided by the `db_session` fixture.
+    Replaces the application's `get_db` and `get_read_db` dependencies with a version
+    that yields the session provided by the `db_session` fixture.
     """
 
     app.dependency_overrides[get_db] = override_get_db(db_session=db_session)
+    app.dependency_overrides[get_read_db] = override_get_db(db_session=db_session)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def clear_caches():
+    """
+    Clears the caches shared by the application, so no test sees data left by another one.
+    """
+    stats_cache.clear()
+    verdict_cache.clear()
 
 
 def override_get_db(db_session: Session):
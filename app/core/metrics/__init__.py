@@ -0,0 +1,53 @@
+"""
+Metrics of the application, exposed on the `/metrics` route
+"""
+
+from core.metrics.registry import Counter, Histogram, MetricsRegistry
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time spent serving HTTP requests, by route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+STAGE_DURATION = registry.register(
+    Histogram(
+        "mutant_stage_duration_seconds",
+        "Time spent in each stage of the DNA checks and stats.",
+        ("stage",),
+    )
+)
+STAGE_ERRORS = registry.register(
+    Counter(
+        "mutant_stage_errors_total",
+        "Stages of the DNA checks and stats that raised an error.",
+        ("stage",),
+    )
+)
+DETECTIONS = registry.register(
+    Counter(
+        "mutant_detections_total",
+        "DNA matrices classified by the detection engine, by verdict.",
+        ("verdict",),
+    )
+)
+
+
+class StageMetrics:
+    """
+    Children of `STAGE_DURATION` and `STAGE_ERRORS` for one stage.
+
+    They are resolved once, when the instrumented code is set up, so timing a call
+    does not look its labels up again."""
+
+    __slots__ = ("duration", "errors")
+
+    def __init__(self, stage: str):
+        """
+        :param stage: The label of the stage.
+        """
+        self.duration = STAGE_DURATION.labels(stage)
+        self.errors = STAGE_ERRORS.labels(stage)
@@ -0,0 +1,230 @@
+"""
+Metrics registry
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds, from a cached verdict to a large matrix classified inline.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a label value for the Prometheus text format.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    Renders label pairs as `{name="value",...}`, or nothing without labels.
+    """
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """
+    Base class of the metric families, holding one child per combination of label values.
+
+    Children are created on first use and kept for the life of the process, so the label
+    values must come from a bounded set such as route templates or stage names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """
+        Returns the child of the given label values, creating it on first use.
+
+        :param values: One value per label name, in the same order.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """
+        Creates the child holding the values of one combination of label values.
+        """
+
+    @abstractmethod
+    def _render_child(self, labels: Tuple[str, ...], child) -> List[str]:
+        """
+        Renders the sample lines of one child, without the help and type lines.
+
+        :param labels: The label values of the child.
+        :param child: The child created by `_new_child`.
+        """
+
+    def render(self) -> List[str]:
+        """
+        Renders the family in the Prometheus text format.
+
+        :return: The lines of the family, its help and type lines first.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels, child in sorted(self._children.items()):
+            lines.extend(self._render_child(labels, child))
+        return lines
+
+
+class _CounterChild:
+    """
+    Value of a counter for one combination of label values.
+    """
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Adds to the counter.
+        """
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter, such as a number of calls or errors.
+    """
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild(self._lock)
+
+    def _render_child(self, labels, child: _CounterChild) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {child.value}"]
+
+
+class _HistogramChild:
+    """
+    Bucket counts and sum of a histogram for one combination of label values.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...], lock: threading.Lock):
+        self.bounds = bounds
+        # One count per bound plus the +Inf one, cumulated only when rendered.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float) -> None:
+        """
+        Records a value, in seconds for durations.
+        """
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets, such as durations.
+
+    An observation costs a binary search over the bucket bounds and two additions, so
+    histograms can stay on in production."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, self._lock)
+
+    def _render_child(self, labels, child: _HistogramChild) -> List[str]:
+        with self._lock:
+            counts, total = list(child.counts), child.sum
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(
+                f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+            )
+        suffix = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{suffix} {total}")
+        lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Set of metric families rendered together on the `/metrics` route.
+
+    Metrics live in the memory of each worker process, like the other diagnostics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Adds a metric family to the registry.
+
+        :param metric: A `Counter` or a `Histogram`.
+        :return: The same metric, so it can be defined and registered at once.
+        :raises ValueError: If another family has the same name.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Renders every family in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -9,50 +9,82 @@ from core.exceptions.custom_exceptions import (
     IntegrityError,
     ValidationError,
 )
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+def error_response(exc: Exception) -> ORJSONResponse:
+    """
+    Maps an exception raised while serving a request to the JSON response sent back.
+
+    :param exc: The exception raised by the application.
+    :return: The response with the error message and status code.
+    """
+    if isinstance(exc, ValidationError):
+        logging.error("ValidationError %s: ", exc)
+        return ORJSONResponse(
+            {"message": "Validation error", "code": "ValidationError"},
+            status_code=exc.status_code,
+        )
+    if isinstance(exc, IntegrityError):
+        logging.error("IntegrityError: %s", exc)
+        return ORJSONResponse(
+            {"message": "Integrity error", "code": "INT001"},
+            status_code=exc.status_code,
+        )
+    if isinstance(exc, CustomAPIException):
+        logging.error("CustomAPIException: %s", exc)
+        return ORJSONResponse(
+            {"message": "Conctact admin site", "code": str(exc.status_code)},
+            status_code=exc.status_code,
+        )
+    logging.error("Unexpected error: %s", exc)
+    return ORJSONResponse(
+        {
+            "message": "An unexpected error occurred",
+            "details": "Contact admin site",
+        },
+        status_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+class ErrorHandlingMiddleware:
     """
     Middleware for centralized error handling in FastAPI.
 
     This middleware catches and handles custom exceptions such as `ValidationError`, `IntegrityError`,
     and `CustomAPIException`, as well as general exceptions. It returns appropriate JSON responses
-    with error messages and status codes."""
+    with error messages and status codes.
 
-    async def dispatch(self, request: Request, call_next):
+    It is a pure ASGI middleware: messages go straight between the server and the
+    application, without the task and memory stream `BaseHTTPMiddleware` puts in between,
+    so streamed requests and responses such as NDJSON uploads pass through unchanged.
+    Errors raised once a response has started cannot change its status and are re-raised.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Intercepts and processes the request, handling any exceptions.
+        Serves the request, replying with the error response if the application raises.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_watching_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-        except ValidationError as exc:
-            logging.error("ValidationError %s: ", exc)
-            return JSONResponse(
-                {"message": "Validation error", "code": "ValidationError"},
-                status_code=exc.status_code,
-            )
-        except IntegrityError as exc:
-            logging.error("IntegrityError: %s", exc)
-            return JSONResponse(
-                {"message": "Integrity error", "code": "INT001"},
-                status_code=exc.status_code,
-            )
-        except CustomAPIException as exc:
-            logging.error("CustomAPIException: %s", exc)
-            return JSONResponse(
-                {"message": "Conctact admin site", "code": str(exc.status_code)},
-                status_code=exc.status_code,
-            )
+            await self.app(scope, receive, send_watching_start)
         except Exception as exc:
-            logging.error("Unexpected error: %s", exc)
-            return JSONResponse(
-                {
-                    "message": "An unexpected error occurred",
-                    "details": "Contact admin site",
-                },
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
+            if response_started:
+                raise
+            await error_response(exc)(scope, receive, send)
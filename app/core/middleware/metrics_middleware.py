@@ -0,0 +1,46 @@
+"""
+Metrics Middleware
+"""
+
+import time
+
+from core.metrics import REQUEST_DURATION
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request into `http_request_duration_seconds`.
+
+    Requests are labelled with the template of the route that served them, such as
+    `/api/v1/mutant/`, so the number of label combinations stays bounded whatever paths
+    clients send. Requests no route matched are labelled `unmatched`. Streamed responses
+    are timed until their last chunk is sent."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router adds the matched route to the scope shared with the middlewares.
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,98 @@
+"""
+Profiling Middleware
+"""
+
+import logging
+import os
+import random
+import re
+import time
+import uuid
+
+from core.profiling.sampler import StackSampler
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling the requests that carry a trigger header, or a random
+    share of them, with a `StackSampler`.
+
+    The samples of each profiled request are written to the profiles directory as
+    collapsed stacks, ready for flame graph tools. Its response gets a `Server-Timing`
+    header with the time taken until the response started and the name of the profile.
+    Other requests go straight to the application."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        header: str = "X-Profile",
+        sample_rate: float = 0.0,
+        interval: float = 0.001,
+    ):
+        """
+        :param app: The application to profile.
+        :param directory: The directory the profiles are written to.
+        :param header: The request header asking for a profile, whatever its value.
+        :param sample_rate: The share of the other requests that are profiled.
+        :param interval: Seconds between two samples of the stacks.
+        """
+        self.app = app
+        self.directory = directory
+        self.header = header.lower().encode("latin-1")
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+    def _selected(self, scope: Scope) -> bool:
+        """
+        Tells whether a request is profiled.
+        """
+        if any(name == self.header for name, _ in scope["headers"]):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _write(self, name: str, sampler: StackSampler) -> None:
+        """
+        Writes the samples of a request to the profiles directory.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as file:
+            file.write(sampler.collapsed())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:64] or "root"
+        name = (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{path}"
+            f"-{uuid.uuid4().hex[:8]}.collapsed"
+        )
+        sampler = StackSampler(self.interval)
+        started = time.perf_counter()
+        sampler.start()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", f'app;dur={duration:.3f}, profile;desc="{name}"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            sampler.stop()
+            await run_in_threadpool(self._write, name, sampler)
+            logging.info(
+                "Profile of %s %s written to %s with %s samples",
+                scope["method"],
+                scope["path"],
+                name,
+                sampler.samples,
+            )
@@ -0,0 +1,119 @@
+"""
+Bloom filter
+"""
+
+import math
+import threading
+from typing import Iterable
+
+
+class SequenceBloomFilter:
+    """
+    In-memory Bloom filter over the keys of the DNA sequences stored in the database.
+
+    Keys are the `canonical_hash` digests of the stored rows, so the filter is loaded
+    straight from that column. It answers "definitely absent" or "maybe present" for
+    a key, so lookups for new DNA can be skipped. A wrong "definitely absent" answer is
+    harmless, because new sequences are stored with an upsert that falls back to the
+    stored verdict, so the filter only has to be kept up to date by the process that
+    owns it.
+
+    The filter also counts how many lookups it saved and how many "maybe present"
+    answers turned out to be false positives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Sizes an empty filter for the expected number of sequences.
+
+        :param capacity: Number of sequences the filter is sized for.
+        :param error_rate: False-positive rate expected once `capacity` sequences are added.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.checks = 0
+        self.skipped_lookups = 0
+        self.false_positives = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: bytes):
+        """
+        Yields the bit positions of a key, derived from its first 16 bytes by double hashing.
+
+        Keys are already uniform SHA-256 digests, so they are not hashed again.
+        """
+        first = int.from_bytes(key[:8], "little")
+        second = int.from_bytes(key[8:16], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key: bytes) -> None:
+        """
+        Adds the key of a stored sequence to the filter.
+
+        :param key: The digest of the canonical form of the sequence.
+        """
+        with self._lock:
+            for position in self._positions(key):
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def load(self, keys: Iterable[bytes]) -> None:
+        """
+        Adds every given key to the filter.
+
+        :param keys: The digests of the stored canonical forms, usually streamed from
+            the database.
+        """
+        for key in keys:
+            self.add(key)
+
+    def might_contain(self, key: bytes) -> bool:
+        """
+        Tells whether a sequence may have been stored.
+
+        :param key: The digest of the canonical form of the sequence.
+        :return: False if the key was definitely never added, True if it may have been.
+        """
+        self.checks += 1
+        present = all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+        if not present:
+            self.skipped_lookups += 1
+        return present
+
+    def record_false_positive(self) -> None:
+        """
+        Records that a "maybe present" answer was not found in the database.
+        """
+        self.false_positives += 1
+
+    def metrics(self) -> dict:
+        """
+        Returns the sizing of the filter and its lookup counters.
+
+        The estimated false-positive rate is derived from the share of bits set, the
+        observed one from the lookups that found nothing after a "maybe present" answer.
+        """
+        bits_set = bin(int.from_bytes(self._bits, "little")).count("1")
+        negatives = self.skipped_lookups + self.false_positives
+        return {
+            "capacity": self.capacity,
+            "count": self.count,
+            "size_bits": self.size,
+            "hash_count": self.hash_count,
+            "checks": self.checks,
+            "skipped_lookups": self.skipped_lookups,
+            "false_positives": self.false_positives,
+            "estimated_false_positive_rate": (bits_set / self.size) ** self.hash_count,
+            "observed_false_positive_rate": (
+                self.false_positives / negatives if negatives > 0 else 0
+            ),
+        }
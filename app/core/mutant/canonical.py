@@ -0,0 +1,54 @@
+"""
+Canonical DNA forms
+
+The mutant verdict of a square matrix does not change under its eight rotations and
+reflections, transposition included: rows and columns swap places and both diagonal
+directions are kept. Every variant of a matrix therefore shares one canonical form,
+which is the key its verdict is cached and looked up by.
+"""
+
+import math
+from typing import Iterator, List, Tuple
+
+
+def _variants(rows: List[str]) -> Iterator[List[str]]:
+    """
+    Yields the eight rotations and reflections of a square matrix.
+    """
+    columns = ["".join(column) for column in zip(*rows)]
+    for matrix in (rows, columns):
+        yield matrix
+        yield matrix[::-1]
+        yield [row[::-1] for row in matrix]
+        yield [row[::-1] for row in reversed(matrix)]
+
+
+def canonical_sequence(sequence: str) -> str:
+    """
+    Returns the canonical form of a joined DNA sequence.
+
+    The shape of a matrix is not kept once its rows are joined, so the sequence is read
+    as a square matrix, the only shape whose variants share a verdict.
+
+    :param sequence: The joined rows of a DNA matrix.
+    :return: The smallest joined sequence among the rotations and reflections of the
+        matrix. Sequences whose length is not a perfect square are their own canonical form.
+    """
+    size = math.isqrt(len(sequence))
+    if size < 2 or size * size != len(sequence):
+        return sequence
+    rows = [sequence[start : start + size] for start in range(0, len(sequence), size)]
+    return min("".join(variant) for variant in _variants(rows))
+
+
+def record_key(record: Tuple) -> str:
+    """
+    Returns the key a DNA record is cached and looked up by.
+
+    :param record: A (sequence, is_mutant) pair, optionally followed by the canonical
+        form of the sequence.
+    :return: The canonical form held by the record, or computed from its sequence.
+    """
+    if len(record) > 2 and record[2] is not None:
+        return record[2]
+    return canonical_sequence(record[0])
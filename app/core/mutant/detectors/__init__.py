@@ -0,0 +1,33 @@
+"""
+Detection engines for mutant DNA
+"""
+
+from importlib import import_module
+
+from core.mutant.detectors.base import MutantDetector
+
+# Engines are imported lazily so optional dependencies are only needed when selected.
+DETECTION_ENGINES = {
+    "python": "core.mutant.detectors.python_detector.PythonMutantDetector",
+    "numpy": "core.mutant.detectors.numpy_detector.NumpyMutantDetector",
+    "bitboard": "core.mutant.detectors.bitboard_detector.BitboardMutantDetector",
+    "streaming": "core.mutant.detectors.streaming_detector.StreamingMutantDetector",
+}
+
+
+def get_detector(name: str) -> MutantDetector:
+    """
+    Builds the detection engine registered under the given name.
+
+    :param name: The engine name, one of the keys of `DETECTION_ENGINES`.
+    :return: A new `MutantDetector` instance.
+    :raises ValueError: If no engine is registered under that name.
+    """
+    try:
+        path = DETECTION_ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown detection engine '{name}', expected one of {sorted(DETECTION_ENGINES)}"
+        ) from None
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(import_module(module_name), class_name)()
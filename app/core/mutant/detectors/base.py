@@ -0,0 +1,39 @@
+"""
+Base detector
+"""
+
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class MutantDetector(ABC):
+    """
+    Abstract detection engine used by `MutantService` to classify a DNA matrix.
+
+    A DNA matrix is mutant when more than one sequence of four identical bases is found.
+    Rows and columns count once each, no matter how many runs they hold, while every
+    diagonal window of four identical bases counts on its own. All engines must keep
+    these semantics so they can be swapped through configuration.
+
+    Engines expect a square matrix of the bases A, T, C and G, as checked by `check_dna`
+    when requests are read, and neither validate nor normalize their input."""
+
+    @abstractmethod
+    def is_mutant(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA matrix belongs to a mutant.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+
+    async def is_mutant_async(self, dna: List[str]) -> bool:
+        """
+        Awaitable variant of `is_mutant`, used by `AsyncMutantService`.
+
+        Engines run inline by default, engines that move the work elsewhere override it.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+        return self.is_mutant(dna)
@@ -0,0 +1,72 @@
+"""
+Bitboard detector
+"""
+
+from typing import List
+
+from core.mutant.detectors.base import MutantDetector
+
+
+def _popcount(value: int) -> int:
+    """
+    Counts the bits set in a non-negative integer.
+    """
+    return bin(value).count("1")
+
+
+class BitboardMutantDetector(MutantDetector):
+    """
+    Detection engine that encodes every row as one bit mask per base.
+
+    Bit j of a mask is set when column j holds that base, so runs of four are found with
+    shift-and-AND operations over Python big ints instead of character comparisons:
+    `row & row >> 1 & row >> 2 & row >> 3` for horizontals, and AND-ing the last four
+    rows (shifted by one more bit per row for diagonals) for the other directions.
+    Rows are encoded lazily and only the last four are kept, so the scan stops as soon
+    as more than one sequence is found."""
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA sequence belongs to a mutant.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+        size = len(dna)
+        if size < 4:
+            return False
+
+        # One translation table per base turns a row into the binary digits of its mask.
+        # Rows are reversed before parsing so bit j matches column j.
+        alphabet = set("".join(dna))
+        tables = [
+            str.maketrans({char: "1" if char == base else "0" for char in alphabet})
+            for base in alphabet
+        ]
+
+        window = []  # Masks of the last four rows, one list of per-base masks per row.
+        rows_with_runs = 0
+        columns_with_runs = 0
+        diagonal_runs = 0
+
+        for row in dna:
+            masks = [int(row[::-1].translate(table), 2) for table in tables]
+            if any(mask & mask >> 1 & mask >> 2 & mask >> 3 for mask in masks):
+                rows_with_runs += 1
+
+            window.append(masks)
+            if len(window) > 4:
+                window.pop(0)
+
+            if len(window) == 4:
+                first, second, third, fourth = window
+                for base in range(len(tables)):
+                    a, b, c, d = first[base], second[base], third[base], fourth[base]
+                    columns_with_runs |= a & b & c & d
+                    diagonal_runs += _popcount(a & b >> 1 & c >> 2 & d >> 3)
+                    diagonal_runs += _popcount(a >> 3 & b >> 2 & c >> 1 & d)
+
+            if rows_with_runs + _popcount(columns_with_runs) + diagonal_runs > 1:
+                return True
+
+        return False
@@ -0,0 +1,53 @@
+"""
+Instrumented detector
+"""
+
+import time
+from typing import List
+
+from core.metrics import DETECTIONS, StageMetrics
+from core.mutant.detectors.base import MutantDetector
+
+
+class InstrumentedMutantDetector(MutantDetector):
+    """
+    Detection engine that times the wrapped engine as the `is_mutant` stage of the service.
+
+    Durations go to the `mutant_stage_duration_seconds` histogram and verdicts to the
+    `mutant_detections_total` counter. Offloaded matrices are timed until their verdict
+    comes back from the pool."""
+
+    def __init__(self, detector: MutantDetector):
+        """
+        :param detector: The engine that classifies the matrices.
+        """
+        self.detector = detector
+        self._stage = StageMetrics("is_mutant")
+        self._verdicts = {
+            True: DETECTIONS.labels("mutant"),
+            False: DETECTIONS.labels("human"),
+        }
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        started = time.perf_counter()
+        try:
+            is_mutant = self.detector.is_mutant(dna)
+        except Exception:
+            self._stage.errors.inc()
+            raise
+        finally:
+            self._stage.duration.observe(time.perf_counter() - started)
+        self._verdicts[bool(is_mutant)].inc()
+        return is_mutant
+
+    async def is_mutant_async(self, dna: List[str]) -> bool:
+        started = time.perf_counter()
+        try:
+            is_mutant = await self.detector.is_mutant_async(dna)
+        except Exception:
+            self._stage.errors.inc()
+            raise
+        finally:
+            self._stage.duration.observe(time.perf_counter() - started)
+        self._verdicts[bool(is_mutant)].inc()
+        return is_mutant
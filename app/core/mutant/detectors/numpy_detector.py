@@ -0,0 +1,72 @@
+"""
+NumPy detector
+"""
+
+from typing import List
+
+import numpy as np
+from core.mutant.detectors.base import MutantDetector
+
+
+def _runs_of_four(first, second, third):
+    """
+    Marks the windows where three consecutive pairwise equalities hold, i.e. four equal bases.
+
+    :param first: Pairwise equalities at the start of each window.
+    :param second: The same equalities shifted one step along the scanned direction.
+    :param third: The same equalities shifted two steps along the scanned direction.
+    :return: Boolean array with True at the start of every run of four.
+    """
+    return first & second & third
+
+
+class NumpyMutantDetector(MutantDetector):
+    """
+    Vectorized detection engine built on NumPy.
+
+    The matrix is converted once into a uint8 array and every direction is scanned with
+    shifted array slices instead of per-character comparisons. Directions are checked one
+    after another so the scan stops as soon as more than one sequence is found."""
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA sequence belongs to a mutant.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+        size = len(dna)
+        if size < 4:
+            return False
+
+        matrix = np.frombuffer("".join(dna).encode("ascii"), dtype=np.uint8).reshape(
+            size, -1
+        )
+        count = 0
+
+        # Horizontal: one hit per row, no matter how many runs it holds.
+        equal = matrix[:, :-1] == matrix[:, 1:]
+        runs = _runs_of_four(equal[:, :-2], equal[:, 1:-1], equal[:, 2:])
+        count += int(np.count_nonzero(runs.any(axis=1)))
+        if count > 1:
+            return True
+
+        # Vertical: one hit per column.
+        equal = matrix[:-1] == matrix[1:]
+        runs = _runs_of_four(equal[:-2], equal[1:-1], equal[2:])
+        count += int(np.count_nonzero(runs.any(axis=0)))
+        if count > 1:
+            return True
+
+        # Diagonal: every window of four counts.
+        equal = matrix[:-1, :-1] == matrix[1:, 1:]
+        runs = _runs_of_four(equal[:-2, :-2], equal[1:-1, 1:-1], equal[2:, 2:])
+        count += int(np.count_nonzero(runs))
+        if count > 1:
+            return True
+
+        # Anti-diagonal: equal[i, j] compares (i, j + 1) with (i + 1, j).
+        equal = matrix[:-1, 1:] == matrix[1:, :-1]
+        runs = _runs_of_four(equal[:-2, 2:], equal[1:-1, 1:-1], equal[2:, :-2])
+        count += int(np.count_nonzero(runs))
+        return count > 1
@@ -0,0 +1,114 @@
+"""
+Offloading detector
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional
+
+from core.exceptions.custom_exceptions import CustomAPIException
+from core.mutant.detectors.base import MutantDetector
+from fastapi import status
+
+
+class OffloadingMutantDetector(MutantDetector):
+    """
+    Detection engine that sends large matrices to a pool of worker processes.
+
+    Matrices with fewer than `min_cells` cells are classified inline by the wrapped engine,
+    while larger ones run in a `ProcessPoolExecutor`, so a single huge matrix no longer holds
+    the GIL or the event loop of the web worker. At most `max_pending` matrices may be queued
+    or running in the pool; further ones are rejected with a 503 instead of piling up.
+
+    The pool is created by `start` and released by `shutdown`, both called from the
+    application lifespan. Until it is started, every matrix is classified inline."""
+
+    def __init__(
+        self,
+        detector: MutantDetector,
+        min_cells: int,
+        max_workers: Optional[int] = None,
+        max_pending: int = 8,
+    ):
+        """
+        Initializes the detector without starting the pool.
+
+        :param detector: The engine that classifies the matrices, inline or in the workers.
+        :param min_cells: Number of cells from which a matrix is sent to the pool.
+        :param max_workers: Number of worker processes, the number of CPUs by default.
+        :param max_pending: Maximum number of matrices queued or running in the pool.
+        """
+        self.detector = detector
+        self.min_cells = min_cells
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """
+        Starts the worker pool. Workers are spawned rather than forked, so they do not
+        inherit the threads and database connections of the web worker.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        """
+        Waits for the running matrices and stops the worker pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA matrix belongs to a mutant, blocking until the verdict is known.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        :raises CustomAPIException: 503 error if the pool queue is full.
+        """
+        if not self._should_offload(dna):
+            return self.detector.is_mutant(dna)
+        return self._submit(dna).result()
+
+    async def is_mutant_async(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA matrix belongs to a mutant without blocking the event loop.
+
+        :param dna: A list of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        :raises CustomAPIException: 503 error if the pool queue is full.
+        """
+        if not self._should_offload(dna):
+            return self.detector.is_mutant(dna)
+        return await asyncio.wrap_future(self._submit(dna))
+
+    def _should_offload(self, dna: List[str]) -> bool:
+        """
+        Tells whether a matrix is large enough to be classified in the pool.
+        """
+        return self._executor is not None and sum(map(len, dna)) >= self.min_cells
+
+    def _submit(self, dna: List[str]) -> Future:
+        """
+        Queues a matrix in the pool, taking one of the `max_pending` slots until it is done.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise CustomAPIException(
+                "Too many large DNA matrices in progress",
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        try:
+            future = self._executor.submit(self.detector.is_mutant, dna)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
@@ -0,0 +1,63 @@
+"""
+Pure Python detector
+"""
+
+from typing import List
+
+from core.mutant.detectors.base import MutantDetector
+
+
+class PythonMutantDetector(MutantDetector):
+    """
+    Reference detection engine written with plain Python loops.
+
+    It has no third-party dependencies and is the default engine."""
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        """
+        Determines if a given DNA sequence belongs to a mutant.
+
+        This method checks for specific patterns within the DNA sequences to identify mutant characteristics
+        based on horizontal, vertical, and diagonal alignments.
+
+        :param dna: A list of strings, each representing a row in the DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+
+        def has_sequence(line):
+            return any(
+                line[i] == line[i + 1] == line[i + 2] == line[i + 3]
+                for i in range(len(line) - 3)
+            )
+
+        size = len(dna)
+        count = 0
+
+        for i in range(size):
+            if has_sequence(dna[i]):  # Horizontal
+                count += 1
+            if has_sequence([dna[j][i] for j in range(size)]):  # Vertical
+                count += 1
+            if count > 1:
+                return True
+
+        for i in range(size - 3):
+            for j in range(size - 3):
+                if (
+                    dna[i][j]
+                    == dna[i + 1][j + 1]
+                    == dna[i + 2][j + 2]
+                    == dna[i + 3][j + 3]
+                ):
+                    count += 1
+                if (
+                    dna[i][j + 3]
+                    == dna[i + 1][j + 2]
+                    == dna[i + 2][j + 1]
+                    == dna[i + 3][j]
+                ):
+                    count += 1
+                if count > 1:
+                    return True
+
+        return False
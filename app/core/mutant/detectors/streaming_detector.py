@@ -0,0 +1,91 @@
+"""
+Streaming detector
+"""
+
+import re
+from typing import Iterable
+
+from core.mutant.detectors.base import MutantDetector
+
+HORIZONTAL_RUN = re.compile(r"(.)\1\1\1")
+
+
+class StreamingScan:
+    """
+    Running state of a row-by-row scan over a DNA matrix.
+
+    Only the previous row and one run-length counter per column, diagonal and
+    anti-diagonal are kept, so memory grows with the width of the matrix and not
+    with its number of cells. Rows are pushed with `feed` until it returns True."""
+
+    def __init__(self):
+        """Init an empty scan"""
+        self.rows = 0
+        self.count = 0
+        self._previous = None
+        self._vertical = []
+        self._diagonal = []
+        self._anti_diagonal = []
+        self._columns_with_runs = set()
+
+    def feed(self, row: str) -> bool:
+        """
+        Adds the next row of the matrix to the scan.
+
+        :param row: The next row of the DNA matrix.
+        :return: True once more than one sequence has been found, False otherwise.
+        """
+        previous = self._previous
+        if previous is None:
+            ones = [1] * len(row)
+            self._vertical, self._diagonal, self._anti_diagonal = ones, ones, ones
+        else:
+            self._vertical = [
+                run + 1 if above == base else 1
+                for run, above, base in zip(self._vertical, previous, row)
+            ]
+            # Diagonal runs come from the upper-left cell, anti-diagonal ones from the upper-right.
+            self._diagonal = [1] + [
+                run + 1 if above == base else 1
+                for run, above, base in zip(self._diagonal, previous, row[1:])
+            ]
+            self._anti_diagonal = [
+                run + 1 if above == base else 1
+                for run, above, base in zip(self._anti_diagonal[1:], previous[1:], row)
+            ] + [1]
+
+            for column, run in enumerate(self._vertical):
+                if run == 4 and column not in self._columns_with_runs:
+                    self._columns_with_runs.add(column)
+                    self.count += 1
+            self.count += sum(run >= 4 for run in self._diagonal)
+            self.count += sum(run >= 4 for run in self._anti_diagonal)
+
+        if HORIZONTAL_RUN.search(row):
+            self.count += 1
+
+        self._previous = row
+        self.rows += 1
+        return self.count > 1
+
+
+class StreamingMutantDetector(MutantDetector):
+    """
+    Detection engine that reads the matrix one row at a time in a single pass.
+
+    Besides lists it accepts any iterable of rows, such as a generator. Like the other
+    engines, it expects a square matrix already checked by `check_dna`. Reading stops at the row where the second sequence is
+    found, so the rest of the input is never consumed."""
+
+    def is_mutant(self, dna: Iterable[str]) -> bool:
+        """
+        Determines if a given DNA sequence belongs to a mutant.
+
+        :param dna: An iterable of strings, each representing a row in the NxN DNA matrix.
+        :return: True if the DNA sequence is identified as mutant, False otherwise.
+        """
+        scan = StreamingScan()
+        for row in dna:
+            if scan.feed(row):
+                return True
+        return False
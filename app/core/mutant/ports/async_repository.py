@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+
+class AsyncDNARepository(ABC):
+    """
+    Asynchronous counterpart of `DNARepository`.
+
+    Every method mirrors the one of `DNARepository` with the same name and is awaited,
+    so database round trips do not block the event loop."""
+
+    @abstractmethod
+    async def get_dna_by_sequence(self, sequence: str):
+        """
+        Retrieves a DNA record from the database based on the provided DNA sequence.
+
+        :param sequence: The canonical form of the DNA sequence, see `canonical_sequence`.
+        :return: An object representing the DNA record if found, otherwise None.
+        """
+
+    async def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        """
+        Returns the classification of a sequence if it is known without a database round trip.
+
+        :param sequence: The DNA sequence to look up, as submitted or in canonical form.
+        :param count_miss: Whether a miss counts in the statistics of a cache, False when
+            it is retried under the canonical form of the sequence.
+        :return: The `is_mutant` flag if it is known, otherwise None.
+        """
+        return None
+
+    @abstractmethod
+    async def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
+        """
+        Creates and stores a new DNA record in the database with its classification.
+
+        :param sequence: The DNA sequence string to be stored.
+        :param is_mutant: A boolean flag indicating whether the DNA sequence is mutant or not.
+        :param canonical: The canonical form of the sequence, computed when not given.
+        """
+
+    @abstractmethod
+    async def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        """
+        Stores a DNA record unless its sequence already exists, and returns the stored classification.
+
+        :param sequence: The DNA sequence string to be stored.
+        :param is_mutant: The classification to store if the sequence is new.
+        :param canonical: The canonical form of the sequence, computed when not given.
+        :return: The `is_mutant` flag stored for the sequence, either the new or the existing one.
+        """
+
+    @abstractmethod
+    async def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        """
+        Retrieves the classification of every already stored sequence among the given ones.
+
+        :param sequences: The canonical forms of the DNA sequences to look up in a single query.
+        :return: A dictionary mapping each stored sequence to its `is_mutant` flag.
+        """
+
+    @abstractmethod
+    async def create_dna_records(self, records: List[Tuple]):
+        """
+        Stores several new DNA records at once, in a single transaction.
+
+        :param records: Pairs of DNA sequence string and `is_mutant` flag, optionally
+            followed by the canonical form of the sequence.
+        """
+
+    @abstractmethod
+    async def get_counts(self) -> Tuple[int, int]:
+        """
+        Counts the mutant and human DNA records in the database with a single query.
+
+        :return: The total number of mutant and human DNA sequences recorded.
+        """
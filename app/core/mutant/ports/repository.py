@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
 
 
 class DNARepository(ABC):
@@ -7,17 +8,85 @@ class DNARepository(ABC):
         """
         Retrieves a DNA record from the database based on the provided DNA sequence.
 
-        :param sequence: The DNA sequence string used to search for an existing record.
+        Lookups are keyed by canonical form, so the record of any rotation or reflection
+        of the sequence is returned.
+
+        :param sequence: The canonical form of the DNA sequence, see `canonical_sequence`.
         :return: An object representing the DNA record if found, otherwise None.
         """
 
+    def get_known_verdict(
+        self, sequence: str, count_miss: bool = True
+    ) -> Optional[bool]:
+        """
+        Returns the classification of a sequence if it is known without a database round trip.
+
+        Repositories backed only by the database know nothing in advance and return None,
+        caching repositories return the verdicts they hold.
+
+        :param sequence: The DNA sequence to look up, as submitted or in canonical form.
+        :param count_miss: Whether a miss counts in the statistics of a cache, False when
+            it is retried under the canonical form of the sequence.
+        :return: The `is_mutant` flag if it is known, otherwise None.
+        """
+        return None
+
     @abstractmethod
-    def create_dna_record(self, sequence: str, is_mutant: bool):
+    def create_dna_record(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ):
         """
         Creates and stores a new DNA record in the database with its classification.
 
         :param sequence: The DNA sequence string to be stored.
         :param is_mutant: A boolean flag indicating whether the DNA sequence is mutant or not.
+        :param canonical: The canonical form of the sequence, computed when not given.
+        """
+
+    @abstractmethod
+    def upsert_and_get(
+        self, sequence: str, is_mutant: bool, canonical: Optional[str] = None
+    ) -> bool:
+        """
+        Stores a DNA record unless its sequence already exists, and returns the stored classification.
+
+        The insert and the duplicate check happen in a single statement, so concurrent requests
+        with the same sequence never fail on the unique index. A sequence one of whose
+        rotations or reflections is already stored is not stored again.
+
+        :param sequence: The DNA sequence string to be stored.
+        :param is_mutant: The classification to store if the sequence is new.
+        :param canonical: The canonical form of the sequence, computed when not given.
+        :return: The `is_mutant` flag stored for the sequence, either the new or the existing one.
+        """
+
+    @abstractmethod
+    def get_verdicts_by_sequences(self, sequences: List[str]) -> Dict[str, bool]:
+        """
+        Retrieves the classification of every already stored sequence among the given ones.
+
+        :param sequences: The canonical forms of the DNA sequences to look up in a single query.
+        :return: A dictionary mapping each stored sequence to its `is_mutant` flag.
+            Sequences without any stored variant are left out.
+        """
+
+    @abstractmethod
+    def create_dna_records(self, records: List[Tuple]):
+        """
+        Stores several new DNA records at once, in a single transaction.
+
+        Sequences that are already stored are skipped instead of failing the whole batch.
+
+        :param records: Pairs of DNA sequence string and `is_mutant` flag, optionally
+            followed by the canonical form of the sequence.
+        """
+
+    @abstractmethod
+    def get_counts(self) -> Tuple[int, int]:
+        """
+        Counts the mutant and human DNA records in the database with a single query.
+
+        :return: The total number of mutant and human DNA sequences recorded.
         """
 
     @abstractmethod
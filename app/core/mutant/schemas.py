@@ -1,6 +1,33 @@
 from typing import List
 
-from pydantic import BaseModel, field_validator
+import orjson
+from config import settings
+from pydantic import BaseModel, Field, field_validator
+
+BASES = b"ATCG"
+
+
+def check_dna(value: List[str]) -> List[str]:
+    """
+    Checks that a DNA matrix is square and only holds the bases A, T, C and G.
+
+    Every check runs in C over the whole matrix: the row lengths are collected with `map`
+    and the bases are deleted from the joined rows with `bytes.translate`.
+
+    :param value: The rows of the DNA matrix.
+    :return: The rows, unchanged.
+    :raises ValueError: If the matrix is empty, ragged, not square or holds other letters.
+    """
+    if not value:
+        raise ValueError("DNA list cannot be empty")
+    if len(set(map(len, value))) != 1:
+        raise ValueError("Each DNA string must have the same length")
+    if len(value[0]) != len(value):
+        raise ValueError("The DNA matrix must be square")
+    joined = "".join(value)
+    if not joined.isascii() or joined.encode().translate(None, BASES):
+        raise ValueError("DNA strings can only contain the bases A, T, C and G")
+    return value
 
 
 class DNARequest(BaseModel):
@@ -8,12 +35,31 @@ class DNARequest(BaseModel):
 
     @field_validator("dna")
     @classmethod
-    def check_dna_length(cls, value):
-        if not value:
-            raise ValueError("DNA list cannot be empty")
+    def validate_dna(cls, value):
+        return check_dna(value)
+
+    @classmethod
+    def dna_from_json(cls, body: bytes) -> List[str]:
+        """
+        Reads the DNA matrix of a raw request body, bypassing pydantic when it is valid.
+
+        The body is parsed with orjson and checked with `check_dna`. Bodies failing that are
+        validated again by the model, which raises its usual errors.
+
+        :param body: The JSON request body.
+        :return: The rows of the DNA matrix.
+        :raises ValidationError: If the body is not a valid DNA request.
+        """
+        try:
+            dna = orjson.loads(body)["dna"]
+            if type(dna) is list and set(map(type, dna)) == {str}:
+                return check_dna(dna)
+        except (TypeError, KeyError, ValueError):
+            pass
+        return cls.model_validate_json(body).dna
 
-        length = len(value[0])
-        if any(len(seq) != length for seq in value):
-            raise ValueError("Each DNA string must have the same length")
 
-        return value
+class DNABatchRequest(BaseModel):
+    dnas: List[DNARequest] = Field(
+        min_length=1, max_length=settings.MUTANT_BATCH_MAX_SIZE
+    )
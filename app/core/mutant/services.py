@@ -1,97 +1,234 @@
-from typing import List
+from typing import List, Tuple
 
 from adapters.database.repository.dna_repository import DNARepository
+from adapters.database.sequence_codec import sequence_hash
+from core.mutant.bloom_filter import SequenceBloomFilter
+from core.mutant.canonical import canonical_sequence
+from core.mutant.detectors import MutantDetector
+from core.mutant.detectors.python_detector import PythonMutantDetector
+from core.mutant.ports.async_repository import AsyncDNARepository
+from core.mutant.stats_cache import StatsCache
 
 
 class MutantService:
-    def __init__(self, dna_repository: DNARepository):
+    def __init__(
+        self,
+        dna_repository: DNARepository,
+        detector: MutantDetector = None,
+        stats_cache: StatsCache = None,
+        sequence_filter: SequenceBloomFilter = None,
+        lookup_min_cells: int = 0,
+    ):
         """
         Initializes the MutantService with a DNA repository.
 
         :param dna_repository: An instance of DNARepository for accessing DNA records.
+        :param detector: The detection engine used to classify DNA, the pure Python one by default.
+        :param stats_cache: Optional cache shared between requests to serve recent stats.
+        :param sequence_filter: Optional Bloom filter of the stored sequences, used to look up
+            only the sequences that may already be stored.
+        :param lookup_min_cells: Without a sequence filter, the number of cells from which
+            a matrix is looked up before being classified, 0 to never look it up.
         """
         self.dna_repository = dna_repository
+        self.detector = detector or PythonMutantDetector()
+        self.stats_cache = stats_cache
+        self.sequence_filter = sequence_filter
+        self.lookup_min_cells = lookup_min_cells
 
     def is_mutant(self, dna: List[str]) -> bool:
         """
         Determines if a given DNA sequence belongs to a mutant.
 
-        This method checks for specific patterns within the DNA sequences to identify mutant characteristics
-        based on horizontal, vertical, and diagonal alignments.
+        The check is delegated to the configured detection engine, which looks for sequences
+        of four identical bases in horizontal, vertical, and diagonal alignments.
 
         :param dna: A list of strings, each representing a row in the DNA matrix.
         :return: True if the DNA sequence is identified as mutant, False otherwise.
         """
-
-        def has_sequence(line):
-            return any(
-                line[i] == line[i + 1] == line[i + 2] == line[i + 3]
-                for i in range(len(line) - 3)
-            )
-
-        size = len(dna)
-        count = 0
-
-        for i in range(size):
-            if has_sequence(dna[i]):  # Horizontal
-                count += 1
-            if has_sequence([dna[j][i] for j in range(size)]):  # Vertical
-                count += 1
-            if count > 1:
-                return True
-
-        for i in range(size - 3):
-            for j in range(size - 3):
-                if (
-                    dna[i][j]
-                    == dna[i + 1][j + 1]
-                    == dna[i + 2][j + 2]
-                    == dna[i + 3][j + 3]
-                ):
-                    count += 1
-                if (
-                    dna[i][j + 3]
-                    == dna[i + 1][j + 2]
-                    == dna[i + 2][j + 1]
-                    == dna[i + 3][j]
-                ):
-                    count += 1
-                if count > 1:
-                    return True
-
-        return False
+        return self.detector.is_mutant(dna)
 
     def check_and_save_dna(self, dna: List[str]) -> bool:
         """
         Checks if the provided DNA sequence is mutant and saves it to the database if it's new.
 
-        If the DNA sequence doesn't exist in the database, it will be saved along with its classification
-        as mutant or human. If it exists, the method returns its current classification.
+        Verdicts the repository already knows, such as cached ones, are returned right away,
+        first by the sequence itself and then by its canonical form, which is only computed
+        when the sequence is unknown. Sequences are then looked up by canonical form, so the
+        rotations and reflections of a stored matrix share its verdict and are not stored
+        again. When a sequence filter is set, the canonical form is looked up unless the
+        filter rules it out. Without one, only matrices of at least `lookup_min_cells` cells
+        are looked up, where classifying costs more than a round trip, and the others are
+        classified and stored with a single upsert. If the sequence or one of its variants
+        was already stored, the upsert returns the classification it was stored with.
 
         :param dna: A list of strings, each representing a row in the DNA matrix.
         :return: True if the DNA sequence is mutant, False otherwise.
         """
 
         dna_sequence = "".join(dna)
-        existing_dna = self.dna_repository.get_dna_by_sequence(dna_sequence)
-        if existing_dna:
-            return existing_dna.is_mutant
+        known_verdict = self.dna_repository.get_known_verdict(
+            dna_sequence, count_miss=False
+        )
+        if known_verdict is not None:
+            return known_verdict
+        # Retried even when the sequence is its own canonical form, to count its miss.
+        canonical = canonical_sequence(dna_sequence)
+        known_verdict = self.dna_repository.get_known_verdict(canonical)
+        if known_verdict is not None:
+            return known_verdict
 
-        is_mutant_flag = self.is_mutant(dna)
-        self.dna_repository.create_dna_record(dna_sequence, is_mutant_flag)
+        if self._may_be_stored(canonical):
+            existing_dna = self.dna_repository.get_dna_by_sequence(canonical)
+            if existing_dna:
+                return existing_dna.is_mutant
+            self._record_false_positive()
+
+        is_mutant_flag = self.dna_repository.upsert_and_get(
+            dna_sequence, self.is_mutant(dna), canonical
+        )
+        self._remember_sequences([canonical])
         return is_mutant_flag
 
+    def check_and_save_dna_batch(self, dna_list: List[List[str]]) -> List[bool]:
+        """
+        Checks several DNA sequences at once and saves the new ones to the database.
+
+        Already known sequences are fetched with a single lookup, skipping the ones the
+        sequence filter rules out. The unknown ones are classified in one pass and stored
+        with a single insert. Repeated sequences inside the batch, rotations and reflections
+        included, are only classified and stored once.
+
+        :param dna_list: A list of DNA matrices, each one a list of row strings.
+        :return: The mutant flag of every DNA matrix, in the same order as received.
+        """
+        sequences, canonicals = self._canonical_forms(dna_list)
+        candidates = self._lookup_candidates(canonicals)
+        verdicts = (
+            self.dna_repository.get_verdicts_by_sequences(candidates)
+            if candidates
+            else {}
+        )
+
+        new_records = [
+            (dna_sequence, self.is_mutant(dna), canonical)
+            for dna, dna_sequence, canonical in self._pending(
+                dna_list, sequences, canonicals, verdicts
+            )
+        ]
+        self.dna_repository.create_dna_records(new_records)
+        return self._batch_verdicts(canonicals, verdicts, new_records)
+
+    @staticmethod
+    def _canonical_forms(dna_list: List[List[str]]) -> Tuple[List[str], List[str]]:
+        """
+        Joins the DNA matrices of a batch into sequences and computes their canonical forms.
+
+        :return: The sequences and the canonical forms, in the order of the batch.
+        """
+        sequences = ["".join(dna) for dna in dna_list]
+        return sequences, [
+            canonical_sequence(dna_sequence) for dna_sequence in sequences
+        ]
+
+    @staticmethod
+    def _pending(
+        dna_list: List[List[str]],
+        sequences: List[str],
+        canonicals: List[str],
+        verdicts: dict,
+    ) -> List[Tuple[List[str], str, str]]:
+        """
+        Picks the DNA of a batch without a known verdict, one per distinct canonical form.
+
+        :return: The (dna, sequence, canonical) triplets left to classify and store.
+        """
+        pending = {}
+        for dna, dna_sequence, canonical in zip(dna_list, sequences, canonicals):
+            if canonical not in verdicts and canonical not in pending:
+                pending[canonical] = (dna, dna_sequence, canonical)
+        return list(pending.values())
+
+    def _batch_verdicts(
+        self,
+        canonicals: List[str],
+        verdicts: dict,
+        new_records: List[Tuple[str, bool, str]],
+    ) -> List[bool]:
+        """
+        Adds the freshly classified records to the verdicts and the sequence filter.
+
+        :return: The mutant flag of every DNA matrix, in the order of the batch.
+        """
+        for _, is_mutant_flag, canonical in new_records:
+            verdicts[canonical] = is_mutant_flag
+        self._remember_sequences([canonical for _, _, canonical in new_records])
+        return [verdicts[canonical] for canonical in canonicals]
+
+    def _may_be_stored(self, dna_sequence: str) -> bool:
+        """
+        Tells whether a single sequence is worth looking up before classifying it.
+
+        Without a sequence filter the lookup is skipped for matrices under
+        `lookup_min_cells` cells, since the upsert already returns the stored verdict of
+        known sequences.
+        """
+        if self.sequence_filter is None:
+            return 0 < self.lookup_min_cells <= len(dna_sequence)
+        return self.sequence_filter.might_contain(sequence_hash(dna_sequence))
+
+    def _record_false_positive(self) -> None:
+        """
+        Counts a lookup the sequence filter let through for a sequence that was not stored.
+        """
+        if self.sequence_filter is not None:
+            self.sequence_filter.record_false_positive()
+
+    def _lookup_candidates(self, sequences: List[str]) -> List[str]:
+        """
+        Returns the distinct canonical sequences of a batch that the sequence filter does
+        not rule out.
+        """
+        return [
+            dna_sequence
+            for dna_sequence in set(sequences)
+            if self.sequence_filter is None
+            or self.sequence_filter.might_contain(sequence_hash(dna_sequence))
+        ]
+
+    def _remember_sequences(self, sequences: List[str]) -> None:
+        """
+        Adds the canonical forms of freshly stored sequences to the sequence filter, if any.
+        """
+        if self.sequence_filter is not None:
+            for dna_sequence in sequences:
+                self.sequence_filter.add(sequence_hash(dna_sequence))
+
     def get_stats(self):
         """
         Retrieves statistics about the DNA records in the database.
 
         The statistics include the count of mutant and human DNA sequences,
         along with the ratio of mutants to total DNA sequences analyzed.
+        When a stats cache is configured, recently computed stats are served from it.
 
         :return: A dictionary containing counts of mutant and human DNA, and the mutant-to-total ratio.
         """
-        count_mutant_dna = self.dna_repository.count_mutants()
-        count_human_dna = self.dna_repository.count_humans()
+        if self.stats_cache is not None:
+            return self.stats_cache.get(self._compute_stats)
+        return self._compute_stats()
+
+    def _compute_stats(self):
+        """
+        Computes the statistics with a single query to the DNA repository.
+        """
+        return self._stats_from_counts(*self.dna_repository.get_counts())
+
+    @staticmethod
+    def _stats_from_counts(count_mutant_dna: int, count_human_dna: int) -> dict:
+        """
+        Builds the statistics returned by `get_stats` from the mutant and human counts.
+        """
         total = count_mutant_dna + count_human_dna
         ratio = count_mutant_dna / total if total > 0 else 0
 
@@ -100,3 +237,110 @@ class MutantService:
             "count_human_dna": count_human_dna,
             "ratio": ratio,
         }
+
+
+class AsyncMutantService(MutantService):
+    """
+    MutantService variant working on top of an `AsyncDNARepository`.
+
+    It follows the same flow as `MutantService`, but every database round trip is awaited,
+    so the event loop keeps serving other requests while queries are in flight."""
+
+    def __init__(
+        self,
+        dna_repository: AsyncDNARepository,
+        detector: MutantDetector = None,
+        stats_cache: StatsCache = None,
+        sequence_filter: SequenceBloomFilter = None,
+        lookup_min_cells: int = 0,
+    ):
+        """
+        Initializes the AsyncMutantService with an asynchronous DNA repository.
+
+        :param dna_repository: An instance of AsyncDNARepository for accessing DNA records.
+        :param detector: The detection engine used to classify DNA, the pure Python one by default.
+        :param stats_cache: Optional cache shared between requests to serve recent stats.
+        :param sequence_filter: Optional Bloom filter of the stored sequences.
+        :param lookup_min_cells: Without a sequence filter, the number of cells from which
+            a matrix is looked up before being classified, 0 to never look it up.
+        """
+        super().__init__(
+            dna_repository, detector, stats_cache, sequence_filter, lookup_min_cells
+        )
+
+    async def check_and_save_dna(self, dna: List[str]) -> bool:
+        """
+        Checks if the provided DNA sequence is mutant and saves it to the database if it's new.
+
+        See `MutantService.check_and_save_dna`.
+
+        :param dna: A list of strings, each representing a row in the DNA matrix.
+        :return: True if the DNA sequence is mutant, False otherwise.
+        """
+        dna_sequence = "".join(dna)
+        known_verdict = await self.dna_repository.get_known_verdict(
+            dna_sequence, count_miss=False
+        )
+        if known_verdict is not None:
+            return known_verdict
+        # Retried even when the sequence is its own canonical form, to count its miss.
+        canonical = canonical_sequence(dna_sequence)
+        known_verdict = await self.dna_repository.get_known_verdict(canonical)
+        if known_verdict is not None:
+            return known_verdict
+
+        if self._may_be_stored(canonical):
+            existing_dna = await self.dna_repository.get_dna_by_sequence(canonical)
+            if existing_dna:
+                return existing_dna.is_mutant
+            self._record_false_positive()
+
+        is_mutant_flag = await self.dna_repository.upsert_and_get(
+            dna_sequence, await self.detector.is_mutant_async(dna), canonical
+        )
+        self._remember_sequences([canonical])
+        return is_mutant_flag
+
+    async def check_and_save_dna_batch(self, dna_list: List[List[str]]) -> List[bool]:
+        """
+        Checks several DNA sequences at once and saves the new ones to the database.
+
+        See `MutantService.check_and_save_dna_batch`.
+
+        :param dna_list: A list of DNA matrices, each one a list of row strings.
+        :return: The mutant flag of every DNA matrix, in the same order as received.
+        """
+        sequences, canonicals = self._canonical_forms(dna_list)
+        candidates = self._lookup_candidates(canonicals)
+        verdicts = (
+            await self.dna_repository.get_verdicts_by_sequences(candidates)
+            if candidates
+            else {}
+        )
+
+        new_records = [
+            (dna_sequence, await self.detector.is_mutant_async(dna), canonical)
+            for dna, dna_sequence, canonical in self._pending(
+                dna_list, sequences, canonicals, verdicts
+            )
+        ]
+        await self.dna_repository.create_dna_records(new_records)
+        return self._batch_verdicts(canonicals, verdicts, new_records)
+
+    async def get_stats(self):
+        """
+        Retrieves statistics about the DNA records in the database.
+
+        See `MutantService.get_stats`.
+
+        :return: A dictionary containing counts of mutant and human DNA, and the mutant-to-total ratio.
+        """
+        if self.stats_cache is not None:
+            return await self.stats_cache.get_async(self._compute_stats)
+        return await self._compute_stats()
+
+    async def _compute_stats(self):
+        """
+        Computes the statistics with a single query to the DNA repository.
+        """
+        return self._stats_from_counts(*await self.dna_repository.get_counts())
@@ -0,0 +1,75 @@
+"""
+Stats cache
+"""
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class StatsCache:
+    """
+    In-process cache holding the last computed stats for a short time.
+
+    Dashboards poll `/stats/` very often from many clients, so the stats are computed at
+    most once per `ttl` seconds and per process. When the entry expires, only one caller
+    computes the new value while the others wait for it. A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initializes an empty cache.
+
+        :param ttl: Number of seconds a computed value is served before it is refreshed.
+        """
+        self.ttl = ttl
+        self._value: Optional[dict] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    def get(self, compute: Callable[[], dict]) -> dict:
+        """
+        Returns the cached stats, computing them first if the entry is missing or expired.
+
+        :param compute: Callable returning fresh stats.
+        :return: The cached or freshly computed stats.
+        """
+        if self.ttl <= 0:
+            return compute()
+        if time.monotonic() < self._expires_at:
+            return self._value
+        with self._lock:
+            # Another caller may have refreshed the entry while this one was waiting.
+            if time.monotonic() >= self._expires_at:
+                self._value = compute()
+                self._expires_at = time.monotonic() + self.ttl
+            return self._value
+
+    async def get_async(self, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Same as `get`, for callers running on the event loop with an asynchronous `compute`.
+
+        :param compute: Coroutine function returning fresh stats.
+        :return: The cached or freshly computed stats.
+        """
+        if self.ttl <= 0:
+            return await compute()
+        if time.monotonic() < self._expires_at:
+            return self._value
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if time.monotonic() >= self._expires_at:
+                self._value = await compute()
+                self._expires_at = time.monotonic() + self.ttl
+            return self._value
+
+    def clear(self) -> None:
+        """
+        Drops the cached stats, so the next call computes them again.
+        """
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from adapters.database.repository.async_dna_repository import (
+    AsyncSQLAlchemyDNARepository,
+)
+from conftest import TEST_DATABASE_URL
+from core.mutant.services import AsyncMutantService
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+ASYNC_TEST_DATABASE_URL = make_url(TEST_DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
+)
+
+
+class SlowDNARepository(AsyncSQLAlchemyDNARepository):
+    """
+    Repository whose stats query waits on the database first, like a slow query would.
+    """
+
+    async def get_counts(self):
+        await self.db.execute(text("SELECT pg_sleep(0.2)"))
+        return await super().get_counts()
+
+
+class TestAsyncMutantService:
+    """
+    Class to test the asynchronous persistence path.
+    """
+
+    def test_concurrent_requests_overlap(self) -> None:
+        """
+        Five stats requests waiting 0.2 seconds each on the database finish together,
+        instead of one after another.
+        """
+
+        async def get_stats(engine):
+            async with AsyncSession(engine) as db:
+                return await AsyncMutantService(SlowDNARepository(db)).get_stats()
+
+        async def run():
+            engine = create_async_engine(ASYNC_TEST_DATABASE_URL)
+            try:
+                start = time.perf_counter()
+                results = await asyncio.gather(*(get_stats(engine) for _ in range(5)))
+                return results, time.perf_counter() - start
+            finally:
+                await engine.dispose()
+
+        results, elapsed = asyncio.run(run())
+
+        assert all(stats["count_mutant_dna"] == 0 for stats in results)
+        assert elapsed < 0.5
+
+    def test_check_and_save_dna(self) -> None:
+        """
+        A new DNA sequence is stored and a repeated one returns its stored verdict.
+        """
+
+        async def run():
+            engine = create_async_engine(ASYNC_TEST_DATABASE_URL)
+            try:
+                async with engine.connect() as connection:
+                    transaction = await connection.begin()
+                    db = AsyncSession(
+                        bind=connection, join_transaction_mode="create_savepoint"
+                    )
+                    service = AsyncMutantService(AsyncSQLAlchemyDNARepository(db))
+                    first = await service.check_and_save_dna(["ATGC"] * 4)
+                    second = await service.check_and_save_dna(["ATGC"] * 4)
+                    batch = await service.check_and_save_dna_batch(
+                        [["ATGC"] * 4, ["ACGT", "CGTA", "GTAC", "TACG"]]
+                    )
+                    stats = await service.get_stats()
+                    await db.close()
+                    await transaction.rollback()
+                    return first, second, batch, stats
+            finally:
+                await engine.dispose()
+
+        first, second, batch, stats = asyncio.run(run())
+
+        assert first is True and second is True
+        assert batch == [True, False]
+        assert stats["count_mutant_dna"] == 1
+        assert stats["count_human_dna"] == 1
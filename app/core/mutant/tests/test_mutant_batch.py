@@ -0,0 +1,104 @@
+import dependencies.dna_service
+import pytest
+from adapters.database.models import DNA
+from conftest import app
+from core.mutant.bloom_filter import SequenceBloomFilter
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy.orm import Session
+
+
+class TestMutantBatchDetection:
+    """
+    Class to test the batch detection endpoint (/mutant/batch/).
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Fixture that initializes the test environment.
+
+        Args:
+            db_session (Session): The database session for testing.
+        """
+        self.client = TestClient(app)
+        self.db_session = db_session
+        self.url = "/api/v1/mutant/batch/"
+
+    def test_batch_verdicts_in_order(self) -> None:
+        """
+        Every DNA sequence gets its verdict, in the order it was sent.
+        """
+        dnas = [
+            ["AAAA", "CAGT", "TTTT", "AGAG"],
+            ["ACGCGA", "CTGTGC", "TTATGT", "AGAAGG", "CCTATA", "TCACTG"],
+            ["ATGC", "ATGC", "ATGC", "ATGC"],
+        ]
+        response: Response = self.client.post(
+            self.url, json={"dnas": [{"dna": dna} for dna in dnas]}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [{"is_mutant": True}, {"is_mutant": False}, {"is_mutant": True}]
+        }
+        assert self.db_session.query(DNA).count() == 3
+
+    def test_batch_known_and_repeated_sequences(self) -> None:
+        """
+        Known sequences keep their stored verdict and repeated ones are stored once.
+        """
+        self.db_session.add(DNA(sequence="AAAACAGTTTTTAGAG", is_mutant=False))
+        self.db_session.commit()
+
+        dna = ["AAAA", "CAGT", "TTTT", "AGAG"]
+        other = ["ATGC", "ATGC", "ATGC", "ATGC"]
+        response: Response = self.client.post(
+            self.url, json={"dnas": [{"dna": dna}, {"dna": other}, {"dna": other}]}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [{"is_mutant": False}, {"is_mutant": True}, {"is_mutant": True}]
+        }
+        assert self.db_session.query(DNA).count() == 2
+
+    def test_batch_skips_stored_rotation(self, monkeypatch) -> None:
+        """
+        A rotation the sequence filter rules out is not stored next to the stored matrix.
+        """
+        monkeypatch.setattr(
+            dependencies.dna_service,
+            "sequence_filter",
+            SequenceBloomFilter(capacity=100, error_rate=0.01),
+        )
+        self.db_session.add(DNA(sequence="AAAACAGTTTTTAGAG", is_mutant=True))
+        self.db_session.commit()
+
+        rotation = ["ATCA", "GTAA", "ATGA", "GTTA"]
+        response: Response = self.client.post(
+            self.url, json={"dnas": [{"dna": rotation}]}
+        )
+
+        assert response.status_code == 200
+        assert self.db_session.query(DNA).count() == 1
+
+    def test_batch_invalid_dna(self) -> None:
+        """
+        An invalid DNA sequence rejects the whole batch.
+        """
+        response: Response = self.client.post(
+            self.url,
+            json={"dnas": [{"dna": ["AAAA", "CAGT"]}, {"dna": ["ACGC", "CTGTGC"]}]},
+        )
+
+        assert response.status_code == 422
+        assert self.db_session.query(DNA).count() == 0
+
+    def test_batch_empty(self) -> None:
+        """
+        An empty batch is rejected.
+        """
+        response: Response = self.client.post(self.url, json={"dnas": []})
+
+        assert response.status_code == 422
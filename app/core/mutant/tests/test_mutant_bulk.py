@@ -0,0 +1,121 @@
+import json
+
+import pytest
+from adapters.database.models import DNA
+from adapters.database.repository.dna_repository import (
+    SQLAlchemyDNARepository,
+    copy_rows,
+)
+from commands.bulk_classify import bulk_classify, chunk_bounds, parse_chunk
+from core.mutant.canonical import canonical_sequence
+from sqlalchemy.orm.session import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+HUMAN_DNA = ["ATGCGA", "CAGTGC", "TTATTT", "AGACGG", "GCGTCA", "TCACTG"]
+# MUTANT_DNA mirrored left to right.
+MIRRORED_DNA = [row[::-1] for row in MUTANT_DNA]
+
+
+class TestBulkParsing:
+    """
+    Class to test how the bulk classify command splits and parses its input.
+    """
+
+    def test_chunks_end_between_matrices(self) -> None:
+        """
+        Chunks cover the whole file and never split a matrix.
+        """
+        data = b"AAAA\nCCCC\nGGGG\nTTTT\n\n \nATCG\nATCG\nATCG\nATCG\n\nACGT\nAC\n"
+        bounds = list(chunk_bounds(data, "blocks", 5))
+
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(data)
+        matrices = [
+            dna
+            for start, end in bounds
+            for dna in parse_chunk(data[start:end], "blocks")
+        ]
+        assert matrices == [["AAAA", "CCCC", "GGGG", "TTTT"], ["ATCG"] * 4, None]
+
+    def test_invalid_ndjson_lines(self) -> None:
+        """
+        Lines that are not a valid DNA request are reported as None, blank ones skipped.
+        """
+        chunk = (json.dumps({"dna": MUTANT_DNA}) + "\n\nnot json\n").encode()
+
+        assert list(parse_chunk(chunk, "ndjson")) == [MUTANT_DNA, None]
+
+
+class TestBulkClassify:
+    """
+    Class to test the COPY based load of the bulk classify command.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Fixture that initializes the test environment.
+        """
+        self.db_session = db_session
+        self.repository = SQLAlchemyDNARepository(db_session)
+
+    def test_copy_skips_known_matrices(self) -> None:
+        """
+        Copied records are merged once per canonical form, keeping the first submission.
+        """
+        self.repository.upsert_and_get("".join(HUMAN_DNA), False)
+        records = [
+            ("".join(MIRRORED_DNA), True),
+            ("".join(MUTANT_DNA), True),
+            ("".join(HUMAN_DNA), False),
+        ]
+
+        inserted = self.repository.copy_dna_records([copy_rows(records)], merge_rows=1)
+
+        assert inserted == 1
+        assert self.db_session.query(DNA).count() == 2
+        assert (
+            self.repository.get_dna_by_sequence(canonical_sequence("".join(MUTANT_DNA)))
+            is not None
+        )
+        assert {dna.sequence for dna in self.db_session.query(DNA)} == {
+            "".join(MIRRORED_DNA),
+            "".join(HUMAN_DNA),
+        }
+
+    def test_classify_ndjson_file(self, tmp_path) -> None:
+        """
+        Every valid line of an NDJSON file is classified and new matrices are stored.
+        """
+        path = tmp_path / "dna.ndjson"
+        lines = [json.dumps({"dna": dna}) for dna in [MUTANT_DNA, HUMAN_DNA]]
+        path.write_text("\n".join(lines + ["not json", lines[0], ""]))
+
+        result = bulk_classify(str(path), self.repository, workers=1, chunk_bytes=64)
+
+        assert (result["valid"], result["invalid"], result["inserted"]) == (3, 1, 2)
+        verdicts = {dna.sequence: dna.is_mutant for dna in self.db_session.query(DNA)}
+        assert verdicts == {"".join(MUTANT_DNA): True, "".join(HUMAN_DNA): False}
+
+    def test_classify_block_file(self, tmp_path) -> None:
+        """
+        Matrices separated by blank lines are read, and variants stored once.
+        """
+        path = tmp_path / "dna.txt"
+        path.write_text(
+            "\n\n".join("\n".join(dna) for dna in [MUTANT_DNA, MIRRORED_DNA])
+        )
+
+        result = bulk_classify(str(path), self.repository, workers=1)
+
+        assert (result["valid"], result["invalid"], result["inserted"]) == (2, 0, 1)
+        stored = self.db_session.query(DNA).one()
+        assert stored.sequence == "".join(MUTANT_DNA) and stored.is_mutant is True
+
+    def test_empty_file(self, tmp_path) -> None:
+        """
+        An empty file loads nothing.
+        """
+        path = tmp_path / "empty.ndjson"
+        path.write_text("")
+
+        assert bulk_classify(str(path), self.repository)["inserted"] == 0
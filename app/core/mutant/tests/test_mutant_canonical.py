@@ -0,0 +1,174 @@
+from typing import List
+
+import pytest
+from adapters.database.models import DNA
+from adapters.database.repository.cached_dna_repository import CachedDNARepository
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from core.mutant.canonical import canonical_sequence
+from core.mutant.detectors.python_detector import PythonMutantDetector
+from core.mutant.services import MutantService
+from core.mutant.verdict_cache import VerdictCache
+from sqlalchemy.orm.session import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+
+
+def rotate(dna: List[str]) -> List[str]:
+    """
+    Rotates a square DNA matrix a quarter turn clockwise.
+    """
+    return ["".join(column) for column in zip(*reversed(dna))]
+
+
+def reflect(dna: List[str]) -> List[str]:
+    """
+    Mirrors a DNA matrix left to right.
+    """
+    return [row[::-1] for row in dna]
+
+
+class CountingDetector(PythonMutantDetector):
+    """
+    Detector counting the matrices it classifies.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_mutant(self, dna: List[str]) -> bool:
+        self.calls += 1
+        return super().is_mutant(dna)
+
+
+class TestCanonicalForm:
+    """
+    Class to test the canonical form shared by the rotations and reflections of a matrix.
+    """
+
+    def test_variants_share_canonical_form(self) -> None:
+        """
+        The eight rotations and reflections of a matrix have the same canonical form.
+        """
+        variants = [MUTANT_DNA, reflect(MUTANT_DNA)]
+        for _ in range(3):
+            variants += [rotate(variants[-2]), rotate(variants[-1])]
+
+        assert len({"".join(dna) for dna in variants}) == 8
+        canonicals = {canonical_sequence("".join(dna)) for dna in variants}
+        assert canonicals == {min("".join(dna) for dna in variants)}
+
+    def test_non_square_sequence_is_its_own_form(self) -> None:
+        """
+        Sequences that cannot be read as a square matrix are left unchanged.
+        """
+        assert canonical_sequence("TTTTGA") == "TTTTGA"
+        assert canonical_sequence("G") == "G"
+
+
+class TestCanonicalDedup:
+    """
+    Class to test that variants of a stored matrix reuse its verdict and record.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Builds a service with a counting detector on the test session.
+        """
+        self.db_session = db_session
+        self.detector = CountingDetector()
+        self.service = MutantService(SQLAlchemyDNARepository(db_session), self.detector)
+
+    def test_variant_is_not_stored_again(self) -> None:
+        """
+        A rotation of a stored matrix gets its verdict and is not stored as a new record.
+        """
+        assert self.service.check_and_save_dna(MUTANT_DNA) is True
+        assert self.service.check_and_save_dna(rotate(reflect(MUTANT_DNA))) is True
+
+        assert self.db_session.query(DNA).count() == 1
+        stored = self.db_session.query(DNA).one()
+        assert stored.sequence == "".join(MUTANT_DNA)
+
+    def test_stored_variant_skips_detection(self) -> None:
+        """
+        A variant of a large enough matrix stored by another worker is looked up before
+        being classified.
+        """
+        self.db_session.add(DNA(sequence="".join(MUTANT_DNA), is_mutant=True))
+        self.db_session.commit()
+        service = MutantService(
+            SQLAlchemyDNARepository(self.db_session),
+            self.detector,
+            lookup_min_cells=len(MUTANT_DNA) ** 2,
+        )
+
+        assert service.check_and_save_dna(rotate(MUTANT_DNA)) is True
+        assert self.detector.calls == 0
+        assert self.db_session.query(DNA).count() == 1
+
+    def test_cached_variant_skips_detection(self) -> None:
+        """
+        Once a matrix is cached, its variants are answered without running detection.
+        """
+        repository = CachedDNARepository(
+            SQLAlchemyDNARepository(self.db_session), VerdictCache(max_size=10)
+        )
+        service = MutantService(repository, self.detector)
+        service.check_and_save_dna(MUTANT_DNA)
+
+        assert service.check_and_save_dna(rotate(MUTANT_DNA)) is True
+        assert service.check_and_save_dna(reflect(MUTANT_DNA)) is True
+        assert self.detector.calls == 1
+
+    def test_cache_is_keyed_by_sequence_first(self) -> None:
+        """
+        Stored verdicts are cached under the sequence itself as well as its canonical form.
+        """
+        cache = VerdictCache(max_size=10)
+        repository = CachedDNARepository(
+            SQLAlchemyDNARepository(self.db_session), cache
+        )
+        MutantService(repository, self.detector).check_and_save_dna(MUTANT_DNA)
+
+        assert cache.get("".join(MUTANT_DNA)) is True
+        assert cache.get(canonical_sequence("".join(MUTANT_DNA))) is True
+
+    def test_batch_classifies_variants_once(self) -> None:
+        """
+        Variants inside a batch, and of stored matrices, are classified and stored once.
+        """
+        variant = rotate(MUTANT_DNA)
+        assert self.service.check_and_save_dna_batch([MUTANT_DNA, variant]) == [
+            True,
+            True,
+        ]
+        assert self.detector.calls == 1
+        assert self.service.check_and_save_dna_batch([reflect(variant)]) == [True]
+        assert self.detector.calls == 1
+        assert self.db_session.query(DNA).count() == 1
+
+    def test_cache_counts_one_lookup_per_check(self) -> None:
+        """
+        A check counts a single hit or miss, whether or not the sequence is its own
+        canonical form.
+        """
+        cache = VerdictCache(max_size=10)
+        repository = CachedDNARepository(
+            SQLAlchemyDNARepository(self.db_session), cache
+        )
+        service = MutantService(repository, self.detector)
+        canonical = canonical_sequence("".join(MUTANT_DNA))
+        side = len(MUTANT_DNA)
+        canonical_dna = [
+            canonical[i : i + side] for i in range(0, len(canonical), side)
+        ]
+
+        service.check_and_save_dna(MUTANT_DNA)
+        service.check_and_save_dna(MUTANT_DNA)
+        service.check_and_save_dna(rotate(MUTANT_DNA))
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        cache.clear()
+        service.check_and_save_dna(canonical_dna)
+        assert (cache.hits, cache.misses) == (0, 1)
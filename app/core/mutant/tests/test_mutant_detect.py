@@ -1,8 +1,20 @@
 # core/mutant/tests/test_mutant_endpoint.py
 
+import asyncio
+import random
+
 import pytest
 from adapters.database.models import DNA
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from adapters.database.sequence_codec import sequence_hash
 from conftest import app
+from core.exceptions.custom_exceptions import CustomAPIException
+from core.mutant.bloom_filter import SequenceBloomFilter
+from core.mutant.canonical import canonical_sequence
+from core.mutant.detectors import DETECTION_ENGINES, get_detector
+from core.mutant.detectors.offloading_detector import OffloadingMutantDetector
+from core.mutant.detectors.python_detector import PythonMutantDetector
+from core.mutant.services import MutantService
 from fastapi.testclient import TestClient
 from httpx import Response
 from sqlalchemy.orm.session import Session
@@ -83,6 +95,45 @@ class TestMutantDetection:
         assert response.status_code == 403
         assert response.json() == {"detail": "Not a mutant"}
 
+    def test_detect_known_dna_returns_stored_verdict(self) -> None:
+        """
+        A sequence that is already stored answers with its stored verdict.
+        """
+        self.db_session.add(DNA(sequence="AAAACAGTTTTTAGAG", is_mutant=False))
+        self.db_session.commit()
+
+        response: Response = self.client.post(
+            self.url, json={"dna": ["AAAA", "CAGT", "TTTT", "AGAG"]}
+        )
+        assert response.status_code == 403
+        assert self.db_session.query(DNA).count() == 1
+
+    def test_detect_repeated_dna_stored_once(self) -> None:
+        """
+        Submitting the same sequence twice stores it only once.
+        """
+        dna_sequence = ["ATGC", "ATGC", "ATGC", "ATGC"]
+        for _ in range(2):
+            response: Response = self.client.post(self.url, json={"dna": dna_sequence})
+            assert response.status_code == 200
+        assert self.db_session.query(DNA).count() == 1
+
+    def test_detect_cached_dna_skips_database(self) -> None:
+        """
+        A sequence whose verdict is cached is answered without reading or writing the database.
+        """
+        dna_sequence = ["ATGC", "ATGC", "ATGC", "ATGC"]
+        self.client.post(self.url, json={"dna": dna_sequence})
+        self.db_session.query(DNA).delete()
+        self.db_session.commit()
+
+        response: Response = self.client.post(self.url, json={"dna": dna_sequence})
+        cache_metrics = self.client.get("/api/v1/diagnostics/cache/").json()
+
+        assert response.status_code == 200
+        assert self.db_session.query(DNA).count() == 0
+        assert cache_metrics["hits"] == 1
+
     def test_invalid_dna_format(self) -> None:
         """
         Prueba de error por formato de ADN no válido.
@@ -99,3 +150,210 @@ class TestMutantDetection:
             == "Value error, Each DNA string must have the same length"
         )
         assert response_data["detail"][0]["type"] == "value_error"
+
+
+class TestSequenceFilter:
+    """
+    Checks that the Bloom filter only lets lookups through for sequences that may be stored.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Stores one sequence and builds a service whose filter is loaded from the database.
+        """
+        self.db_session = db_session
+        self.db_session.add(DNA(sequence="AAAACAGTTTTTAGAG", is_mutant=False))
+        self.db_session.commit()
+
+        repository = SQLAlchemyDNARepository(db_session)
+        self.sequence_filter = SequenceBloomFilter(capacity=100, error_rate=0.01)
+        self.sequence_filter.load(repository.iter_canonical_hashes())
+        self.service = MutantService(repository, sequence_filter=self.sequence_filter)
+
+    def test_new_dna_skips_lookup(self) -> None:
+        """
+        A sequence that was never stored is classified and stored without a lookup.
+        """
+        assert self.service.check_and_save_dna(["ATGC", "ATGC", "ATGC", "ATGC"])
+        assert self.sequence_filter.skipped_lookups == 1
+        assert self.sequence_filter.might_contain(
+            sequence_hash(canonical_sequence("ATGCATGCATGCATGC"))
+        )
+        assert self.db_session.query(DNA).count() == 2
+
+    def test_stored_dna_is_looked_up(self) -> None:
+        """
+        A stored sequence is read back with its stored verdict.
+        """
+        assert not self.service.check_and_save_dna(["AAAA", "CAGT", "TTTT", "AGAG"])
+        assert self.sequence_filter.skipped_lookups == 0
+        assert self.db_session.query(DNA).count() == 1
+
+
+class TestDetectionEngines:
+    """
+    Checks that every detection engine agrees with the pure Python reference.
+    """
+
+    CASES = [
+        ["AAAA", "CAGT", "TTTT", "AGAG"],
+        ["ATGC", "ATGC", "ATGC", "ATGC"],
+        ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"],
+        ["ACGCGA", "CTGTGC", "TTATGT", "AGAAGG", "CCTATA", "TCACTG"],
+        # A single row holding two runs only counts once.
+        [
+            "AAAAAAAAA",
+            "CGTCGTCGT",
+            "TCGTCGTCG",
+            "GTCGTCGTC",
+            "CGTCGTCGT",
+            "TCGTCGTCG",
+            "GTCGTCGTC",
+            "CGTCGTCGT",
+            "TCGTCGTCG",
+        ],
+        # A diagonal run of five holds two windows of four.
+        ["ACGTG", "TAGCT", "GTACG", "CGTAC", "TCGTA"],
+        ["ACG", "TAC", "GTA"],
+    ]
+
+    @staticmethod
+    def random_matrices(count: int = 200, seed: int = 1234):
+        """
+        Builds seeded random square matrices of several sizes.
+        """
+        rng = random.Random(seed)
+        for _ in range(count):
+            size = rng.choice([4, 5, 6, 8, 12, 20, 40])
+            bases = rng.choice(["ATCG", "ATCG", "AT", "ATC"])
+            yield ["".join(rng.choice(bases) for _ in range(size)) for _ in range(size)]
+
+    @staticmethod
+    def large_matrices(count: int = 20, seed: int = 4321):
+        """
+        Builds large matrices made of shifted "ATCG" rows and plants a few runs of four.
+
+        Rows never repeat the same shift twice in a row, except for a shift of two, so
+        the matrices hold no runs other than the planted ones.
+        """
+        rng = random.Random(seed)
+        steps = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        for _ in range(count):
+            size = rng.choice([64, 100, 150])
+            rows, offset, last_shift = [], rng.randrange(4), None
+            for _ in range(size):
+                rows.append(list(("ATCG" * (size // 4 + 2))[offset : offset + size]))
+                shift = rng.choice([s for s in range(4) if s == 2 or s != last_shift])
+                offset, last_shift = (offset + shift) % 4, shift
+            for _ in range(rng.randrange(4)):
+                row_step, col_step = rng.choice(steps)
+                row, col = rng.randrange(size - 3), rng.randrange(3, size - 3)
+                base = rng.choice("ATCG")
+                for k in range(4):
+                    rows[row + k * row_step][col + k * col_step] = base
+            yield ["".join(row) for row in rows]
+
+    @pytest.mark.parametrize("engine", sorted(DETECTION_ENGINES))
+    def test_engine_matches_reference_on_large_matrices(self, engine: str) -> None:
+        """
+        The engine must give the reference verdict on large, mostly human matrices.
+        """
+        reference = PythonMutantDetector()
+        detector = get_detector(engine)
+        for dna in self.large_matrices():
+            assert detector.is_mutant(dna) == reference.is_mutant(dna)
+
+    @pytest.mark.parametrize("engine", sorted(DETECTION_ENGINES))
+    def test_engine_matches_reference(self, engine: str) -> None:
+        """
+        The engine must give the reference verdict on fixed and random matrices.
+        """
+        reference = PythonMutantDetector()
+        detector = get_detector(engine)
+        for dna in [*self.CASES, *self.random_matrices()]:
+            assert detector.is_mutant(dna) == reference.is_mutant(dna), dna
+
+    def test_unknown_engine(self) -> None:
+        """
+        Asking for an engine that is not registered fails early.
+        """
+        with pytest.raises(ValueError):
+            get_detector("unknown")
+
+    def test_streaming_engine_leaves_input_as_given(self) -> None:
+        """
+        Like the other engines, the streaming one neither validates nor normalizes rows,
+        which is left to `check_dna`.
+        """
+        rows = ["ACGT", "ACGT", "", "ACGT", "ACGT"]
+
+        assert get_detector("streaming").is_mutant(["AAAAT", "CC", "GGGGT"]) is True
+        assert get_detector("streaming").is_mutant(rows) is False
+
+    def test_stream_stops_at_second_sequence(self) -> None:
+        """
+        Rows after the one holding the second sequence are never read.
+        """
+
+        def rows():
+            yield from ["AAAAC", "CCCCA", "GTACG"]
+            raise AssertionError("The stream was read past the verdict")
+
+        assert get_detector("streaming").is_mutant(rows()) is True
+
+
+@pytest.fixture(scope="module")
+def offloading_detector():
+    """
+    Offloading detector with a running pool, sending matrices of 100 cells or more.
+    """
+    detector = OffloadingMutantDetector(
+        PythonMutantDetector(), min_cells=100, max_workers=1, max_pending=1
+    )
+    detector.start()
+    yield detector
+    detector.shutdown()
+
+
+class TestOffloadingDetector:
+    """
+    Checks the dispatch of large matrices to the worker pool.
+    """
+
+    SMALL_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+
+    def test_large_matrices_match_reference(self, offloading_detector) -> None:
+        """
+        Matrices classified in the pool get the same verdict as inline, with or without await.
+        """
+        reference = PythonMutantDetector()
+        for dna in TestDetectionEngines.large_matrices(count=5):
+            verdict = reference.is_mutant(dna)
+            assert offloading_detector.is_mutant(dna) == verdict
+            assert asyncio.run(offloading_detector.is_mutant_async(dna)) == verdict
+
+    def test_small_matrices_run_inline(self) -> None:
+        """
+        Matrices below the threshold never need the pool, even when it is full.
+        """
+        detector = OffloadingMutantDetector(
+            PythonMutantDetector(), min_cells=100, max_pending=0
+        )
+        detector.start()
+        try:
+            assert detector.is_mutant(self.SMALL_DNA) is True
+            with pytest.raises(CustomAPIException) as exc_info:
+                detector.is_mutant(self.SMALL_DNA * 20)
+            assert exc_info.value.status_code == 503
+        finally:
+            detector.shutdown()
+
+    def test_not_started_runs_inline(self) -> None:
+        """
+        Without a pool, large matrices are classified inline.
+        """
+        detector = OffloadingMutantDetector(
+            PythonMutantDetector(), min_cells=1, max_pending=0
+        )
+        assert detector.is_mutant(self.SMALL_DNA) is True
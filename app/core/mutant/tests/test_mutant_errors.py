@@ -0,0 +1,100 @@
+from typing import Iterator
+
+import pytest
+from core.exceptions.custom_exceptions import (
+    CustomAPIException,
+    IntegrityError,
+    ValidationError,
+)
+from core.middleware.error_middleware import ErrorHandlingMiddleware
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+ERRORS = {
+    "validation": ValidationError("Invalid DNA"),
+    "integrity": IntegrityError("Duplicated DNA"),
+    "custom": CustomAPIException("Unavailable", 503),
+    "unexpected": RuntimeError("Boom"),
+    "http": HTTPException(status_code=404, detail="Not here"),
+}
+
+
+def build_app() -> FastAPI:
+    """
+    Builds an app whose routes raise the errors to handle.
+    """
+    app = FastAPI()
+
+    @app.get("/raise/{name}")
+    async def raise_error(name: str) -> None:
+        raise ERRORS[name]
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        def lines() -> Iterator[bytes]:
+            yield b"first\n"
+            raise RuntimeError("Broken stream")
+
+        return StreamingResponse(lines())
+
+    app.add_middleware(ErrorHandlingMiddleware)
+    return app
+
+
+class TestErrorHandlingMiddleware:
+    """
+    Class to test the mapping of errors to responses (ErrorHandlingMiddleware).
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self) -> None:
+        """
+        Fixture that initializes the test environment.
+        """
+        self.client = TestClient(build_app())
+
+    @pytest.mark.parametrize(
+        "name, status_code, body",
+        [
+            (
+                "validation",
+                400,
+                {"message": "Validation error", "code": "ValidationError"},
+            ),
+            ("integrity", 400, {"message": "Integrity error", "code": "INT001"}),
+            ("custom", 503, {"message": "Conctact admin site", "code": "503"}),
+            (
+                "unexpected",
+                400,
+                {
+                    "message": "An unexpected error occurred",
+                    "details": "Contact admin site",
+                },
+            ),
+        ],
+    )
+    def test_errors_are_mapped(self, name: str, status_code: int, body: dict) -> None:
+        """
+        Each kind of error gets its status code and JSON body.
+        """
+        response = self.client.get(f"/raise/{name}")
+
+        assert response.status_code == status_code
+        assert response.json() == body
+
+    def test_http_exceptions_keep_their_handler(self) -> None:
+        """
+        HTTP exceptions are answered by the FastAPI handler before reaching the middleware.
+        """
+        response = self.client.get("/raise/http")
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Not here"}
+
+    def test_errors_after_the_response_started_are_raised(self) -> None:
+        """
+        A streamed response that fails midway cannot change its status, so the error goes on.
+        """
+        with pytest.raises(RuntimeError, match="Broken stream"):
+            self.client.get("/stream")
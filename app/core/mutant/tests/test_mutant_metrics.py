@@ -0,0 +1,138 @@
+import re
+
+import pytest
+from conftest import app
+from core.metrics.registry import Counter, Histogram, MetricsRegistry, _Metric
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+
+
+def sample(text: str, line_prefix: str) -> float:
+    """
+    Reads the value of the sample whose line starts with the given name and labels.
+    """
+    match = re.search(rf"^{re.escape(line_prefix)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+class TestMetricsRegistry:
+    """
+    Class to test the rendering of metrics in the Prometheus text format.
+    """
+
+    def test_counter(self) -> None:
+        """
+        Counters render one sample per label values, with escaped values.
+        """
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("calls_total", "Calls.", ("name",)))
+        counter.labels('a"b').inc()
+        counter.labels('a"b').inc(2)
+
+        assert registry.render().splitlines() == [
+            "# HELP calls_total Calls.",
+            "# TYPE calls_total counter",
+            'calls_total{name="a\\"b"} 3.0',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """
+        Histogram buckets count the values up to their bound, plus a +Inf one, sum and count.
+        """
+        registry = MetricsRegistry()
+        histogram = registry.register(Histogram("took", "Took.", buckets=(0.1, 1.0)))
+        for value in [0.05, 0.1, 0.5, 3.0]:
+            histogram.labels().observe(value)
+
+        assert registry.render().splitlines()[2:] == [
+            'took_bucket{le="0.1"} 2',
+            'took_bucket{le="1.0"} 3',
+            'took_bucket{le="+Inf"} 4',
+            "took_sum 3.65",
+            "took_count 4",
+        ]
+
+    def test_duplicate_and_wrong_labels(self) -> None:
+        """
+        Names are registered once, and children need one value per label.
+        """
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("calls_total", "Calls.", ("name",)))
+
+        with pytest.raises(ValueError):
+            registry.register(Counter("calls_total", "Calls."))
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+
+    def test_incomplete_family_fails_when_created(self) -> None:
+        """
+        A metric family missing one of the methods of `_Metric` cannot be created.
+        """
+
+        class Gauge(_Metric):
+            kind = "gauge"
+
+            def _new_child(self):
+                return None
+
+        with pytest.raises(TypeError):
+            Gauge("level", "Level.")
+
+
+class TestMetricsEndpoint:
+    """
+    Class to test the metrics recorded while serving requests (/metrics).
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Fixture that initializes the test environment.
+        """
+        self.client = TestClient(app)
+
+    def test_stages_and_requests_are_recorded(self) -> None:
+        """
+        A new DNA is timed through validation, its cache lookups by sequence and canonical
+        form, detection and storage, and its request is labelled with the route template.
+        """
+        before = self.client.get("/metrics").text
+        self.client.post("/api/v1/mutant/", json={"dna": MUTANT_DNA})
+        self.client.post("/api/v1/mutant/", json={"dna": ["AT", "GC", "AT"]})
+        response = self.client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        after = response.text
+        stages = {
+            "validation": 2,
+            "is_mutant": 1,
+            "get_known_verdict": 2,
+            "get_dna_by_sequence": 0,
+            "upsert_and_get": 1,
+        }
+        for stage, calls in stages.items():
+            prefix = f'mutant_stage_duration_seconds_count{{stage="{stage}"}}'
+            assert sample(after, prefix) == sample(before, prefix) + calls
+        prefix = 'mutant_stage_errors_total{stage="validation"}'
+        assert sample(after, prefix) == sample(before, prefix) + 1
+        prefix = 'mutant_detections_total{verdict="mutant"}'
+        assert sample(after, prefix) == sample(before, prefix) + 1
+        for status in ["200", "422"]:
+            prefix = (
+                "http_request_duration_seconds_count"
+                f'{{method="POST",route="/api/v1/mutant/",status="{status}"}}'
+            )
+            assert sample(after, prefix) == sample(before, prefix) + 1
+
+    def test_unmatched_paths_share_a_label(self) -> None:
+        """
+        Paths no route serves do not add label values of their own.
+        """
+        self.client.get("/no/such/path/42")
+
+        text = self.client.get("/metrics").text
+        assert 'route="unmatched",status="404"' in text
+        assert "/no/such/path" not in text
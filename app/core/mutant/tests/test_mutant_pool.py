@@ -0,0 +1,47 @@
+import pytest
+from adapters.database.pool import InstrumentedQueuePool, pool_metrics
+from conftest import TEST_DATABASE_URL, app
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+
+class TestConnectionPool:
+    """
+    Class to test the connection pool instrumentation.
+    """
+
+    def test_exhausted_pool_records_wait(self) -> None:
+        """
+        A checkout on an exhausted pool is counted as a wait and, once it gives up, as a timeout.
+        """
+        engine = create_engine(
+            TEST_DATABASE_URL,
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        try:
+            with engine.connect():
+                assert pool_metrics(engine.pool)["checked_out"] == 1
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+            metrics = pool_metrics(engine.pool)
+        finally:
+            engine.dispose()
+
+        assert metrics["max_connections"] == 1
+        assert metrics["checked_out"] == 0
+        assert metrics["checkouts"] == 2
+        assert metrics["waits"] == metrics["timeouts"] == 1
+        assert metrics["wait_time_max_ms"] >= 100
+
+    def test_pool_diagnostics(self) -> None:
+        """
+        The diagnostics endpoint reports the pool of the engine used by the endpoints.
+        """
+        response = TestClient(app).get("/api/v1/diagnostics/pool/")
+        assert response.status_code == 200
+        assert {"size", "checked_out", "overflow", "wait_time_avg_ms"} <= set(
+            response.json()
+        )
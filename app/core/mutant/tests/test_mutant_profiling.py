@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+from conftest import app
+from core.middleware.profiling_middleware import ProfilingMiddleware
+from core.profiling.sampler import StackSampler
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def slow_endpoint() -> dict:
+    """
+    Endpoint keeping a threadpool thread busy long enough to be sampled.
+    """
+    time.sleep(0.05)
+    return {"ok": True}
+
+
+def build_client(directory: str, sample_rate: float = 0.0) -> TestClient:
+    """
+    Builds a client of an app profiled into the given directory.
+    """
+    profiled_app = FastAPI()
+    profiled_app.get("/slow/")(slow_endpoint)
+    profiled_app.add_middleware(
+        ProfilingMiddleware, directory=directory, sample_rate=sample_rate
+    )
+    return TestClient(profiled_app)
+
+
+class TestStackSampler:
+    """
+    Class to test the sampling of the stacks of the process.
+    """
+
+    def test_stacks_are_collapsed_from_the_root(self) -> None:
+        """
+        Stacks of busy threads are counted from their root to the running function.
+        """
+        sampler = StackSampler(0.001)
+        sampler.start()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        sampler.stop()
+
+        assert sampler.samples > 0
+        stacks = [line for line in sampler.collapsed().splitlines() if line]
+        own = [
+            line
+            for line in stacks
+            if "test_stacks_are_collapsed_from_the_root (" in line
+        ]
+        assert own
+        frames, count = own[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert frames.split(";")[-1].startswith(
+            "test_stacks_are_collapsed_from_the_root ("
+        )
+
+
+class TestProfilingMiddleware:
+    """
+    Class to test the profiling of single requests (ProfilingMiddleware).
+    """
+
+    def test_header_triggers_a_profile(self, tmp_path) -> None:
+        """
+        A request with the trigger header is profiled, threadpool work included.
+        """
+        response = build_client(str(tmp_path)).get("/slow/", headers={"X-Profile": "1"})
+
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert timing.startswith("app;dur=")
+        name = timing.split('profile;desc="')[1].rstrip('"')
+        assert os.listdir(tmp_path) == [name]
+        assert "slow_endpoint (" in (tmp_path / name).read_text()
+
+    @pytest.mark.parametrize("sample_rate, profiled", [(0.0, False), (1.0, True)])
+    def test_sample_rate(self, tmp_path, sample_rate: float, profiled: bool) -> None:
+        """
+        Requests without the header are profiled at the sampling rate.
+        """
+        response = build_client(str(tmp_path), sample_rate).get("/slow/")
+
+        assert ("server-timing" in response.headers) is profiled
+        assert len(os.listdir(tmp_path)) == int(profiled)
+
+    def test_left_out_when_disabled(self) -> None:
+        """
+        The middleware is not part of the app unless profiling is enabled.
+        """
+        assert ProfilingMiddleware not in [
+            middleware.cls for middleware in app.user_middleware
+        ]
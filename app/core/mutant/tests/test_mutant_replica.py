@@ -0,0 +1,87 @@
+import pytest
+from adapters.database.models import DNA, DNAStats
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from conftest import TEST_DATABASE_URL
+from core.mutant.canonical import canonical_sequence
+from core.mutant.services import MutantService
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy_utils import create_database, drop_database
+
+REPLICA_DATABASE_URL = TEST_DATABASE_URL + "_replica"
+
+
+@pytest.fixture(scope="module")
+def replica_engine():
+    """
+    Creates a second database standing in for a read replica, with the DNA tables only.
+    """
+    create_database(REPLICA_DATABASE_URL)
+    engine = create_engine(REPLICA_DATABASE_URL)
+    DNA.__table__.create(engine)
+    DNAStats.__table__.create(engine)
+    yield engine
+    engine.dispose()
+    drop_database(REPLICA_DATABASE_URL)
+
+
+@pytest.fixture
+def replica_session(replica_engine):
+    """
+    Session on the replica whose changes are rolled back after each test.
+    """
+    connection = replica_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+
+class TestReadReplica:
+    """
+    Class to test the routing of reads to a replica and writes to the primary.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session, replica_session: Session) -> None:
+        """
+        Builds a service reading from the replica and writing to the primary test database.
+        """
+        self.db_session = db_session
+        self.replica_session = replica_session
+        self.service = MutantService(
+            SQLAlchemyDNARepository(db_session, read_db=replica_session)
+        )
+
+    def test_lookups_and_stats_read_the_replica(self) -> None:
+        """
+        Stored verdicts and stats are served from the replica.
+        """
+        self.replica_session.add(DNA(sequence="AAAACCCCGTGTGTGT", is_mutant=True))
+        self.replica_session.add(DNAStats(id=1, count_mutant_dna=3, count_human_dna=1))
+        self.replica_session.flush()
+
+        repository = self.service.dna_repository
+        assert repository.get_dna_by_sequence("AAAACCCCGTGTGTGT").is_mutant is True
+        assert repository.get_verdicts_by_sequences(["AAAACCCCGTGTGTGT"]) == {
+            "AAAACCCCGTGTGTGT": True
+        }
+        assert self.service.get_stats()["count_mutant_dna"] == 3
+
+    def test_writes_go_to_primary_and_misses_fall_back(self) -> None:
+        """
+        New records are only written to the primary, where lookups missing on the replica find them.
+        """
+        dna = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+        assert self.service.check_and_save_dna(dna) is True
+
+        sequence = "".join(dna)
+        assert self.replica_session.query(DNA).count() == 0
+        assert self.db_session.query(DNA).filter(DNA.sequence == sequence).count() == 1
+
+        canonical = canonical_sequence(sequence)
+        repository = self.service.dna_repository
+        assert repository.get_dna_by_sequence(canonical).is_mutant is True
+        assert repository.get_verdicts_by_sequences([canonical]) == {canonical: True}
@@ -1,10 +1,19 @@
+import time
+
 import pytest
+from adapters.database.models.dna_stats_model import STATS_STRIPES
+from adapters.database.repository.dna_repository import (
+    SQLAlchemyDNARepository,
+    dna_values,
+)
 from conftest import app
 from fastapi.testclient import TestClient
 from httpx import Response
+from sqlalchemy import Engine, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.adapters.database.models import DNA
+from app.adapters.database.models import DNA, DNAStats
 
 
 class TestStatsEndpoint:
@@ -121,3 +130,75 @@ class TestStatsEndpoint:
         assert response_data["count_mutant_dna"] == 0
         assert response_data["count_human_dna"] == 2
         assert response_data["ratio"] == 0
+
+    def test_stats_follow_deleted_records(self) -> None:
+        """
+        Test that the counters are decreased when DNA sequences are deleted.
+        """
+        self.create_mutant_humans()
+        self.db_session.query(DNA).filter(DNA.sequence == "AAAACCCCAGTTTGGG").delete()
+        self.db_session.commit()
+
+        response_data = self.client.get(self.url).json()
+
+        assert response_data["count_mutant_dna"] == 1
+        assert response_data["count_human_dna"] == 2
+
+    def test_reconcile_stats(self) -> None:
+        """
+        Test that reconciling rebuilds drifted counters from the DNA table.
+        """
+        self.create_mutant_humans()
+        self.db_session.query(DNAStats).update(
+            {"count_mutant_dna": 10, "count_human_dna": 0}
+        )
+        self.db_session.commit()
+
+        counts = SQLAlchemyDNARepository(self.db_session).reconcile_stats()
+        response_data = self.client.get(self.url).json()
+
+        assert counts == (2, 2)
+        assert response_data["count_mutant_dna"] == 2
+        assert response_data["count_human_dna"] == 2
+
+    def test_concurrent_writers_do_not_queue(self, db_engine: Engine) -> None:
+        """
+        Test that an insert does not wait for the uncommitted insert of another connection,
+        whose counters live in another stripe.
+        """
+        stripe = f"SELECT pg_backend_pid() % {STATS_STRIPES}"
+        connections = [db_engine.connect()]
+        try:
+            first_stripe = connections[0].execute(text(stripe)).scalar()
+            while connections[-1].execute(text(stripe)).scalar() == first_stripe:
+                connections.append(db_engine.connect())
+            first, second = connections[0], connections[-1]
+            first.execute(insert(DNA).values(**dna_values("AAAACCCCGGGGTTTA", True)))
+
+            second.execute(text("SET lock_timeout = '2s'"))
+            started = time.perf_counter()
+            second.execute(insert(DNA).values(**dna_values("ATATATATATATATAT", False)))
+
+            assert time.perf_counter() - started < 1
+        finally:
+            for connection in connections:
+                connection.rollback()
+                connection.close()
+
+    def test_stats_caching_headers(self) -> None:
+        """
+        Test that the stats carry an ETag and a 304 is returned when it still matches.
+        """
+        self.create_mutant_humans()
+
+        response: Response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        not_modified: Response = self.client.get(
+            self.url, headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert "max-age" in response.headers["Cache-Control"]
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.content == b""
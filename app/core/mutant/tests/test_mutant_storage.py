@@ -0,0 +1,116 @@
+import random
+
+import pytest
+from adapters.database.models import DNA
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from adapters.database.sequence_codec import (
+    pack_sequence,
+    sequence_hash,
+    unpack_sequence,
+)
+from core.mutant.canonical import canonical_sequence
+from core.mutant.services import MutantService
+from sqlalchemy.orm.session import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+
+
+class TestSequenceCodec:
+    """
+    Class to test the compact representations of stored sequences.
+    """
+
+    def test_pack_round_trip(self) -> None:
+        """
+        Packed sequences of any length take a quarter of the bases and unpack unchanged.
+        """
+        rng = random.Random(42)
+        for length in [0, 1, 3, 4, 5, 36, 1001]:
+            sequence = "".join(rng.choice("ACGT") for _ in range(length))
+            packed = pack_sequence(sequence)
+            assert len(packed) == (length + 3) // 4
+            assert unpack_sequence(packed, length) == sequence
+
+    def test_unpackable_sequence(self) -> None:
+        """
+        Sequences holding other bases cannot be packed.
+        """
+        assert pack_sequence("ACGTN") is None
+
+    def test_hash_is_fixed_size(self) -> None:
+        """
+        Every sequence is keyed by a 32-byte digest.
+        """
+        assert len(sequence_hash("A")) == len(sequence_hash("ACGT" * 10000)) == 32
+
+
+class TestPackedStorage:
+    """
+    Class to test the repository storing sequences 2-bit packed.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Builds a service on a repository storing new sequences packed.
+        """
+        self.db_session = db_session
+        self.repository = SQLAlchemyDNARepository(db_session, packed=True)
+        self.service = MutantService(self.repository)
+
+    def stored(self, sequence: str) -> DNA:
+        """
+        Reads the stored row of a sequence by its key.
+        """
+        return (
+            self.db_session.query(DNA)
+            .filter(DNA.sequence_hash == sequence_hash(sequence))
+            .one()
+        )
+
+    def test_packed_sequence_is_stored_and_found(self) -> None:
+        """
+        A new sequence is stored packed, without text, and is still found by every lookup.
+        """
+        sequence = "".join(MUTANT_DNA)
+        assert self.service.check_and_save_dna(MUTANT_DNA) is True
+
+        dna = self.stored(sequence)
+        assert dna.sequence is None
+        assert len(dna.packed_sequence) == 9
+        assert dna.sequence_length == 36
+        canonical = canonical_sequence(sequence)
+        assert self.repository.get_dna_by_sequence(canonical).is_mutant is True
+        assert self.repository.get_verdicts_by_sequences([canonical]) == {
+            canonical: True
+        }
+        assert self.service.check_and_save_dna_batch([MUTANT_DNA, MUTANT_DNA]) == [
+            True,
+            True,
+        ]
+        assert sequence in set(self.repository.iter_sequences())
+
+    def test_convert_storage(self) -> None:
+        """
+        Text rows are packed by a packed repository, and restored by a text one.
+        """
+        sequence = "".join(MUTANT_DNA)
+        SQLAlchemyDNARepository(self.db_session).upsert_and_get(sequence, True)
+        SQLAlchemyDNARepository(self.db_session).upsert_and_get("ACGTN", False)
+
+        assert self.repository.convert_storage() == 1
+        assert self.stored(sequence).sequence is None
+        assert self.stored("ACGTN").sequence == "ACGTN"
+
+        assert SQLAlchemyDNARepository(self.db_session).convert_storage() == 1
+        assert self.stored(sequence).sequence == sequence
+        assert self.stored(sequence).packed_sequence is None
+
+    def test_rows_get_database_defaults(self) -> None:
+        """
+        Rows are numbered sequentially and timestamped by the database.
+        """
+        self.repository.create_dna_records([("ACGTACGT", False), ("TTTTGGGG", True)])
+        first, second = self.stored("ACGTACGT"), self.stored("TTTTGGGG")
+        assert second.id == first.id + 1
+        assert first.created_at is not None
@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+from adapters.api.ndjson import ndjson_lines
+from adapters.database.models import DNA
+from config import settings
+from conftest import app
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy.orm import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+HUMAN_DNA = ["ATGCGA", "CAGTGC", "TTATTT", "AGACGG", "GCGTCA", "TCACTG"]
+
+
+class TestNDJSONLines:
+    """
+    Class to test the splitting of a streamed body into lines.
+    """
+
+    def test_lines_spanning_chunks(self) -> None:
+        """
+        Lines are rebuilt across chunk boundaries, with CRLF breaks and a missing last break.
+        """
+
+        async def chunks():
+            for chunk in [b'{"a"', b': 1}\r\n\n{"b": 2}\n{', b'"c": 3}']:
+                yield chunk
+
+        async def collect():
+            return [line async for line in ndjson_lines(chunks())]
+
+        assert asyncio.run(collect()) == [b'{"a": 1}', b"", b'{"b": 2}', b'{"c": 3}']
+
+
+class TestMutantStream:
+    """
+    Class to test the NDJSON streaming endpoint (/mutant/stream/).
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Fixture that initializes the test environment.
+        """
+        self.client = TestClient(app)
+        self.db_session = db_session
+        self.url = "/api/v1/mutant/stream/"
+
+    def post_lines(self, lines) -> Response:
+        """
+        Uploads the given lines as a streamed NDJSON body.
+        """
+
+        def body():
+            for line in lines:
+                yield (line + "\n").encode()
+
+        return self.client.post(
+            self.url,
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    def test_verdicts_per_line(self) -> None:
+        """
+        Every line gets its verdict in order, invalid lines get an error, blank ones nothing.
+        """
+        response = self.post_lines(
+            [
+                json.dumps({"dna": MUTANT_DNA}),
+                "",
+                json.dumps({"dna": HUMAN_DNA}),
+                json.dumps({"dna": ["AAAA", "CC"]}),
+                "not json",
+                json.dumps({"dna": MUTANT_DNA}),
+            ]
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["line"] for result in results] == [1, 3, 4, 5, 6]
+        assert results[0]["is_mutant"] is True
+        assert results[1]["is_mutant"] is False
+        assert "Each DNA string must have the same length" in results[2]["error"]
+        assert "error" in results[3]
+        assert results[4]["is_mutant"] is True
+        assert self.db_session.query(DNA).count() == 2
+
+    def test_lines_are_classified_in_chunks(self, monkeypatch) -> None:
+        """
+        Uploads longer than a chunk are classified in several batches.
+        """
+        monkeypatch.setattr(settings, "MUTANT_STREAM_CHUNK_SIZE", 2)
+        dnas = [MUTANT_DNA, HUMAN_DNA, ["AAAA", "CAGT", "TTTT", "AGAG"]]
+        response = self.post_lines([json.dumps({"dna": dna}) for dna in dnas])
+
+        assert [json.loads(line)["is_mutant"] for line in response.iter_lines()] == [
+            True,
+            False,
+            True,
+        ]
+        assert self.db_session.query(DNA).count() == 3
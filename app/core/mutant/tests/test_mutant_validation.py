@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from config import settings
+from conftest import app
+from core.mutant.schemas import DNARequest, check_dna
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+
+
+class TestCheckDNA:
+    """
+    Class to test the shape and alphabet checks of DNA matrices.
+    """
+
+    @pytest.mark.parametrize(
+        "dna, message",
+        [
+            ([], "DNA list cannot be empty"),
+            (["ATG", "AT", "ATG"], "Each DNA string must have the same length"),
+            (["ATGC", "ATGC"], "The DNA matrix must be square"),
+            (
+                ["ATG", "AXG", "ATG"],
+                "DNA strings can only contain the bases A, T, C and G",
+            ),
+            (
+                ["ATG", "atg", "ATG"],
+                "DNA strings can only contain the bases A, T, C and G",
+            ),
+            (
+                ["ATG", "AÁG", "ATG"],
+                "DNA strings can only contain the bases A, T, C and G",
+            ),
+        ],
+    )
+    def test_invalid_matrices(self, dna, message) -> None:
+        """
+        Empty, ragged, non-square and non-ATCG matrices are rejected with their reason.
+        """
+        with pytest.raises(ValueError, match=message):
+            check_dna(dna)
+
+    def test_valid_matrix(self) -> None:
+        """
+        Square matrices of the four bases are returned unchanged.
+        """
+        assert check_dna(MUTANT_DNA) is MUTANT_DNA
+        assert check_dna(["A"]) == ["A"]
+
+    def test_raw_body_matches_model(self) -> None:
+        """
+        The orjson path reads the same matrices as the model and raises its errors.
+        """
+        assert DNARequest.dna_from_json(json.dumps({"dna": MUTANT_DNA})) == MUTANT_DNA
+        for body in [b'{"dna": ["AT", 1]}', b'{"dna": ["AT", "A"]}', b"[]", b"{"]:
+            with pytest.raises(ValidationError):
+                DNARequest.dna_from_json(body)
+
+
+class TestMutantValidation:
+    """
+    Class to test how the /mutant/ endpoint rejects invalid bodies.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Fixture that initializes the test environment.
+        """
+        self.client = TestClient(app)
+        self.url = "/api/v1/mutant/"
+
+    @pytest.mark.parametrize("min_bytes", [0, 1])
+    def test_invalid_matrix_is_rejected(self, monkeypatch, min_bytes) -> None:
+        """
+        Non-square matrices get a 422 instead of failing inside detection, on both paths.
+        """
+        monkeypatch.setattr(settings, "MUTANT_RAW_BODY_MIN_BYTES", min_bytes)
+        response = self.client.post(self.url, json={"dna": MUTANT_DNA[:4]})
+
+        assert response.status_code == 422
+        detail = response.json()["detail"][0]
+        assert detail["msg"] == "Value error, The DNA matrix must be square"
+        assert detail["loc"] == ["body", "dna"]
+
+    def test_raw_body_path(self, monkeypatch) -> None:
+        """
+        Bodies over the threshold are classified through the orjson path.
+        """
+        monkeypatch.setattr(settings, "MUTANT_RAW_BODY_MIN_BYTES", 1)
+        response = self.client.post(self.url, json={"dna": MUTANT_DNA})
+
+        assert response.status_code == 200
+        assert response.json() == {"message": "Mutant detected"}
+
+    def test_invalid_json(self) -> None:
+        """
+        Bodies that are not JSON get a 422.
+        """
+        response = self.client.post(
+            self.url, content=b"{", headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
+
+    def test_request_body_is_documented(self) -> None:
+        """
+        The OpenAPI schema still describes the body of the endpoint.
+        """
+        operation = self.client.get("/openapi.json").json()["paths"][self.url]["post"]
+        schema = operation["requestBody"]["content"]["application/json"]["schema"]
+
+        assert schema["required"] == ["dna"]
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from adapters.database.models import DNA
+from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
+from adapters.database.repository.write_behind_dna_repository import (
+    WriteBehindDNARepository,
+)
+from core.exceptions.custom_exceptions import CustomAPIException
+from core.mutant.canonical import canonical_sequence
+from core.mutant.services import MutantService
+from core.mutant.write_buffer import WriteBehindBuffer
+from sqlalchemy.orm.session import Session
+
+MUTANT_DNA = ["ATGCGA", "CAGTGC", "TTATGT", "AGAAGG", "CCCCTA", "TCACTG"]
+HUMAN_DNA = ["ATGCGA", "CAGTGC", "TTATTT", "AGACGG", "GCGTCA", "TCACTG"]
+
+
+class TestWriteBehind:
+    """
+    Class to test the write-behind persistence mode.
+    """
+
+    @pytest.fixture(autouse=True)
+    def initialize(self, db_session: Session) -> None:
+        """
+        Builds a service whose new records are queued in a buffer flushed to the test session.
+        """
+        self.db_session = db_session
+        self.flushes = []
+        repository = SQLAlchemyDNARepository(db_session)
+
+        def flush(records):
+            self.flushes.append(records)
+            repository.create_dna_records(records)
+
+        self.buffer = WriteBehindBuffer(
+            flush, max_pending=10, flush_interval=0.05, flush_records=2, put_timeout=0.1
+        )
+        self.service = MutantService(WriteBehindDNARepository(repository, self.buffer))
+
+    def stored(self, dna) -> int:
+        """
+        Counts the stored rows of a DNA matrix.
+        """
+        return self.db_session.query(DNA).filter(DNA.sequence == "".join(dna)).count()
+
+    def test_queued_verdict_is_read_before_flush(self) -> None:
+        """
+        A submitted sequence keeps its verdict while it waits, and is stored on stop.
+        """
+        assert self.service.check_and_save_dna(MUTANT_DNA) is True
+        assert self.stored(MUTANT_DNA) == 0
+        canonical = canonical_sequence("".join(MUTANT_DNA))
+        assert self.service.dna_repository.get_known_verdict(canonical)
+        assert self.service.check_and_save_dna_batch([MUTANT_DNA]) == [True]
+
+        self.buffer.stop()
+        assert self.stored(MUTANT_DNA) == 1
+        assert self.flushes == [[("".join(MUTANT_DNA), True, canonical)]]
+
+    def test_flushes_in_multi_row_inserts(self) -> None:
+        """
+        Reaching `flush_records` waiting records triggers a single insert for all of them.
+        """
+        self.buffer.start()
+        try:
+            self.service.check_and_save_dna(MUTANT_DNA)
+            self.service.check_and_save_dna(HUMAN_DNA)
+            deadline = time.monotonic() + 2
+            while self.buffer.metrics()["pending"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.buffer.stop()
+        assert len(self.flushes) == 1
+        assert self.buffer.metrics()["flushed"] == 2
+        assert self.stored(MUTANT_DNA) == self.stored(HUMAN_DNA) == 1
+
+    def test_flush_skips_stored_rotation(self) -> None:
+        """
+        A queued sequence whose rotation got stored in the meantime is not stored again.
+        """
+        self.service.check_and_save_dna(MUTANT_DNA)
+        rotation = ["".join(column) for column in zip(*reversed(MUTANT_DNA))]
+        self.db_session.add(DNA(sequence="".join(rotation), is_mutant=True))
+        self.db_session.commit()
+
+        self.buffer.stop()
+        assert self.db_session.query(DNA).count() == 1
+        assert self.stored(rotation) == 1
+
+    def test_full_buffer_rejects_new_records(self) -> None:
+        """
+        Once `max_pending` records wait, new ones get a 503, while queued ones are still answered.
+        """
+        self.buffer.max_pending = 1
+        self.service.check_and_save_dna(MUTANT_DNA)
+        with pytest.raises(CustomAPIException) as exc_info:
+            self.service.check_and_save_dna(HUMAN_DNA)
+        assert exc_info.value.status_code == 503
+        assert self.service.check_and_save_dna(MUTANT_DNA) is True
@@ -0,0 +1,105 @@
+"""
+Verdict cache
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class VerdictCache:
+    """
+    Bounded in-process LRU cache mapping DNA sequences to their mutant verdict.
+
+    Entries are keyed by a 16-byte digest of the sequence, so memory stays bounded no
+    matter how large the matrices are. The least recently used entry is evicted once
+    `max_size` entries are stored, and entries older than `ttl` seconds are ignored
+    when `ttl` is set. Hits and misses are counted to size the cache in production."""
+
+    def __init__(self, max_size: int, ttl: float = 0):
+        """
+        Initializes an empty cache.
+
+        :param max_size: Maximum number of verdicts kept in memory.
+        :param ttl: Number of seconds a verdict is served, 0 to keep it until evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(sequence: str) -> bytes:
+        """
+        Builds the cache key of a DNA sequence.
+
+        :param sequence: The DNA sequence string.
+        :return: A fixed-size digest of the sequence.
+        """
+        return hashlib.blake2b(sequence.encode(), digest_size=16).digest()
+
+    def get(self, sequence: str, count_miss: bool = True) -> Optional[bool]:
+        """
+        Returns the cached verdict of a sequence and marks it as recently used.
+
+        :param sequence: The DNA sequence string.
+        :param count_miss: Whether a miss is counted, False for a lookup retried under
+            another key, so that the retry counts the hit or miss of both.
+        :return: The `is_mutant` flag if it is cached and fresh, otherwise None.
+        """
+        key = self.key(sequence)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl > 0 and entry[1] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, sequence: str, is_mutant: bool) -> None:
+        """
+        Stores the verdict of a sequence, evicting the least recently used one if needed.
+
+        :param sequence: The DNA sequence string.
+        :param is_mutant: The verdict to cache.
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        key = self.key(sequence)
+        with self._lock:
+            self._entries[key] = (is_mutant, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops every cached verdict and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def metrics(self) -> dict:
+        """
+        Returns the size and the hit and miss counters of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups > 0 else 0,
+        }
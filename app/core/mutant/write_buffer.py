@@ -0,0 +1,209 @@
+"""
+Write-behind buffer
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.exceptions.custom_exceptions import CustomAPIException
+from fastapi import status
+
+
+class WriteBehindBuffer:
+    """
+    In-process queue of new DNA records waiting to be stored.
+
+    Requests only need the verdict, so new records are queued here and written by a
+    background thread in multi-row inserts, either every `flush_interval` seconds or as
+    soon as `flush_records` records are waiting. Records stay readable from the moment
+    they are queued until their insert is committed. Records are keyed by the canonical
+    form of their sequence, so only one variant of a matrix waits at a time.
+
+    At most `max_pending` records may wait at a time. Writers then block for up to
+    `put_timeout` seconds for the flusher to catch up, and get a 503 after that.
+    Records still waiting when the buffer is stopped are flushed before it returns."""
+
+    def __init__(
+        self,
+        flush: Callable[[List[Tuple[str, bool, str]]], None],
+        max_pending: int,
+        flush_interval: float,
+        flush_records: int,
+        put_timeout: float = 1.0,
+    ):
+        """
+        Initializes an empty buffer without starting the flusher.
+
+        :param flush: Callable storing a list of (sequence, is_mutant, canonical) records,
+            ignoring the sequences that are already stored.
+        :param max_pending: Maximum number of records waiting to be stored.
+        :param flush_interval: Maximum number of seconds a record waits before being flushed.
+        :param flush_records: Number of waiting records that triggers a flush right away.
+        :param put_timeout: Number of seconds a writer waits for room in a full buffer.
+        """
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.put_timeout = put_timeout
+        self.flushed = 0
+        self.failed_flushes = 0
+        self._flush = flush
+        self._pending: Dict[str, Tuple[str, bool]] = {}
+        self._flushing: Dict[str, Tuple[str, bool]] = {}
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts the background flusher.
+        """
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Flushes every waiting record and stops the background flusher.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        else:
+            self._run()
+
+    def get(self, canonical: str) -> Optional[bool]:
+        """
+        Returns the verdict of a sequence waiting to be stored.
+
+        :param canonical: The canonical form of the DNA sequence.
+        :return: The queued verdict, or None if no variant of the sequence is waiting.
+        """
+        with self._condition:
+            return self._known(canonical)
+
+    def put(self, sequence: str, is_mutant: bool, canonical: str) -> bool:
+        """
+        Queues a new record, waiting for room if the buffer is full.
+
+        :param sequence: The DNA sequence string.
+        :param is_mutant: The verdict computed for the sequence.
+        :param canonical: The canonical form of the sequence.
+        :return: The verdict the sequence is stored with, the queued one if a variant was
+            already waiting.
+        :raises CustomAPIException: 503 error if the buffer stays full for `put_timeout` seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: canonical in self._pending
+                or canonical in self._flushing
+                or self._size() < self.max_pending,
+                timeout=self.put_timeout,
+            ):
+                raise CustomAPIException(
+                    "Too many DNA records waiting to be stored",
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            return self._add(sequence, is_mutant, canonical)
+
+    def offer(self, sequence: str, is_mutant: bool, canonical: str) -> Optional[bool]:
+        """
+        Queues a new record only if that can be done without waiting.
+
+        :param sequence: The DNA sequence string.
+        :param is_mutant: The verdict computed for the sequence.
+        :param canonical: The canonical form of the sequence.
+        :return: The verdict the sequence is stored with, or None if the buffer is full.
+        """
+        with self._condition:
+            if self._known(canonical) is None and self._size() >= self.max_pending:
+                return None
+            return self._add(sequence, is_mutant, canonical)
+
+    def metrics(self) -> dict:
+        """
+        Returns the number of waiting records and the flush counters.
+        """
+        with self._condition:
+            return {
+                "max_pending": self.max_pending,
+                "pending": self._size(),
+                "flushed": self.flushed,
+                "failed_flushes": self.failed_flushes,
+            }
+
+    def _size(self) -> int:
+        """
+        Number of records not stored yet, including the ones being flushed.
+        """
+        return len(self._pending) + len(self._flushing)
+
+    def _known(self, canonical: str) -> Optional[bool]:
+        """
+        Returns the verdict of a waiting variant, if any. Must hold the condition.
+        """
+        record = self._pending.get(canonical) or self._flushing.get(canonical)
+        return None if record is None else record[1]
+
+    def _add(self, sequence: str, is_mutant: bool, canonical: str) -> bool:
+        """
+        Queues a record unless a variant is already waiting. Must hold the condition.
+        """
+        known = self._known(canonical)
+        if known is not None:
+            return known
+        self._pending[canonical] = (sequence, is_mutant)
+        if len(self._pending) >= self.flush_records:
+            self._condition.notify_all()
+        return is_mutant
+
+    def _run(self) -> None:
+        """
+        Flushes the waiting records until the buffer is stopped and empty.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.flush_records,
+                    timeout=self.flush_interval,
+                )
+                if not self._pending:
+                    if self._stopping:
+                        return
+                    continue
+                self._flushing, self._pending = self._pending, {}
+                stopping = self._stopping
+
+            records = [
+                (sequence, is_mutant, canonical)
+                for canonical, (sequence, is_mutant) in self._flushing.items()
+            ]
+            try:
+                self._flush(records)
+            except Exception:
+                logging.exception(
+                    "Write-behind flush of %s records failed", len(records)
+                )
+                with self._condition:
+                    self.failed_flushes += 1
+                    if stopping:
+                        # Nothing will retry once the application is shutting down.
+                        self._flushing = {}
+                        self._condition.notify_all()
+                        return
+                    self._pending = {**self._flushing, **self._pending}
+                    self._flushing = {}
+                time.sleep(self.flush_interval)
+            else:
+                with self._condition:
+                    self.flushed += len(records)
+                    self._flushing = {}
+                    self._condition.notify_all()
@@ -0,0 +1,3 @@
+"""
+Profiling of single requests, see `ProfilingMiddleware`
+"""
@@ -0,0 +1,93 @@
+"""
+Stack sampler
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+# Leaf frames of threads waiting for work, left out of the samples.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+
+def collapse_stack(frame: FrameType) -> Optional[str]:
+    """
+    Renders a stack from its root to the given frame as `function (file:line)` entries
+    separated by semicolons, the collapsed format read by flame graph tools.
+
+    :param frame: The innermost frame of the stack.
+    :return: The collapsed stack, or None if the thread is waiting for work.
+    """
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+        return None
+    entries = []
+    while frame is not None:
+        code = frame.f_code
+        entries.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(entries))
+
+
+class StackSampler:
+    """
+    Profiler taking the Python stacks of every thread of the process at a fixed interval.
+
+    Threads are sampled rather than traced so that the work a request hands to the
+    threadpool shows up too, at no cost to the code being profiled. Samples come from the
+    whole process: stacks of other requests served at the same time are counted as well.
+    A thread holding the GIL delays the sampler by up to the switch interval of the
+    interpreter, 5 ms by default."""
+
+    def __init__(self, interval: float = 0.001):
+        """
+        :param interval: Seconds between two samples.
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts sampling in a daemon thread.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops sampling and waits for the sampling thread to exit.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = collapse_stack(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+    def collapsed(self) -> str:
+        """
+        Renders the samples as collapsed stacks, one `stack count` line per stack.
+        """
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
@@ -1,16 +1,179 @@
-from adapters.api.dependencies import get_db
+from typing import List, Optional, Tuple
+
+from adapters.api.dependencies import (
+    SessionLocal,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+)
+from adapters.database.repository.async_dna_repository import (
+    AsyncSQLAlchemyDNARepository,
+)
+from adapters.database.repository.cached_dna_repository import (
+    AsyncCachedDNARepository,
+    CachedDNARepository,
+)
 from adapters.database.repository.dna_repository import SQLAlchemyDNARepository
-from core.mutant.services import MutantService
+from adapters.database.repository.instrumented_dna_repository import (
+    AsyncInstrumentedDNARepository,
+    InstrumentedDNARepository,
+)
+from adapters.database.repository.write_behind_dna_repository import (
+    AsyncWriteBehindDNARepository,
+    WriteBehindDNARepository,
+)
+from config import settings
+from core.mutant.bloom_filter import SequenceBloomFilter
+from core.mutant.detectors import get_detector
+from core.mutant.detectors.instrumented_detector import InstrumentedMutantDetector
+from core.mutant.detectors.offloading_detector import OffloadingMutantDetector
+from core.mutant.services import AsyncMutantService, MutantService
+from core.mutant.stats_cache import StatsCache
+from core.mutant.verdict_cache import VerdictCache
+from core.mutant.write_buffer import WriteBehindBuffer
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+PACKED_STORAGE = settings.DNA_STORAGE == "packed"
+# Detection engines are stateless, so a single instance is shared by every request.
+detector = get_detector(settings.DETECTION_ENGINE)
+# Large matrices go to a process pool started with the application, see fast_api_app.lifespan.
+offloading_detector = (
+    OffloadingMutantDetector(
+        detector,
+        settings.DETECTION_OFFLOAD_MIN_CELLS,
+        settings.DETECTION_OFFLOAD_WORKERS or None,
+        settings.DETECTION_OFFLOAD_MAX_PENDING,
+    )
+    if settings.DETECTION_OFFLOAD_MIN_CELLS > 0
+    else None
+)
+if offloading_detector is not None:
+    detector = offloading_detector
+if settings.METRICS_ENABLED:
+    detector = InstrumentedMutantDetector(detector)
+stats_cache = StatsCache(settings.STATS_CACHE_TTL)
+verdict_cache = VerdictCache(settings.VERDICT_CACHE_SIZE, settings.VERDICT_CACHE_TTL)
+sequence_filter = (
+    SequenceBloomFilter(
+        settings.BLOOM_FILTER_CAPACITY, settings.BLOOM_FILTER_ERROR_RATE
+    )
+    if settings.BLOOM_FILTER_CAPACITY > 0
+    else None
+)
+
+
+def flush_dna_records(records: List[Tuple[str, bool, str]]) -> None:
+    """
+    Stores the records queued in the write-behind buffer with a single multi-row insert.
+
+    :param records: The (sequence, is_mutant, canonical) records to store.
+    """
+    database = SessionLocal()
+    try:
+        SQLAlchemyDNARepository(database, packed=PACKED_STORAGE).create_dna_records(
+            records
+        )
+    finally:
+        database.close()
+
+
+# New records are stored in the background when WRITE_BEHIND_MAX_PENDING is set, see
+# fast_api_app.lifespan.
+write_buffer = (
+    WriteBehindBuffer(
+        flush_dna_records,
+        settings.WRITE_BEHIND_MAX_PENDING,
+        settings.WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000,
+        settings.WRITE_BEHIND_FLUSH_RECORDS,
+        settings.WRITE_BEHIND_PUT_TIMEOUT,
+    )
+    if settings.WRITE_BEHIND_MAX_PENDING > 0
+    else None
+)
+
+
+def load_sequence_filter() -> None:
+    """
+    Fills the sequence filter with the canonical hash of every DNA sequence stored in
+    the database.
 
-def get_dna_service(db: Session = Depends(get_db)) -> MutantService:
+    Called once at application startup when `BLOOM_FILTER_CAPACITY` is set.
+    """
+    database = SessionLocal()
+    try:
+        sequence_filter.load(SQLAlchemyDNARepository(database).iter_canonical_hashes())
+    finally:
+        database.close()
+
+
+def get_dna_service(
+    db: Session = Depends(get_db), read_db: Optional[Session] = Depends(get_read_db)
+) -> MutantService:
     """
     Dependency function that provides a `MutantService` instance.
 
     :param db: A database session to be injected, provided by the `get_db` dependency.
-    :return: An instance of `MutantService` initialized with a `SQLAlchemyDNARepository`.
+    :param read_db: A read replica session, provided by the `get_read_db` dependency,
+        or None to read from `db`.
+    :return: An instance of `MutantService` initialized with a `SQLAlchemyDNARepository`
+        and the detection engine selected by `DETECTION_ENGINE`. Unless `VERDICT_CACHE_SIZE`
+        is 0, the repository is wrapped in a `CachedDNARepository`, and unless
+        `BLOOM_FILTER_CAPACITY` is 0, the service skips lookups through the sequence filter.
+        Without it, matrices of `MUTANT_LOOKUP_MIN_CELLS` cells or more are looked up
+        before being classified.
+        Unless `WRITE_BEHIND_MAX_PENDING` is 0, new records are queued in the write-behind
+        buffer instead of being stored by the request. With `METRICS_ENABLED`, every call
+        to the repository is timed by an `InstrumentedDNARepository`.
+    """
+    dna_repository = SQLAlchemyDNARepository(db, read_db, PACKED_STORAGE)
+    if write_buffer is not None:
+        dna_repository = WriteBehindDNARepository(dna_repository, write_buffer)
+    if settings.VERDICT_CACHE_SIZE > 0:
+        dna_repository = CachedDNARepository(dna_repository, verdict_cache)
+    if settings.METRICS_ENABLED:
+        dna_repository = InstrumentedDNARepository(dna_repository)
+    return MutantService(
+        dna_repository,
+        detector,
+        stats_cache,
+        sequence_filter,
+        settings.MUTANT_LOOKUP_MIN_CELLS,
+    )
+
+
+def get_async_dna_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: Optional[AsyncSession] = Depends(get_async_read_db),
+) -> AsyncMutantService:
+    """
+    Dependency function that provides an `AsyncMutantService` instance.
+
+    :param db: An async database session to be injected, provided by the `get_async_db` dependency.
+    :param read_db: An async read replica session, provided by the `get_async_read_db`
+        dependency, or None to read from `db`.
+    :return: An instance of `AsyncMutantService` initialized with an `AsyncSQLAlchemyDNARepository`,
+        configured like the one returned by `get_dna_service`.
     """
-    dna_repository = SQLAlchemyDNARepository(db)
-    return MutantService(dna_repository)
+    dna_repository = AsyncSQLAlchemyDNARepository(db, read_db, PACKED_STORAGE)
+    if write_buffer is not None:
+        dna_repository = AsyncWriteBehindDNARepository(dna_repository, write_buffer)
+    if settings.VERDICT_CACHE_SIZE > 0:
+        dna_repository = AsyncCachedDNARepository(dna_repository, verdict_cache)
+    if settings.METRICS_ENABLED:
+        dna_repository = AsyncInstrumentedDNARepository(dna_repository)
+    return AsyncMutantService(
+        dna_repository,
+        detector,
+        stats_cache,
+        sequence_filter,
+        settings.MUTANT_LOOKUP_MIN_CELLS,
+    )
+
+
+# Dependency used by the endpoints, picked once from DATABASE_ASYNC.
+dna_service_provider = (
+    get_async_dna_service if settings.DATABASE_ASYNC else get_dna_service
+)
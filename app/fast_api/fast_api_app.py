@@ -3,18 +3,52 @@ FAST API
 """
 
 import logging
+from contextlib import asynccontextmanager
 
 import fastapi
-from adapters.api.endpoints import mutants
+from adapters.api.endpoints import diagnostics, metrics, mutants
+from config import settings
 from core.middleware.error_middleware import ErrorHandlingMiddleware
+from core.middleware.metrics_middleware import MetricsMiddleware
+from core.middleware.profiling_middleware import ProfilingMiddleware
+from dependencies.dna_service import (
+    load_sequence_filter,
+    offloading_detector,
+    sequence_filter,
+    write_buffer,
+)
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 logging.info("This is an info message")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepares the in-process resources on startup and releases them on shutdown.
+    """
+    if sequence_filter is not None:
+        await run_in_threadpool(load_sequence_filter)
+        logging.info("Sequence filter loaded with %s sequences", sequence_filter.count)
+    if offloading_detector is not None:
+        offloading_detector.start()
+    if write_buffer is not None:
+        write_buffer.start()
+    try:
+        yield
+    finally:
+        if write_buffer is not None:
+            # Drains the queued records before the process exits.
+            await run_in_threadpool(write_buffer.stop)
+        if offloading_detector is not None:
+            await run_in_threadpool(offloading_detector.shutdown)
+
+
 def create_app() -> fastapi.FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
     app.include_router(mutants.router, prefix="/mutant")
 
     """
@@ -40,5 +74,23 @@ def create_app() -> fastapi.FastAPI:
         prefix="/api/v1",
         tags=["mutants"],
     )
+    app.include_router(
+        diagnostics.router,
+        prefix="/api/v1",
+        tags=["diagnostics"],
+    )
+    if settings.METRICS_ENABLED:
+        # Added last so that it wraps the error handling and times failed requests too.
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router, tags=["metrics"])
+    if settings.PROFILING_ENABLED:
+        # Outermost, so that profiles cover every middleware. Left out unless enabled.
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.PROFILING_DIR,
+            header=settings.PROFILING_HEADER,
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+            interval=settings.PROFILING_INTERVAL_MS / 1000,
+        )
 
     return app